@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+import argparse
+from datetime import datetime, timedelta, timezone
+import io
+import tempfile
+import time
+from pathlib import Path
+
+from werkzeug.datastructures import FileStorage
+
+from src.app.services.entries import import_entries_csv
+from src.app.storage.db import close_connection_pools, get_connection_pool, init_db
+from src.app.storage.entries import create_entry
+
+
+def build_csv(row_count: int) -> bytes:
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    lines = ["timestamp,type,duration,comment"]
+    for index in range(row_count):
+        timestamp = (start + timedelta(minutes=15 * index)).isoformat()
+        entry_type = ("feed", "wee", "poo", "sleep")[index % 4]
+        duration = "20" if entry_type in {"feed", "sleep"} else ""
+        lines.append(f"{timestamp},{entry_type},{duration},row {index}")
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def bench_bulk(db_path: str, data: bytes) -> tuple[int, float]:
+    started = time.perf_counter()
+    upload = FileStorage(stream=io.BytesIO(data), filename="bench.csv")
+    result = import_entries_csv(db_path, "bench", upload)
+    return result["created"], time.perf_counter() - started
+
+
+def bench_row_by_row(db_path: str, row_count: int) -> tuple[int, float]:
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    started = time.perf_counter()
+    with get_connection_pool(db_path).connection() as conn:
+        for index in range(row_count):
+            now = datetime.now(timezone.utc).isoformat()
+            create_entry(
+                conn,
+                {
+                    "user_slug": "bench",
+                    "type": "feed",
+                    "timestamp_utc": (start + timedelta(minutes=15 * index)).isoformat(),
+                    "client_event_id": f"bench-{index}",
+                    "notes": f"row {index}",
+                    "created_at_utc": now,
+                    "updated_at_utc": now,
+                },
+            )
+            conn.commit()
+    return row_count, time.perf_counter() - started
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark CSV entry import.")
+    parser.add_argument("--rows", type=int, default=5000, help="Rows to import.")
+    parser.add_argument(
+        "--compare",
+        action="store_true",
+        help="Also time the per-row insert-and-commit path.",
+    )
+    args = parser.parse_args()
+
+    data = build_csv(args.rows)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        bulk_path = str(Path(tmp_dir) / "bulk.sqlite")
+        init_db(bulk_path)
+        created, elapsed = bench_bulk(bulk_path, data)
+        print(
+            f"bulk import: {created} rows in {elapsed:.3f}s "
+            f"({created / elapsed:,.0f} rows/s)"
+        )
+
+        if args.compare:
+            row_path = str(Path(tmp_dir) / "row.sqlite")
+            init_db(row_path)
+            created, elapsed = bench_row_by_row(row_path, args.rows)
+            print(
+                f"row-by-row: {created} rows in {elapsed:.3f}s "
+                f"({created / elapsed:,.0f} rows/s)"
+            )
+        close_connection_pools()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+import argparse
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from src.app.services import llm_summary
+from src.app.services.llm_summary import (
+    COMPARE_DAY_COUNT,
+    PROMPT_ENCODING_ENV_VAR,
+    TOKEN_BUDGET_ENV_VAR,
+    _estimate_tokens,
+    generate_llm_summary,
+)
+from src.app.storage.db import close_connection_pools, get_connection, init_db
+from src.app.storage.entries import create_entries, datetime_to_ms
+from src.app.storage.settings import update_settings
+
+USERS = ("suz", "rob", "ivy", "ada")
+TYPES = ("feed", "wee", "poo", "sleep", "cry")
+SINCE_UTC = datetime(2026, 1, 8, tzinfo=timezone.utc)
+UNTIL_UTC = SINCE_UTC + timedelta(days=1)
+SUMMARY = json.dumps(
+    {
+        "headline": "Steady day",
+        "selected_day": ["Regular feeds.", "Settled naps."],
+        "comparison_to_previous_7_days": ["In line with last week."],
+        "follow_up": ["Nothing stands out."],
+    }
+)
+
+
+def build_entries(minutes_apart: int) -> list[dict]:
+    start = SINCE_UTC - timedelta(days=COMPARE_DAY_COUNT)
+    entries: list[dict] = []
+    steps = (COMPARE_DAY_COUNT + 1) * 24 * 60 // minutes_apart
+    for step in range(steps):
+        for user_index, user_slug in enumerate(USERS):
+            timestamp = start + timedelta(minutes=step * minutes_apart + user_index)
+            entry_type = TYPES[(step + user_index) % len(TYPES)]
+            entries.append(
+                {
+                    "user_slug": user_slug,
+                    "type": entry_type,
+                    "timestamp_utc": timestamp.isoformat(),
+                    "timestamp_ms": datetime_to_ms(timestamp),
+                    "client_event_id": f"bench-{step}-{user_slug}",
+                    "amount_ml": 90 if entry_type == "feed" else None,
+                    "feed_duration_min": 20 if entry_type == "feed" else None,
+                    "notes": (
+                        f"{user_slug} noticed a longer settle after step {step}"
+                        if step % 5 == 0
+                        else None
+                    ),
+                    "created_at_utc": timestamp.isoformat(),
+                    "updated_at_utc": timestamp.isoformat(),
+                }
+            )
+    return entries
+
+
+class StubOpenAI:
+    def __init__(self, ms_per_token: float) -> None:
+        self.prompt_chars: list[int] = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length))
+                prompt = "".join(
+                    message["content"] for message in body["messages"]
+                )
+                stub.prompt_chars.append(len(prompt))
+                time.sleep(_estimate_tokens(prompt) * ms_per_token / 1000)
+                raw = json.dumps(
+                    {"choices": [{"message": {"content": SUMMARY}}]}
+                ).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(raw)))
+                self.end_headers()
+                self.wfile.write(raw)
+
+            def log_message(self, format, *args):
+                return
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        host, port = self._server.server_address[:2]
+        self.url = f"http://{host}:{port}/v1/chat/completions"
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, daemon=True
+        )
+        self._thread.start()
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def run(
+    db_path: str, encoding: str, budget: int, repeat: int
+) -> tuple[int, bool, float]:
+    os.environ[PROMPT_ENCODING_ENV_VAR] = encoding
+    os.environ[TOKEN_BUDGET_ENV_VAR] = str(budget)
+    captured: list[tuple[str, bool]] = []
+    fit_prompt = llm_summary._fit_prompt
+
+    def capture(*args, **kwargs):
+        fitted = fit_prompt(*args, **kwargs)
+        captured.append(fitted)
+        return fitted
+
+    llm_summary._fit_prompt = capture
+    elapsed = 0.0
+    try:
+        for _ in range(repeat):
+            with get_connection(db_path) as conn:
+                conn.execute("DELETE FROM llm_summaries")
+            started = time.perf_counter()
+            generate_llm_summary(
+                db_path,
+                {
+                    "since_utc": SINCE_UTC.isoformat(),
+                    "until_utc": UNTIL_UTC.isoformat(),
+                },
+            )
+            elapsed += time.perf_counter() - started
+    finally:
+        llm_summary._fit_prompt = fit_prompt
+    prompt, over_budget = captured[-1]
+    return len(prompt), over_budget, elapsed / repeat
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Compare AI summary prompt size and latency per encoding."
+    )
+    parser.add_argument(
+        "--minutes-apart",
+        type=int,
+        default=30,
+        help="Minutes between events per user.",
+    )
+    parser.add_argument(
+        "--token-budget",
+        type=int,
+        default=2500,
+        help="Token budget for the budgeted compact run; keep it below the "
+        "compact prompt size so the prompt is down-sampled.",
+    )
+    parser.add_argument(
+        "--ms-per-token",
+        type=float,
+        default=0.2,
+        help="Simulated prompt processing cost of the stub model.",
+    )
+    parser.add_argument(
+        "--ollama-url",
+        help="Measure against a real Ollama server instead of the stub.",
+    )
+    parser.add_argument("--ollama-model", default="gemma4")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed repetitions.")
+    args = parser.parse_args()
+
+    entries = build_entries(args.minutes_apart)
+    stub = None
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = str(Path(tmp_dir) / "bench.sqlite")
+        init_db(db_path)
+        with get_connection(db_path) as conn:
+            create_entries(conn, entries)
+            if args.ollama_url:
+                update_settings(
+                    conn,
+                    {
+                        "llm_provider": "ollama",
+                        "ollama_base_url": args.ollama_url,
+                        "ollama_model": args.ollama_model,
+                    },
+                )
+        if not args.ollama_url:
+            stub = StubOpenAI(args.ms_per_token)
+            llm_summary.OPENAI_API_URL = stub.url
+            os.environ.setdefault("BABY_TRACKER_OPENAI_API_KEY", "bench-key")
+        print(
+            f"{len(entries)} events over {COMPARE_DAY_COUNT + 1} days, "
+            f"{len(USERS)} users"
+        )
+        try:
+            for label, encoding, budget in (
+                ("json", "json", 0),
+                ("compact", "compact", 0),
+                (f"compact, budget {args.token_budget}", "compact", args.token_budget),
+            ):
+                chars, over_budget, seconds = run(
+                    db_path, encoding, budget, args.repeat
+                )
+                print(
+                    f"{label}: {chars} chars, ~{(chars + 3) // 4} tokens, "
+                    f"{seconds * 1000:.1f} ms end to end"
+                    + (" (over budget)" if over_budget else "")
+                )
+        finally:
+            if stub is not None:
+                stub.close()
+            close_connection_pools()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
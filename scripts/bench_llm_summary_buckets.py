@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+import argparse
+from datetime import datetime, timedelta, timezone
+import tempfile
+import time
+from pathlib import Path
+
+from src.app.services.llm_summary import (
+    COMPARE_DAY_COUNT,
+    _build_day_stats,
+    _SummaryBuckets,
+)
+from src.app.storage.db import close_connection_pools, get_connection, init_db
+from src.app.storage.entries import (
+    create_entries,
+    datetime_to_ms,
+    iter_entries_for_export,
+    list_entries,
+)
+
+USERS = ("suz", "rob", "ivy", "ada")
+TYPES = ("feed", "wee", "poo", "sleep", "cry")
+SINCE_UTC = datetime(2026, 1, 8, tzinfo=timezone.utc)
+UNTIL_UTC = SINCE_UTC + timedelta(days=1)
+
+
+def build_entries(minutes_apart: int) -> list[dict]:
+    start = SINCE_UTC - timedelta(days=COMPARE_DAY_COUNT)
+    entries: list[dict] = []
+    steps = (COMPARE_DAY_COUNT + 1) * 24 * 60 // minutes_apart
+    for step in range(steps):
+        for user_index, user_slug in enumerate(USERS):
+            timestamp = start + timedelta(minutes=step * minutes_apart + user_index)
+            entry_type = TYPES[(step + user_index) % len(TYPES)]
+            entries.append(
+                {
+                    "user_slug": user_slug,
+                    "type": entry_type,
+                    "timestamp_utc": timestamp.isoformat(),
+                    "timestamp_ms": datetime_to_ms(timestamp),
+                    "client_event_id": f"bench-{step}-{user_slug}",
+                    "amount_ml": 60 if entry_type == "feed" else None,
+                    "feed_duration_min": 15 if entry_type == "sleep" else None,
+                    "notes": f"note {step}" if step % 7 == 0 else None,
+                    "created_at_utc": timestamp.isoformat(),
+                    "updated_at_utc": timestamp.isoformat(),
+                }
+            )
+    return entries
+
+
+def per_window_context(conn, limit: int) -> tuple[int, list[dict]]:
+    entries = list_entries(
+        conn,
+        limit,
+        since_utc=(SINCE_UTC - timedelta(days=COMPARE_DAY_COUNT)).isoformat(),
+        until_utc=UNTIL_UTC.isoformat(),
+        include_deleted=False,
+    )
+    entries.sort(key=lambda entry: entry["timestamp_ms"])
+    sorted((entry["id"], entry.get("updated_at_utc")) for entry in entries)
+    comparison_days = []
+    for offset in range(COMPARE_DAY_COUNT, 0, -1):
+        since_ms = datetime_to_ms(SINCE_UTC - timedelta(days=offset))
+        until_ms = datetime_to_ms(UNTIL_UTC - timedelta(days=offset))
+        day_entries = [
+            entry for entry in entries if since_ms <= entry["timestamp_ms"] < until_ms
+        ]
+        comparison_days.append(_build_day_stats(day_entries))
+    return len(entries), comparison_days
+
+
+def bucketed_context(conn) -> tuple[int, list[dict]]:
+    buckets = _SummaryBuckets(SINCE_UTC, UNTIL_UTC)
+    for batch in iter_entries_for_export(
+        conn,
+        since_utc=(SINCE_UTC - timedelta(days=COMPARE_DAY_COUNT)).isoformat(),
+        until_utc=UNTIL_UTC.isoformat(),
+        include_deleted=False,
+    ):
+        for entry in batch:
+            buckets.add(entry)
+    sorted(buckets.fingerprint)
+    return buckets.event_count, buckets.comparison_days()
+
+
+def bench(label: str, call, repeat: int) -> None:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        call()
+    elapsed = (time.perf_counter() - started) / repeat
+    print(f"{label}: {elapsed * 1000:.1f} ms")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark AI summary comparison-window bucketing."
+    )
+    parser.add_argument(
+        "--minutes-apart",
+        type=int,
+        default=2,
+        help="Minutes between events per user.",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Timed repetitions.")
+    args = parser.parse_args()
+
+    entries = build_entries(args.minutes_apart)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = str(Path(tmp_dir) / "bench.sqlite")
+        init_db(db_path)
+        with get_connection(db_path) as conn:
+            create_entries(conn, entries)
+        print(
+            f"{len(entries)} events over {COMPARE_DAY_COUNT + 1} days, "
+            f"{len(USERS)} users"
+        )
+        with get_connection(db_path) as conn:
+            capped_count, capped_days = per_window_context(conn, 500)
+            _, full_days = bucketed_context(conn)
+            empty_days = sum(1 for day in capped_days if day["event_count"] == 0)
+            print(
+                f"500-event cap: {capped_count} events kept, "
+                f"{empty_days}/{COMPARE_DAY_COUNT} comparison days empty"
+            )
+            assert [
+                day["event_count"] for day in per_window_context(conn, 10**9)[1]
+            ] == [day["stats"]["event_count"] for day in full_days]
+            bench(
+                "uncapped list + per-window filtering",
+                lambda: per_window_context(conn, 10**9),
+                args.repeat,
+            )
+            bench(
+                "streamed single-pass buckets",
+                lambda: bucketed_context(conn),
+                args.repeat,
+            )
+        close_connection_pools()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
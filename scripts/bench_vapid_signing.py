@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+import argparse
+import base64
+import time
+
+from cryptography.hazmat.primitives.asymmetric import ec
+from py_vapid import Vapid
+
+from src.app.services.push_subscriptions import build_vapid_config
+
+SUBJECT = "mailto:bench@example.com"
+AUDIENCES = (
+    "https://fcm.googleapis.com",
+    "https://updates.push.services.mozilla.com",
+)
+
+
+def generate_private_key() -> str:
+    key = ec.generate_private_key(ec.SECP256R1())
+    raw = key.private_numbers().private_value.to_bytes(32, "big")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def bench_per_push(private_key: str, pushes: int) -> float:
+    started = time.perf_counter()
+    for index in range(pushes):
+        signer = Vapid.from_string(private_key=private_key)
+        signer.sign(
+            {
+                "sub": SUBJECT,
+                "aud": AUDIENCES[index % len(AUDIENCES)],
+                "exp": int(time.time()) + 12 * 60 * 60,
+            }
+        )
+    return time.perf_counter() - started
+
+
+def bench_cached(private_key: str, pushes: int) -> float:
+    started = time.perf_counter()
+    config = build_vapid_config("bench-public-key", private_key, SUBJECT)
+    assert config is not None and config.signer is not None
+    for index in range(pushes):
+        config.header_cache.headers_for(
+            config.signer, SUBJECT, AUDIENCES[index % len(AUDIENCES)]
+        )
+    return time.perf_counter() - started
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark VAPID header signing.")
+    parser.add_argument("--pushes", type=int, default=2000, help="Pushes to sign.")
+    args = parser.parse_args()
+
+    private_key = generate_private_key()
+    for label, bench in (("per-push sign", bench_per_push), ("cached", bench_cached)):
+        elapsed = bench(private_key, args.pushes)
+        print(
+            f"{label}: {args.pushes} pushes in {elapsed:.3f}s "
+            f"({elapsed / args.pushes * 1e6:,.1f} us/push)"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -6,6 +6,7 @@ import os
 @dataclass(frozen=True)
 class AppConfig:
     db_path: Path
+    db_pool_size: int
     storage_backend: str
     host: str
     port: int
@@ -16,6 +17,8 @@ class AppConfig:
     tls_key_path: Path | None
     feed_due_poll_seconds: int
     home_kpis_poll_seconds: int
+    home_kpis_coalesce_seconds: int
+    outbox_poll_seconds: int
     enable_schedulers: bool
     vapid_public_key: str | None
     vapid_private_key: str | None
@@ -24,6 +27,13 @@ class AppConfig:
 
 def load_config() -> AppConfig:
     db_path = Path(os.getenv("BABY_TRACKER_DB_PATH", "./data/baby-tracker.sqlite"))
+    pool_raw = os.getenv("BABY_TRACKER_DB_POOL_SIZE", "4")
+    try:
+        db_pool_size = int(pool_raw)
+    except ValueError as exc:
+        raise ValueError("BABY_TRACKER_DB_POOL_SIZE must be an integer") from exc
+    if db_pool_size <= 0:
+        raise ValueError("BABY_TRACKER_DB_POOL_SIZE must be a positive integer")
     storage_backend = (
         os.getenv("BABY_TRACKER_STORAGE_BACKEND", "sqlite").strip().lower()
     )
@@ -52,6 +62,22 @@ def load_config() -> AppConfig:
         raise ValueError(
             "BABY_TRACKER_HOME_KPIS_POLL_SECONDS must be an integer"
         ) from exc
+    coalesce_raw = os.getenv("BABY_TRACKER_HOME_KPIS_COALESCE_SECONDS", "30")
+    try:
+        home_kpis_coalesce_seconds = int(coalesce_raw)
+    except ValueError as exc:
+        raise ValueError(
+            "BABY_TRACKER_HOME_KPIS_COALESCE_SECONDS must be an integer"
+        ) from exc
+    if home_kpis_coalesce_seconds < 0:
+        raise ValueError(
+            "BABY_TRACKER_HOME_KPIS_COALESCE_SECONDS must not be negative"
+        )
+    outbox_raw = os.getenv("BABY_TRACKER_OUTBOX_POLL_SECONDS", "5")
+    try:
+        outbox_poll_seconds = int(outbox_raw)
+    except ValueError as exc:
+        raise ValueError("BABY_TRACKER_OUTBOX_POLL_SECONDS must be an integer") from exc
     enable_schedulers = _parse_bool_env(
         "BABY_TRACKER_ENABLE_SCHEDULERS",
         default=False,
@@ -82,6 +108,7 @@ def load_config() -> AppConfig:
         raise FileNotFoundError(f"TLS key not found: {tls_key_path}")
     return AppConfig(
         db_path=db_path,
+        db_pool_size=db_pool_size,
         storage_backend=storage_backend,
         host=host,
         port=port,
@@ -92,6 +119,8 @@ def load_config() -> AppConfig:
         tls_key_path=tls_key_path,
         feed_due_poll_seconds=feed_due_poll_seconds,
         home_kpis_poll_seconds=home_kpis_poll_seconds,
+        home_kpis_coalesce_seconds=home_kpis_coalesce_seconds,
+        outbox_poll_seconds=outbox_poll_seconds,
         enable_schedulers=enable_schedulers,
         vapid_public_key=vapid_public_key,
         vapid_private_key=vapid_private_key,
@@ -12,10 +12,12 @@ from src.app.routes.calendar import calendar_api
 from src.app.routes.feed import feed_api
 from src.app.routes.pushcut import pushcut_api
 from src.app.routes.home_kpis import home_kpis_api
+from src.app.routes.health import health_api
 from src.app.services.push_subscriptions import build_vapid_config
-from src.app.storage.db import init_db
+from src.app.storage.db import configure_connection_pool, init_db, init_unit_of_work
 from src.app.services.feed_due import start_feed_due_scheduler
 from src.app.services.home_kpis import start_home_kpis_scheduler
+from src.app.services.outbox import start_outbox_dispatcher
 from src.lib.logging import configure_logging
 from src.lib.validation import normalize_user_slug, validate_entry_type
 
@@ -46,6 +48,7 @@ def create_app() -> Flask:
         DB_PATH=str(config.db_path),
         STORAGE_BACKEND=config.storage_backend,
         BASE_PATH=config.base_path,
+        HOME_KPIS_COALESCE_SECONDS=config.home_kpis_coalesce_seconds,
         VAPID_CONFIG=build_vapid_config(
             config.vapid_public_key,
             config.vapid_private_key,
@@ -54,6 +57,8 @@ def create_app() -> Flask:
     )
 
     init_db(app.config["DB_PATH"])
+    configure_connection_pool(app.config["DB_PATH"], size=config.db_pool_size)
+    init_unit_of_work(app)
     app.register_blueprint(entries_api, url_prefix=f"{config.base_path}/api")
     app.register_blueprint(bottles_api, url_prefix=f"{config.base_path}/api")
     app.register_blueprint(goals_api, url_prefix=f"{config.base_path}/api")
@@ -62,9 +67,11 @@ def create_app() -> Flask:
     app.register_blueprint(pushcut_api, url_prefix=f"{config.base_path}/api")
     app.register_blueprint(feed_api, url_prefix=f"{config.base_path}/api")
     app.register_blueprint(home_kpis_api, url_prefix=f"{config.base_path}/api")
+    app.register_blueprint(health_api, url_prefix=f"{config.base_path}/api")
     if _should_start_schedulers(config.enable_schedulers):
         start_feed_due_scheduler(app, config.feed_due_poll_seconds)
         start_home_kpis_scheduler(app, config.home_kpis_poll_seconds)
+        start_outbox_dispatcher(app, config.outbox_poll_seconds)
 
     @app.context_processor
     def inject_static_version():
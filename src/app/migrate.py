@@ -0,0 +1,72 @@
+import argparse
+import logging
+import sqlite3
+from pathlib import Path
+
+from src.app.config import load_config
+from src.app.services.entries import rebuild_daily_rollups
+from src.app.storage.db import init_db
+from src.app.storage.migrations import (
+    LATEST_SCHEMA_VERSION,
+    get_schema_version,
+)
+from src.lib.logging import configure_logging
+
+logger = logging.getLogger(__name__)
+
+
+def _read_schema_version(db_path: str) -> int:
+    if not Path(db_path).exists():
+        return 0
+    conn = sqlite3.connect(db_path)
+    try:
+        return get_schema_version(conn)
+    finally:
+        conn.close()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Apply Baby Tracker schema migrations.")
+    parser.add_argument(
+        "--db-path",
+        default=None,
+        help="SQLite database path (default: BABY_TRACKER_DB_PATH).",
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Only report the schema version; exit 1 if migrations are pending.",
+    )
+    parser.add_argument(
+        "--rebuild-rollups",
+        action="store_true",
+        help="Recompute the daily_rollups table from entries after migrating.",
+    )
+    args = parser.parse_args(argv)
+
+    configure_logging()
+    db_path = args.db_path or str(load_config().db_path)
+    current = _read_schema_version(db_path)
+    if args.check:
+        logger.info(
+            "Schema version %s of %s for %s", current, LATEST_SCHEMA_VERSION, db_path
+        )
+        return 0 if current >= LATEST_SCHEMA_VERSION else 1
+
+    applied = init_db(db_path)
+    if applied:
+        logger.info(
+            "Applied migrations %s to %s",
+            ", ".join(str(version) for version in applied),
+            db_path,
+        )
+    else:
+        logger.info("Schema already at version %s for %s", current, db_path)
+    if args.rebuild_rollups:
+        rows = rebuild_daily_rollups(db_path)
+        logger.info("Rebuilt %s daily rollup rows for %s", rows, db_path)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,23 +1,35 @@
-from flask import Blueprint, current_app, jsonify, request, Response
+import json
+from typing import Iterator
+import zlib
+
+from flask import Blueprint, current_app, jsonify, request, Response, stream_with_context
 
 from src.app.services.entries import (
     DuplicateEntryError,
     EntryNotFoundError,
+    SyncRejectedError,
+    aggregate_entries,
     create_entry,
     delete_entry,
     export_entries_csv,
     get_entry_summary,
     get_next_feed_schedule,
     import_entries_csv,
+    list_daily_rollups,
     list_feed_amount_entries,
     list_entries,
+    list_entries_page,
     sync_entries,
     update_entry,
 )
-from src.app.services.entry_confirmation import dispatch_entry_confirmation_push
-from src.app.services.webhooks import send_entry_webhook
-from src.app.services.home_kpis import dispatch_home_kpis
-from src.app.services.llm_summary import LlmSummaryError, generate_llm_summary
+from src.app.services.outbox import enqueue_entry_created, wake_outbox_dispatcher
+from src.app.services.llm_summary import (
+    LlmSummaryError,
+    generate_llm_summary,
+    get_llm_provider_metrics,
+    stream_llm_summary,
+)
+from src.app.storage.db import commit_unit_of_work
 
 entries_api = Blueprint("entries_api", __name__, url_prefix="/api")
 
@@ -26,12 +38,8 @@ def _db_path() -> str:
     return current_app.config["DB_PATH"]
 
 
-def _base_path() -> str:
-    return current_app.config.get("BASE_PATH", "")
-
-
-def _vapid_config():
-    return current_app.config.get("VAPID_CONFIG")
+def _home_kpis_coalesce_seconds() -> int:
+    return current_app.config.get("HOME_KPIS_COALESCE_SECONDS", 0)
 
 
 @entries_api.get("/entries")
@@ -40,7 +48,18 @@ def list_entries_route():
     since_utc = request.args.get("since")
     until_utc = request.args.get("until")
     entry_type = request.args.get("type")
+    cursor = request.args.get("cursor")
     try:
+        if cursor or request.args.get("paginate") == "1":
+            page = list_entries_page(
+                _db_path(),
+                limit=limit,
+                since_utc=since_utc,
+                until_utc=until_utc,
+                entry_type=entry_type,
+                cursor=cursor,
+            )
+            return jsonify(page)
         entries = list_entries(
             _db_path(),
             limit=limit,
@@ -89,19 +108,65 @@ def list_feed_amount_entries_output_route():
         return jsonify({"error": str(exc)}), 400
 
 
+@entries_api.get("/entries/aggregate")
+def aggregate_entries_route():
+    try:
+        aggregate = aggregate_entries(
+            _db_path(),
+            bucket=request.args.get("bucket", "day"),
+            user_slug=request.args.get("user_slug"),
+            since_utc=request.args.get("since"),
+            until_utc=request.args.get("until"),
+            entry_type=request.args.get("type"),
+            tz_offset_min=request.args.get("tz_offset_min", default=0, type=int),
+        )
+        return jsonify(aggregate)
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+
+
+@entries_api.get("/entries/daily-rollups")
+def list_daily_rollups_route():
+    try:
+        rollups = list_daily_rollups(
+            _db_path(),
+            since_day=request.args.get("since"),
+            until_day=request.args.get("until"),
+            user_slug=request.args.get("user_slug"),
+            entry_type=request.args.get("type"),
+        )
+        return jsonify(rollups)
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+
+
 @entries_api.get("/entries/export")
 def export_entries_route():
     try:
-        csv_text = export_entries_csv(_db_path())
+        chunks = export_entries_csv(_db_path())
     except ValueError as exc:
         return jsonify({"error": str(exc)}), 400
-    response = Response(csv_text, mimetype="text/csv")
+    if request.accept_encodings["gzip"]:
+        response = Response(_gzip_chunks(chunks), mimetype="text/csv")
+        response.headers["Content-Encoding"] = "gzip"
+    else:
+        response = Response(chunks, mimetype="text/csv")
+    response.headers["Vary"] = "Accept-Encoding"
     response.headers["Content-Disposition"] = (
         'attachment; filename="baby-tracker-events-all-users.csv"'
     )
     return response
 
 
+def _gzip_chunks(chunks: Iterator[str]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(wbits=31)
+    for chunk in chunks:
+        yield compressor.compress(chunk.encode("utf-8")) + compressor.flush(
+            zlib.Z_SYNC_FLUSH
+        )
+    yield compressor.flush()
+
+
 @entries_api.get("/entries/summary")
 def get_entries_summary_route():
     try:
@@ -123,6 +188,38 @@ def generate_entries_llm_summary_route():
         return jsonify({"error": str(exc)}), exc.status_code
 
 
+@entries_api.post("/entries/llm-summary/stream")
+def stream_entries_llm_summary_route():
+    payload = request.get_json(silent=True) or {}
+    try:
+        events = stream_llm_summary(_db_path(), payload)
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    except LlmSummaryError as exc:
+        return jsonify({"error": str(exc)}), exc.status_code
+    response = Response(
+        stream_with_context(_sse_events(events)),
+        mimetype="text/event-stream",
+    )
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
+
+
+@entries_api.get("/entries/llm-summary/providers")
+def get_entries_llm_summary_providers_route():
+    return jsonify(get_llm_provider_metrics(_db_path()))
+
+
+def _sse_events(events: Iterator[tuple[str, dict]]) -> Iterator[str]:
+    try:
+        for event, data in events:
+            yield f"event: {event}\ndata: {json.dumps(data)}\n\n"
+    except LlmSummaryError as exc:
+        error = {"error": str(exc), "status": exc.status_code}
+        yield f"event: error\ndata: {json.dumps(error)}\n\n"
+
+
 @entries_api.get("/entries/feed-schedule")
 def get_next_feed_schedule_route():
     user_slug = request.args.get("user_slug")
@@ -139,14 +236,13 @@ def create_entry_route():
     payload = request.get_json(silent=True) or {}
     try:
         entry = create_entry(_db_path(), payload)
-        dispatch_entry_confirmation_push(
+        enqueue_entry_created(
             _db_path(),
             entry,
-            vapid_config=_vapid_config(),
-            base_path=_base_path(),
+            home_kpis_coalesce_seconds=_home_kpis_coalesce_seconds(),
         )
-        send_entry_webhook(_db_path(), entry)
-        dispatch_home_kpis(_db_path())
+        commit_unit_of_work(_db_path())
+        wake_outbox_dispatcher(current_app)
         return jsonify(entry), 201
     except DuplicateEntryError as exc:
         return jsonify({"error": "duplicate", "entry": exc.entry}), 409
@@ -160,14 +256,13 @@ def create_user_entry_route(user_slug: str):
     payload["user_slug"] = user_slug
     try:
         entry = create_entry(_db_path(), payload)
-        dispatch_entry_confirmation_push(
+        enqueue_entry_created(
             _db_path(),
             entry,
-            vapid_config=_vapid_config(),
-            base_path=_base_path(),
+            home_kpis_coalesce_seconds=_home_kpis_coalesce_seconds(),
         )
-        send_entry_webhook(_db_path(), entry)
-        dispatch_home_kpis(_db_path())
+        commit_unit_of_work(_db_path())
+        wake_outbox_dispatcher(current_app)
         return jsonify(entry), 201
     except DuplicateEntryError as exc:
         return jsonify({"error": "duplicate", "entry": exc.entry}), 409
@@ -212,5 +307,7 @@ def sync_entries_route():
     try:
         result = sync_entries(_db_path(), payload)
         return jsonify(result)
+    except SyncRejectedError as exc:
+        return jsonify({"error": str(exc), "results": exc.results}), 400
     except ValueError as exc:
         return jsonify({"error": str(exc)}), 400
@@ -9,8 +9,9 @@ from src.app.services.entries import (
     create_entry,
     stop_active_timed_event,
 )
-from src.app.services.entry_confirmation import dispatch_entry_confirmation_push
+from src.app.services.outbox import enqueue_entry_created, wake_outbox_dispatcher
 from src.app.services.settings import get_settings
+from src.app.storage.db import commit_unit_of_work
 from src.lib.validation import normalize_user_slug
 
 feed_api = Blueprint("feed_api", __name__, url_prefix="/api")
@@ -20,14 +21,6 @@ def _db_path() -> str:
     return current_app.config["DB_PATH"]
 
 
-def _base_path() -> str:
-    return current_app.config.get("BASE_PATH", "")
-
-
-def _vapid_config():
-    return current_app.config.get("VAPID_CONFIG")
-
-
 def _resolve_user_slug(raw: str | None) -> str:
     if raw:
         return normalize_user_slug(raw)
@@ -72,12 +65,9 @@ def log_feed_route():
     }
     try:
         entry = create_entry(_db_path(), payload)
-        dispatch_entry_confirmation_push(
-            _db_path(),
-            entry,
-            vapid_config=_vapid_config(),
-            base_path=_base_path(),
-        )
+        enqueue_entry_created(_db_path(), entry, include_webhooks=False)
+        commit_unit_of_work(_db_path())
+        wake_outbox_dispatcher(current_app)
         return jsonify(entry), 201
     except ValueError as exc:
         return jsonify({"error": str(exc)}), 400
@@ -103,12 +93,9 @@ def _log_simple_event(event_type: str):
 
     try:
         entry = create_entry(_db_path(), entry_payload)
-        dispatch_entry_confirmation_push(
-            _db_path(),
-            entry,
-            vapid_config=_vapid_config(),
-            base_path=_base_path(),
-        )
+        enqueue_entry_created(_db_path(), entry, include_webhooks=False)
+        commit_unit_of_work(_db_path())
+        wake_outbox_dispatcher(current_app)
         return jsonify(entry), 201
     except ValueError as exc:
         return jsonify({"error": str(exc)}), 400
@@ -138,12 +125,9 @@ def _start_timed_event(event_type: str):
 
     try:
         entry = create_entry(_db_path(), entry_payload)
-        dispatch_entry_confirmation_push(
-            _db_path(),
-            entry,
-            vapid_config=_vapid_config(),
-            base_path=_base_path(),
-        )
+        enqueue_entry_created(_db_path(), entry, include_webhooks=False)
+        commit_unit_of_work(_db_path())
+        wake_outbox_dispatcher(current_app)
         return jsonify(entry), 201
     except ValueError as exc:
         return jsonify({"error": str(exc)}), 400
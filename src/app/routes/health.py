@@ -0,0 +1,15 @@
+from flask import Blueprint, current_app, jsonify
+
+from src.app.services.health import get_health
+
+health_api = Blueprint("health_api", __name__, url_prefix="/api")
+
+
+def _db_path() -> str:
+    return current_app.config["DB_PATH"]
+
+
+@health_api.get("/health")
+def get_health_route():
+    status = get_health(_db_path())
+    return jsonify(status), 200 if status["ok"] else 503
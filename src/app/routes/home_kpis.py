@@ -1,6 +1,6 @@
 from flask import Blueprint, current_app, jsonify
 
-from src.app.services.home_kpis import build_home_kpis
+from src.app.services.home_kpis import build_home_kpis, get_home_kpis_delivery_stats
 
 home_kpis_api = Blueprint("home_kpis_api", __name__, url_prefix="/api")
 
@@ -16,3 +16,8 @@ def get_home_kpis_route():
         return jsonify(payload)
     except ValueError as exc:
         return jsonify({"error": str(exc)}), 400
+
+
+@home_kpis_api.get("/home-kpis/deliveries")
+def get_home_kpis_deliveries_route():
+    return jsonify(get_home_kpis_delivery_stats(_db_path()))
@@ -10,6 +10,7 @@ from src.app.services.push_subscriptions import (
     save_push_subscription,
     send_web_push,
 )
+from src.app.storage.db import commit_unit_of_work
 from src.lib.validation import normalize_user_slug
 
 pushcut_api = Blueprint("push_api", __name__, url_prefix="/api")
@@ -88,6 +89,7 @@ def save_push_subscription_route():
             subscription=subscription_payload,
             user_agent=request.headers.get("User-Agent"),
         )
+        commit_unit_of_work(_db_path())
         dispatch_feed_due(
             _db_path(),
             vapid_config=config,
@@ -142,6 +144,7 @@ def push_feed_due_route():
             url=f"{_base_path()}/{user_slug}",
             tag=f"feed-due-{user_slug}",
         )
+        commit_unit_of_work(_db_path())
         result = send_web_push(subscription, outbound, config)
         if result.get("sent"):
             return jsonify({"sent": True, "payload": outbound})
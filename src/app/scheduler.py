@@ -7,8 +7,9 @@ from flask import Flask
 from src.app.config import load_config
 from src.app.services.feed_due import start_feed_due_scheduler
 from src.app.services.home_kpis import start_home_kpis_scheduler
+from src.app.services.outbox import start_outbox_dispatcher
 from src.app.services.push_subscriptions import build_vapid_config
-from src.app.storage.db import init_db
+from src.app.storage.db import configure_connection_pool, init_db
 from src.lib.logging import configure_logging
 
 logger = logging.getLogger(__name__)
@@ -39,6 +40,7 @@ def main() -> None:
     configure_logging()
     config = load_config()
     init_db(str(config.db_path))
+    configure_connection_pool(str(config.db_path), size=config.db_pool_size)
 
     app = _create_scheduler_app(
         str(config.db_path),
@@ -49,10 +51,12 @@ def main() -> None:
     )
     start_feed_due_scheduler(app, config.feed_due_poll_seconds)
     start_home_kpis_scheduler(app, config.home_kpis_poll_seconds)
+    start_outbox_dispatcher(app, config.outbox_poll_seconds)
     logger.info(
-        "Scheduler runtime started (feed_due_poll_seconds=%s, home_kpis_poll_seconds=%s)",
+        "Scheduler runtime started (feed_due_poll_seconds=%s, home_kpis_poll_seconds=%s, outbox_poll_seconds=%s)",
         config.feed_due_poll_seconds,
         config.home_kpis_poll_seconds,
+        config.outbox_poll_seconds,
     )
 
     stop_event = threading.Event()
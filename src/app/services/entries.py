@@ -1,21 +1,33 @@
-from datetime import datetime, timedelta, timezone
+import base64
+from datetime import date, datetime, timedelta, timezone
 import math
 import csv
 import io
+from typing import Iterator
 import uuid
 
+from src.app.storage.daily_rollups import (
+    list_daily_rollups as repo_list_daily_rollups,
+    rebuild_daily_rollups as repo_rebuild_daily_rollups,
+)
 from src.app.storage.db import get_connection
 from src.app.storage.entries import (
+    AGGREGATE_BUCKETS_MS,
+    aggregate_entries as repo_aggregate_entries,
+    create_entries as repo_create_entries,
     create_entry as repo_create_entry,
+    delete_entries_by_client_event_id as repo_delete_entries_by_client_event_id,
     delete_entry as repo_delete_entry,
-    get_entry_by_client_event_id as repo_get_entry_by_client_event_id,
     get_latest_active_timed_entry as repo_get_latest_active_timed_entry,
     list_entries as repo_list_entries,
-    list_entries_for_export as repo_list_entries_for_export,
+    iter_entries_for_export as repo_iter_entries_for_export,
     list_entries_updated_since as repo_list_entries_updated_since,
+    ms_to_datetime,
+    timestamp_to_ms,
     update_entry as repo_update_entry,
-    upsert_entry_by_client_event_id as repo_upsert_entry_by_client_event_id,
+    upsert_entries_by_client_event_id as repo_upsert_entries_by_client_event_id,
 )
+from src.app.services.latest_entries import get_latest_entries_cache
 from src.app.services.settings import get_settings
 from src.lib.validation import (
     normalize_user_slug,
@@ -23,6 +35,8 @@ from src.lib.validation import (
     validate_entry_type,
 )
 
+MAX_TZ_OFFSET_MIN = 14 * 60
+
 
 class DuplicateEntryError(Exception):
     def __init__(self, entry: dict):
@@ -34,6 +48,15 @@ class EntryNotFoundError(Exception):
     pass
 
 
+class SyncRejectedError(ValueError):
+    def __init__(self, message: str, index: int, change_count: int):
+        super().__init__(message)
+        self.results = [
+            {"index": position, "status": "skipped"} for position in range(change_count)
+        ]
+        self.results[index] = {"index": index, "status": "rejected", "error": message}
+
+
 def _now_utc_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
@@ -76,16 +99,6 @@ def _normalize_timestamp_utc(
     return parsed.astimezone(timezone.utc).isoformat()
 
 
-def _parse_utc_iso(value: str, *, field_name: str = "timestamp_utc") -> datetime:
-    normalized = _normalize_timestamp_utc(value, field_name=field_name)
-    if normalized is None:
-        raise ValueError(f"{field_name} must be ISO-8601")
-    parsed = datetime.fromisoformat(normalized)
-    if parsed.tzinfo is None:
-        parsed = parsed.replace(tzinfo=timezone.utc)
-    return parsed.astimezone(timezone.utc)
-
-
 def create_entry(db_path: str, payload: dict) -> dict:
     validated = validate_entry_payload(payload, require_client_event=True)
     validated["user_slug"] = normalize_user_slug(payload.get("user_slug"))
@@ -96,8 +109,12 @@ def create_entry(db_path: str, payload: dict) -> dict:
     validated["created_at_utc"] = _now_utc_iso()
     validated["updated_at_utc"] = validated["created_at_utc"]
 
+    cache = get_latest_entries_cache(db_path)
     with get_connection(db_path) as conn:
+        version = cache.version(conn)
         entry, duplicate = repo_create_entry(conn, validated)
+        if not duplicate:
+            cache.record_write(conn, version, entry["id"], entry)
     if duplicate:
         raise DuplicateEntryError(entry)
     return entry
@@ -115,8 +132,9 @@ def stop_active_timed_event(
         _normalize_timestamp_utc(end_timestamp_utc, field_name="end_timestamp_utc")
         or _now_utc_iso()
     )
-    end_dt = _parse_utc_iso(end_timestamp, field_name="end_timestamp_utc")
+    end_ms = timestamp_to_ms(end_timestamp)
 
+    cache = get_latest_entries_cache(db_path)
     with get_connection(db_path) as conn:
         entry = repo_get_latest_active_timed_entry(
             conn,
@@ -126,11 +144,11 @@ def stop_active_timed_event(
         if not entry:
             raise EntryNotFoundError()
 
-        start_dt = _parse_utc_iso(entry["timestamp_utc"])
         duration_min = max(
             0,
-            math.floor(((end_dt - start_dt).total_seconds() / 60) + 0.5),
+            math.floor(((end_ms - entry["timestamp_ms"]) / 60000) + 0.5),
         )
+        version = cache.version(conn)
         updated = repo_update_entry(
             conn,
             entry["id"],
@@ -139,6 +157,7 @@ def stop_active_timed_event(
                 "updated_at_utc": _now_utc_iso(),
             },
         )
+        cache.record_write(conn, version, entry["id"], updated)
     if not updated:
         raise EntryNotFoundError()
     return updated
@@ -159,6 +178,29 @@ def _normalize_filter_ts(value: str | None) -> str | None:
     return parsed.astimezone(timezone.utc).isoformat()
 
 
+def _normalize_list_filters(
+    user_slug: str | None,
+    since_utc: str | None,
+    until_utc: str | None,
+    entry_type: str | None,
+) -> dict:
+    normalized_slug = normalize_user_slug(user_slug) if user_slug else None
+    normalized_since = _normalize_filter_ts(since_utc)
+    normalized_until = _normalize_filter_ts(until_utc)
+    normalized_type = None
+    if entry_type:
+        validate_entry_type(entry_type)
+        normalized_type = entry_type
+    if normalized_since and normalized_until and normalized_since > normalized_until:
+        raise ValueError("Invalid time window")
+    return {
+        "user_slug": normalized_slug,
+        "since_utc": normalized_since,
+        "until_utc": normalized_until,
+        "entry_type": normalized_type,
+    }
+
+
 def list_entries(
     db_path: str,
     limit: int = 50,
@@ -168,38 +210,139 @@ def list_entries(
     entry_type: str | None = None,
 ) -> list[dict]:
     safe_limit = max(1, limit)
+    filters = _normalize_list_filters(user_slug, since_utc, until_utc, entry_type)
+    with get_connection(db_path) as conn:
+        return repo_list_entries(conn, safe_limit, include_deleted=False, **filters)
+
+
+def encode_entries_cursor(entry: dict) -> str:
+    raw = f"{entry['timestamp_ms']}:{entry['id']}".encode("ascii")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_entries_cursor(value: str) -> tuple[int, int]:
+    try:
+        padded = value + "=" * (-len(value) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode("ascii")
+        timestamp_ms, entry_id = raw.split(":")
+        return int(timestamp_ms), int(entry_id)
+    except (ValueError, UnicodeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def list_entries_page(
+    db_path: str,
+    limit: int = 50,
+    user_slug: str | None = None,
+    since_utc: str | None = None,
+    until_utc: str | None = None,
+    entry_type: str | None = None,
+    cursor: str | None = None,
+) -> dict:
+    safe_limit = max(1, limit)
+    filters = _normalize_list_filters(user_slug, since_utc, until_utc, entry_type)
+    before = _decode_entries_cursor(cursor) if cursor else None
+    with get_connection(db_path) as conn:
+        rows = repo_list_entries(
+            conn,
+            safe_limit + 1,
+            include_deleted=False,
+            before=before,
+            **filters,
+        )
+    has_more = len(rows) > safe_limit
+    entries = rows[:safe_limit]
+    return {
+        "entries": entries,
+        "next_cursor": encode_entries_cursor(entries[-1]) if has_more else None,
+        "has_more": has_more,
+    }
+
+
+def aggregate_entries(
+    db_path: str,
+    bucket: str,
+    user_slug: str | None = None,
+    since_utc: str | None = None,
+    until_utc: str | None = None,
+    entry_type: str | None = None,
+    tz_offset_min: int = 0,
+) -> dict:
+    if bucket not in AGGREGATE_BUCKETS_MS:
+        raise ValueError("Invalid bucket")
+    if abs(tz_offset_min) > MAX_TZ_OFFSET_MIN:
+        raise ValueError("Invalid tz_offset_min")
+    filters = _normalize_list_filters(user_slug, since_utc, until_utc, entry_type)
+    with get_connection(db_path) as conn:
+        rows = repo_aggregate_entries(
+            conn, bucket, tz_offset_min=tz_offset_min, **filters
+        )
+    buckets = []
+    for row in rows:
+        total_ml = row["amount_ml"] + row["expressed_ml"] + row["formula_ml"]
+        buckets.append(
+            {
+                "bucket_start_utc": ms_to_datetime(row["bucket_start_ms"]).isoformat(),
+                **row,
+                "total_ml": round(total_ml, 1),
+            }
+        )
+    return {
+        "bucket": bucket,
+        "tz_offset_min": tz_offset_min,
+        "buckets": buckets,
+        "count": len(buckets),
+    }
+
+
+def _normalize_rollup_day(value: str | None) -> str | None:
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value).isoformat()
+    except ValueError as exc:
+        raise ValueError("Invalid day") from exc
+
+
+def list_daily_rollups(
+    db_path: str,
+    since_day: str | None = None,
+    until_day: str | None = None,
+    user_slug: str | None = None,
+    entry_type: str | None = None,
+) -> dict:
+    normalized_since = _normalize_rollup_day(since_day)
+    normalized_until = _normalize_rollup_day(until_day)
+    if normalized_since and normalized_until and normalized_since > normalized_until:
+        raise ValueError("Invalid time window")
     normalized_slug = normalize_user_slug(user_slug) if user_slug else None
-    normalized_since = _normalize_filter_ts(since_utc)
-    normalized_until = _normalize_filter_ts(until_utc)
-    normalized_type = None
     if entry_type:
         validate_entry_type(entry_type)
-        normalized_type = entry_type
-    if normalized_since and normalized_until and normalized_since > normalized_until:
-        raise ValueError("Invalid time window")
     with get_connection(db_path) as conn:
-        return repo_list_entries(
+        days = repo_list_daily_rollups(
             conn,
-            safe_limit,
+            since_day=normalized_since,
+            until_day=normalized_until,
             user_slug=normalized_slug,
-            since_utc=normalized_since,
-            until_utc=normalized_until,
-            entry_type=normalized_type,
-            include_deleted=False,
+            entry_type=entry_type or None,
         )
+    return {"days": days, "count": len(days)}
+
+
+def rebuild_daily_rollups(db_path: str) -> int:
+    with get_connection(db_path) as conn:
+        return repo_rebuild_daily_rollups(conn)
 
 
 def get_latest_entry_by_type(
     db_path: str, entry_type: str, user_slug: str | None = None
 ) -> dict | None:
     validate_entry_type(entry_type)
-    entries = list_entries(
-        db_path,
-        limit=1,
-        user_slug=user_slug,
-        entry_type=entry_type,
-    )
-    return entries[0] if entries else None
+    normalized_slug = normalize_user_slug(user_slug) if user_slug else None
+    with get_connection(db_path) as conn:
+        return get_latest_entries_cache(db_path).get(
+            conn, entry_type, user_slug=normalized_slug
+        )
 
 
 def get_next_feed_time(db_path: str, user_slug: str | None = None) -> dict:
@@ -208,17 +351,15 @@ def get_next_feed_time(db_path: str, user_slug: str | None = None) -> dict:
     latest_feed = get_latest_entry_by_type(db_path, "feed", user_slug=user_slug)
     if not latest_feed or not isinstance(feed_interval_min, int):
         return {"timestamp_utc": None, "source_entry_id": None}
-    last_timestamp = latest_feed.get("timestamp_utc")
-    if not isinstance(last_timestamp, str) or not last_timestamp.strip():
+    last_ms = latest_feed.get("timestamp_ms")
+    if not isinstance(last_ms, int):
         return {"timestamp_utc": None, "source_entry_id": None}
-    cleaned = last_timestamp.strip()
-    if cleaned.endswith("Z"):
-        cleaned = cleaned[:-1] + "+00:00"
-    parsed = datetime.fromisoformat(cleaned)
-    if parsed.tzinfo is None:
-        parsed = parsed.replace(tzinfo=timezone.utc)
-    next_dt = parsed.astimezone(timezone.utc) + timedelta(minutes=feed_interval_min)
-    return {"timestamp_utc": next_dt.isoformat(), "source_entry_id": latest_feed["id"]}
+    next_ms = last_ms + feed_interval_min * 60000
+    return {
+        "timestamp_utc": ms_to_datetime(next_ms).isoformat(),
+        "timestamp_ms": next_ms,
+        "source_entry_id": latest_feed["id"],
+    }
 
 
 def get_next_feed_schedule(
@@ -232,16 +373,10 @@ def get_next_feed_schedule(
     latest_feed = get_latest_entry_by_type(db_path, "feed", user_slug=user_slug)
     if not latest_feed or not isinstance(feed_interval_min, int):
         return {"interval_min": feed_interval_min, "source_entry_id": None, "items": []}
-    last_timestamp = latest_feed.get("timestamp_utc")
-    if not isinstance(last_timestamp, str) or not last_timestamp.strip():
+    last_ms = latest_feed.get("timestamp_ms")
+    if not isinstance(last_ms, int):
         return {"interval_min": feed_interval_min, "source_entry_id": None, "items": []}
-    cleaned = last_timestamp.strip()
-    if cleaned.endswith("Z"):
-        cleaned = cleaned[:-1] + "+00:00"
-    parsed = datetime.fromisoformat(cleaned)
-    if parsed.tzinfo is None:
-        parsed = parsed.replace(tzinfo=timezone.utc)
-    baseline = parsed.astimezone(timezone.utc)
+    baseline = ms_to_datetime(last_ms)
 
     items: list[dict] = []
     for index in range(1, safe_count + 1):
@@ -266,7 +401,7 @@ def get_entry_summary(db_path: str, user_slug: str | None = None) -> dict:
         {"title": "Last poo", "date_time": _format_summary_dt(last_poo)},
         {
             "title": "Next feed",
-            "date_time": _format_timestamp_value(next_feed.get("timestamp_utc")),
+            "date_time": _format_timestamp_ms(next_feed.get("timestamp_ms")),
         },
     ]
     return {
@@ -288,21 +423,13 @@ def build_entry_summary_text(items: list[dict]) -> str:
 def _format_summary_dt(entry: dict | None) -> str | None:
     if not entry:
         return None
-    return _format_timestamp_value(entry.get("timestamp_utc"))
+    return _format_timestamp_ms(entry.get("timestamp_ms"))
 
 
-def _format_timestamp_value(value: str | None) -> str | None:
-    if not value:
-        return None
-    cleaned = value.strip()
-    if not cleaned:
+def _format_timestamp_ms(value: int | None) -> str | None:
+    if value is None:
         return None
-    if cleaned.endswith("Z"):
-        cleaned = cleaned[:-1] + "+00:00"
-    parsed = datetime.fromisoformat(cleaned)
-    if parsed.tzinfo is None:
-        parsed = parsed.replace(tzinfo=timezone.utc)
-    return parsed.astimezone(timezone.utc).strftime("%Y-%m-%d %H:%M")
+    return ms_to_datetime(value).strftime("%Y-%m-%d %H:%M")
 
 
 def list_feed_amount_entries(
@@ -326,7 +453,7 @@ def list_feed_amount_entries(
             continue
         filtered.append(
             {
-                "date": _format_entry_date(entry.get("timestamp_utc")),
+                "date": _format_entry_date(entry.get("timestamp_ms")),
                 "expressed_ml": entry.get("expressed_ml"),
                 "formula_ml": entry.get("formula_ml"),
             }
@@ -334,45 +461,47 @@ def list_feed_amount_entries(
     return filtered
 
 
-def _format_entry_date(timestamp_utc: str | None) -> str:
-    if not timestamp_utc:
+def _format_entry_date(timestamp_ms: int | None) -> str:
+    if timestamp_ms is None:
         return ""
-    cleaned = timestamp_utc.strip()
-    if cleaned.endswith("Z"):
-        cleaned = cleaned[:-1] + "+00:00"
-    parsed = datetime.fromisoformat(cleaned)
-    if parsed.tzinfo is None:
-        parsed = parsed.replace(tzinfo=timezone.utc)
-    return parsed.astimezone(timezone.utc).strftime("%Y %m%d")
-
-
-def export_entries_csv(db_path: str, user_slug: str | None = None) -> str:
+    return ms_to_datetime(timestamp_ms).strftime("%Y %m%d")
+
+
+EXPORT_COLUMNS = [
+    "id",
+    "user_slug",
+    "type",
+    "timestamp_utc",
+    "client_event_id",
+    "notes",
+    "amount_ml",
+    "feed_duration_min",
+    "caregiver_id",
+    "created_at_utc",
+    "updated_at_utc",
+    "expressed_ml",
+    "formula_ml",
+    "deleted_at_utc",
+]
+
+
+def export_entries_csv(db_path: str, user_slug: str | None = None) -> Iterator[str]:
     normalized_slug = normalize_user_slug(user_slug) if user_slug else None
-    with get_connection(db_path) as conn:
-        entries = repo_list_entries_for_export(conn, user_slug=normalized_slug)
+    return _stream_entries_csv(db_path, normalized_slug)
 
+
+def _stream_entries_csv(db_path: str, user_slug: str | None) -> Iterator[str]:
     output = io.StringIO()
     writer = csv.writer(output)
-    columns = [
-        "id",
-        "user_slug",
-        "type",
-        "timestamp_utc",
-        "client_event_id",
-        "notes",
-        "amount_ml",
-        "feed_duration_min",
-        "caregiver_id",
-        "created_at_utc",
-        "updated_at_utc",
-        "expressed_ml",
-        "formula_ml",
-        "deleted_at_utc",
-    ]
-    writer.writerow(columns)
-    for entry in entries:
-        writer.writerow([entry.get(column) for column in columns])
-    return output.getvalue()
+    writer.writerow(EXPORT_COLUMNS)
+    yield output.getvalue()
+    with get_connection(db_path) as conn:
+        for batch in repo_iter_entries_for_export(conn, user_slug=user_slug):
+            output.seek(0)
+            output.truncate()
+            for entry in batch:
+                writer.writerow([entry.get(column) for column in EXPORT_COLUMNS])
+            yield output.getvalue()
 
 
 def import_entries_csv(db_path: str, user_slug: str, file_storage) -> dict:
@@ -435,19 +564,13 @@ def import_entries_csv(db_path: str, user_slug: str, file_storage) -> dict:
     if not rows:
         raise ValueError("CSV did not include any entries")
 
-    created = 0
-    duplicates = 0
+    now = _now_utc_iso()
+    for payload in rows:
+        payload["created_at_utc"] = now
+        payload["updated_at_utc"] = now
     with get_connection(db_path) as conn:
-        for payload in rows:
-            now = _now_utc_iso()
-            payload["created_at_utc"] = now
-            payload["updated_at_utc"] = now
-            _, duplicate = repo_create_entry(conn, payload)
-            if duplicate:
-                duplicates += 1
-            else:
-                created += 1
-    return {"created": created, "duplicates": duplicates}
+        created = repo_create_entries(conn, rows)
+    return {"created": created, "duplicates": len(rows) - created}
 
 
 def update_entry(db_path: str, entry_id: int, payload: dict) -> dict:
@@ -508,21 +631,75 @@ def update_entry(db_path: str, entry_id: int, payload: dict) -> dict:
         fields["caregiver_id"] = payload["caregiver_id"]
     fields["updated_at_utc"] = _now_utc_iso()
 
+    cache = get_latest_entries_cache(db_path)
     with get_connection(db_path) as conn:
+        version = cache.version(conn)
         entry = repo_update_entry(conn, entry_id, fields)
+        cache.record_write(conn, version, entry_id, entry)
     if not entry:
         raise EntryNotFoundError()
     return entry
 
 
 def delete_entry(db_path: str, entry_id: int) -> None:
+    cache = get_latest_entries_cache(db_path)
     with get_connection(db_path) as conn:
         now = _now_utc_iso()
+        version = cache.version(conn)
         deleted = repo_delete_entry(conn, entry_id, now, now)
+        cache.record_write(conn, version, entry_id, None)
     if not deleted:
         raise EntryNotFoundError()
 
 
+def _prepare_sync_change(change: object, now: str) -> dict:
+    if not isinstance(change, dict):
+        raise ValueError("change must be an object")
+    action = change.get("action")
+    if action == "upsert":
+        entry = change.get("entry")
+        if not isinstance(entry, dict):
+            raise ValueError("entry is required for upsert")
+        validated = validate_entry_payload(entry, require_client_event=True)
+        validated["user_slug"] = normalize_user_slug(entry.get("user_slug"))
+        if not validated.get("timestamp_utc"):
+            validated["timestamp_utc"] = now
+        validated["timestamp_utc"] = _normalize_timestamp_utc(
+            validated.get("timestamp_utc")
+        )
+        validated["created_at_utc"] = now
+        validated["updated_at_utc"] = now
+        validated["deleted_at_utc"] = entry.get("deleted_at_utc")
+        return {
+            "action": action,
+            "client_event_id": validated["client_event_id"],
+            "entry": validated,
+        }
+    if action == "delete":
+        client_event_id = change.get("client_event_id")
+        if not isinstance(client_event_id, str) or not client_event_id.strip():
+            raise ValueError("client_event_id is required for delete")
+        return {"action": action, "client_event_id": client_event_id}
+    raise ValueError("action must be 'upsert' or 'delete'")
+
+
+def _group_sync_changes(prepared: list[dict]) -> list[tuple[str, list[dict]]]:
+    groups: list[tuple[str, list[dict]]] = []
+    keys: set[str] = set()
+    for change in prepared:
+        if (
+            groups
+            and groups[-1][0] == change["action"]
+            and change["client_event_id"] not in keys
+        ):
+            groups[-1][1].append(change)
+        else:
+            groups.append((change["action"], [change]))
+            keys = set()
+        keys.add(change["client_event_id"])
+    return groups
+
+
 def sync_entries(db_path: str, payload: dict) -> dict:
     device_id = payload.get("device_id")
     if not isinstance(device_id, str) or not device_id.strip():
@@ -540,35 +717,48 @@ def sync_entries(db_path: str, payload: dict) -> dict:
         raise ValueError("changes must be a list")
 
     now = _now_utc_iso()
+    prepared: list[dict] = []
+    for index, change in enumerate(changes):
+        try:
+            prepared.append({"index": index, **_prepare_sync_change(change, now)})
+        except ValueError as exc:
+            raise SyncRejectedError(str(exc), index, len(changes)) from exc
+
+    results: list[dict] = []
     with get_connection(db_path) as conn:
-        for change in changes:
-            if not isinstance(change, dict):
-                raise ValueError("change must be an object")
-            action = change.get("action")
+        for action, group in _group_sync_changes(prepared):
             if action == "upsert":
-                entry = change.get("entry")
-                if not isinstance(entry, dict):
-                    raise ValueError("entry is required for upsert")
-                validated = validate_entry_payload(entry, require_client_event=True)
-                validated["user_slug"] = normalize_user_slug(entry.get("user_slug"))
-                if not validated.get("timestamp_utc"):
-                    validated["timestamp_utc"] = now
-                validated["timestamp_utc"] = _normalize_timestamp_utc(
-                    validated.get("timestamp_utc")
+                upserted = repo_upsert_entries_by_client_event_id(
+                    conn, [change["entry"] for change in group]
                 )
-                validated["created_at_utc"] = now
-                validated["updated_at_utc"] = now
-                validated["deleted_at_utc"] = entry.get("deleted_at_utc")
-                repo_upsert_entry_by_client_event_id(conn, validated)
-            elif action == "delete":
-                client_event_id = change.get("client_event_id")
-                if not isinstance(client_event_id, str) or not client_event_id.strip():
-                    raise ValueError("client_event_id is required for delete")
-                existing = repo_get_entry_by_client_event_id(conn, client_event_id)
-                if existing:
-                    repo_delete_entry(conn, existing["id"], now, now)
+                for change in group:
+                    client_event_id = change["client_event_id"]
+                    outcome = upserted[client_event_id]
+                    results.append(
+                        {
+                            "index": change["index"],
+                            "action": action,
+                            "client_event_id": client_event_id,
+                            "id": outcome["id"],
+                            "status": "created" if outcome["created"] else "updated",
+                        }
+                    )
             else:
-                raise ValueError("action must be 'upsert' or 'delete'")
+                deleted = repo_delete_entries_by_client_event_id(
+                    conn, [change["client_event_id"] for change in group], now, now
+                )
+                for change in group:
+                    client_event_id = change["client_event_id"]
+                    entry_id = deleted.pop(client_event_id, None)
+                    results.append(
+                        {
+                            "index": change["index"],
+                            "action": action,
+                            "client_event_id": client_event_id,
+                            "id": entry_id,
+                            "status": "deleted" if entry_id else "unchanged",
+                        }
+                    )
 
         query_cursor = normalized_cursor
         if query_cursor is None:
@@ -580,4 +770,4 @@ def sync_entries(db_path: str, payload: dict) -> dict:
         next_cursor = max(entry["updated_at_utc"] for entry in updated_entries)
     else:
         next_cursor = now
-    return {"cursor": next_cursor, "entries": updated_entries}
+    return {"cursor": next_cursor, "entries": updated_entries, "results": results}
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from src.app.services.push_delivery import deliver_web_pushes
 from src.app.services.push_subscriptions import (
     SendPushFn,
     VapidConfig,
@@ -37,7 +38,9 @@ def dispatch_entry_confirmation_push(
         tag=f"entry-confirmation-{user_slug}",
     )
     sender = send_fn or send_web_push
-    result = sender(subscription, payload, vapid_config)
+    result = deliver_web_pushes(
+        [(subscription, payload)], vapid_config, send_fn=sender
+    )[0]
     if result.get("sent"):
         return {"sent": True, "payload": payload, "user_slug": user_slug}
     if result.get("reason") == "invalid_subscription":
@@ -1,21 +1,30 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
+import heapq
 import logging
 import time
 import threading
+from typing import Collection
 
 from flask import Flask
 
-from src.app.services.entries import get_next_feed_time
+from src.app.services.push_delivery import (
+    deliver_web_pushes,
+    summarize_push_results,
+)
 from src.app.services.push_subscriptions import (
     SendPushFn,
     VapidConfig,
     build_push_payload,
-    delete_push_subscription,
-    list_push_subscriptions,
-    mark_push_subscription_notified,
-    send_web_push,
+)
+from src.app.storage.change_versions import get_change_versions
+from src.app.storage.db import get_connection
+from src.app.storage.entries import ms_to_datetime, timestamp_to_ms
+from src.app.storage.push_subscriptions import (
+    count_push_subscriptions as repo_count_push_subscriptions,
+    list_pending_feed_due as repo_list_pending_feed_due,
+    record_feed_due_deliveries as repo_record_feed_due_deliveries,
 )
 
 logger = logging.getLogger(__name__)
@@ -25,18 +34,17 @@ def _now_utc() -> datetime:
     return datetime.now(timezone.utc)
 
 
-def _parse_utc(value: str | None) -> datetime | None:
-    if not value:
-        return None
-    cleaned = value.strip()
-    if not cleaned:
-        return None
-    if cleaned.endswith("Z"):
-        cleaned = cleaned[:-1] + "+00:00"
-    parsed = datetime.fromisoformat(cleaned)
-    if parsed.tzinfo is None:
-        parsed = parsed.replace(tzinfo=timezone.utc)
-    return parsed.astimezone(timezone.utc)
+def _idle_reason(conn, now_ms: int) -> dict:
+    if repo_count_push_subscriptions(conn) == 0:
+        return {"sent": False, "reason": "missing_subscription"}
+    notified = repo_list_pending_feed_due(conn, now_ms, include_notified=True)
+    if notified:
+        return {
+            "sent": False,
+            "reason": "already_sent",
+            "users": [row["user_slug"] for row in notified],
+        }
+    return {"sent": False, "reason": "not_due"}
 
 
 def dispatch_feed_due(
@@ -45,85 +53,151 @@ def dispatch_feed_due(
     base_path: str = "",
     now_utc: datetime | None = None,
     send_fn: SendPushFn | None = None,
+    skip_users: Collection[str] = (),
 ) -> dict:
     now = now_utc or _now_utc()
+    now_ms = timestamp_to_ms(now.isoformat())
     if vapid_config is None:
         return {"sent": False, "reason": "missing_vapid_config"}
 
-    subscriptions = list_push_subscriptions(db_path)
-    if not subscriptions:
-        return {"sent": False, "reason": "missing_subscription"}
+    with get_connection(db_path) as conn:
+        due = repo_list_pending_feed_due(conn, now_ms)
+        if not due:
+            return _idle_reason(conn, now_ms)
+    due = [row for row in due if row["user_slug"] not in skip_users]
+    if not due:
+        return {"sent": False, "reason": "retry_pending"}
+
+    messages = [
+        (
+            subscription,
+            build_push_payload(
+                title="Feed due",
+                body="Time for a feed.",
+                url=f"{base_path}/{subscription['user_slug']}",
+                tag=f"feed-due-{subscription['user_slug']}",
+            ),
+        )
+        for subscription in due
+    ]
+    results = deliver_web_pushes(messages, vapid_config, send_fn=send_fn)
+    logger.info("Feed due pushes delivered: %s", summarize_push_results(results))
 
-    sender = send_fn or send_web_push
-    sent_users: list[str] = []
+    delivered: list[dict] = []
     invalid_users: list[str] = []
-    due_users: list[str] = []
-
-    for subscription in subscriptions:
-        user_slug = subscription.get("user_slug")
-        if not user_slug:
-            continue
-        next_feed = get_next_feed_time(db_path, user_slug=user_slug)
-        next_timestamp = next_feed.get("timestamp_utc")
-        source_entry_id = next_feed.get("source_entry_id")
-        if not next_timestamp or not source_entry_id:
-            continue
-        due_at = _parse_utc(next_timestamp)
-        if not due_at or now < due_at:
-            continue
-        due_users.append(user_slug)
-        if (
-            subscription.get("last_notified_entry_id") == source_entry_id
-            and subscription.get("last_notified_due_at_utc") == next_timestamp
-        ):
-            continue
-        payload = build_push_payload(
-            title="Feed due",
-            body="Time for a feed.",
-            url=f"{base_path}/{user_slug}" if user_slug else f"{base_path}/",
-            tag=f"feed-due-{user_slug}",
-        )
-        result = sender(subscription, payload, vapid_config)
+    failed_users: list[str] = []
+    for subscription, result in zip(due, results):
+        user_slug = subscription["user_slug"]
         if result.get("sent"):
-            mark_push_subscription_notified(
-                db_path,
-                user_slug=user_slug,
-                last_notified_entry_id=source_entry_id,
-                last_notified_due_at_utc=next_timestamp,
-                last_sent_at_utc=now.isoformat(),
+            delivered.append(
+                {
+                    "user_slug": user_slug,
+                    "last_notified_entry_id": subscription["source_entry_id"],
+                    "last_notified_due_at_utc": ms_to_datetime(
+                        subscription["due_ms"]
+                    ).isoformat(),
+                    "last_sent_at_utc": now.isoformat(),
+                }
             )
-            sent_users.append(user_slug)
-            continue
-        reason = result.get("reason")
-        if reason == "invalid_subscription":
-            delete_push_subscription(db_path, user_slug)
+        elif result.get("reason") == "invalid_subscription":
             invalid_users.append(user_slug)
+        else:
+            failed_users.append(user_slug)
+
+    if delivered or invalid_users:
+        with get_connection(db_path) as conn:
+            repo_record_feed_due_deliveries(conn, delivered, invalid_users)
 
-    if sent_users:
-        return {"sent": True, "users": sent_users}
+    if delivered:
+        return {"sent": True, "users": [state["user_slug"] for state in delivered]}
     if invalid_users:
         return {"sent": False, "reason": "invalid_subscription", "users": invalid_users}
-    if due_users:
-        return {"sent": False, "reason": "already_sent", "users": due_users}
-    return {"sent": False, "reason": "not_due"}
+    return {"sent": False, "reason": "push_failed", "users": failed_users}
+
+
+def plan_feed_due(
+    db_path: str, retry_at: dict[str, int] | None = None
+) -> list[tuple[int, str]]:
+    retry_at = retry_at or {}
+    with get_connection(db_path) as conn:
+        pending = repo_list_pending_feed_due(conn)
+    heap = [
+        (
+            max(row["due_ms"], retry_at.get(row["user_slug"], row["due_ms"])),
+            row["user_slug"],
+        )
+        for row in pending
+    ]
+    heapq.heapify(heap)
+    return heap
+
+
+class FeedDueScheduler:
+    def __init__(
+        self,
+        app: Flask,
+        poll_seconds: int,
+        send_fn: SendPushFn | None = None,
+    ) -> None:
+        self._app = app
+        self._poll_ms = poll_seconds * 1000
+        self._send_fn = send_fn
+        self._heap: list[tuple[int, str]] = []
+        self._retry_at: dict[str, int] = {}
+        self._versions: tuple | None = None
+
+    def next_due_ms(self) -> int | None:
+        return self._heap[0][0] if self._heap else None
+
+    def run_once(self, now: datetime) -> int:
+        db_path = self._app.config["DB_PATH"]
+        now_ms = timestamp_to_ms(now.isoformat())
+        with get_connection(db_path) as conn:
+            versions = get_change_versions(conn)
+        self._retry_at = {
+            user_slug: retry_ms
+            for user_slug, retry_ms in self._retry_at.items()
+            if retry_ms > now_ms
+        }
+        if versions != self._versions:
+            self._heap = plan_feed_due(db_path, self._retry_at)
+            self._versions = versions
+
+        if self._heap and self._heap[0][0] <= now_ms:
+            attempted = {
+                user_slug for due_ms, user_slug in self._heap if due_ms <= now_ms
+            }
+            with self._app.app_context():
+                dispatch_feed_due(
+                    db_path,
+                    vapid_config=self._app.config.get("VAPID_CONFIG"),
+                    base_path=self._app.config.get("BASE_PATH", ""),
+                    now_utc=now,
+                    send_fn=self._send_fn,
+                    skip_users=set(self._retry_at),
+                )
+            for user_slug in attempted:
+                self._retry_at[user_slug] = now_ms + self._poll_ms
+            self._heap = plan_feed_due(db_path, self._retry_at)
+
+        if not self._heap:
+            return self._poll_ms
+        return max(0, min(self._heap[0][0] - now_ms, self._poll_ms))
 
 
 def start_feed_due_scheduler(app: Flask, poll_seconds: int) -> None:
     if poll_seconds <= 0:
         return
+    scheduler = FeedDueScheduler(app, poll_seconds)
 
     def _loop() -> None:
         while True:
+            wait_ms = poll_seconds * 1000
             try:
-                with app.app_context():
-                    dispatch_feed_due(
-                        app.config["DB_PATH"],
-                        vapid_config=app.config.get("VAPID_CONFIG"),
-                        base_path=app.config.get("BASE_PATH", ""),
-                    )
+                wait_ms = scheduler.run_once(_now_utc())
             except Exception:
                 logger.exception("Feed due scheduler failed")
-            time.sleep(poll_seconds)
+            time.sleep(wait_ms / 1000)
 
     thread = threading.Thread(
         target=_loop,
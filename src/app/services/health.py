@@ -0,0 +1,10 @@
+from src.app.services.outbox import get_outbox_status
+from src.app.storage.db import check_connection_pool
+
+
+def get_health(db_path: str) -> dict:
+    database = check_connection_pool(db_path)
+    status = {"ok": database["ok"], "database": database}
+    if database["ok"]:
+        status["outbox"] = get_outbox_status(db_path)
+    return status
@@ -1,20 +1,29 @@
 from __future__ import annotations
 
 from datetime import datetime, timedelta, timezone
+import hashlib
 import json
 import logging
 import math
+import sqlite3
 import threading
 import time
 from urllib import request as urllib_request
 
 from flask import Flask
 
-from src.app.services.entries import get_next_feed_time, list_entries
-from src.app.services.feeding_goals import get_current_goal
 from src.app.services.settings import get_settings
+from src.app.storage.change_versions import get_change_versions
+from src.app.storage.db import get_connection
+from src.app.storage.entries import datetime_to_ms, ms_to_datetime
+from src.app.storage.home_kpis import (
+    get_home_kpi_inputs as repo_get_home_kpi_inputs,
+    get_home_kpis_delivery as repo_get_home_kpis_delivery,
+    record_home_kpis_delivery as repo_record_home_kpis_delivery,
+)
 
 BREASTFEED_IN_PROGRESS_NOTE = "Breastfeeding (started)"
+FEED_TOTAL_WINDOW_MS = 24 * 60 * 60 * 1000
 logger = logging.getLogger(__name__)
 
 
@@ -22,20 +31,6 @@ def _now_utc() -> datetime:
     return datetime.now(timezone.utc)
 
 
-def _parse_utc(value: str | None) -> datetime | None:
-    if not value:
-        return None
-    cleaned = value.strip()
-    if not cleaned:
-        return None
-    if cleaned.endswith("Z"):
-        cleaned = cleaned[:-1] + "+00:00"
-    parsed = datetime.fromisoformat(cleaned)
-    if parsed.tzinfo is None:
-        parsed = parsed.replace(tzinfo=timezone.utc)
-    return parsed.astimezone(timezone.utc)
-
-
 def _format_time_until(target: datetime | None, now: datetime) -> str:
     if not target:
         return "--"
@@ -78,25 +73,71 @@ def _compute_feed_total(entries: list[dict]) -> float:
     return total
 
 
-def build_home_kpis(db_path: str, user_slug: str | None = None) -> dict:
-    now = _now_utc()
-    window_start = now - timedelta(hours=24)
-    feeds = list_entries(
-        db_path,
-        limit=200,
-        user_slug=user_slug,
-        since_utc=window_start.isoformat(),
-        until_utc=now.isoformat(),
-        entry_type="feed",
-    )
-    feed_total_ml = _compute_feed_total(feeds)
+class HomeKpisCache:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._inputs: dict[str | None, tuple[tuple, int, float, dict]] = {}
+
+    def get(
+        self, conn: sqlite3.Connection, user_slug: str | None, now_ms: int
+    ) -> dict:
+        versions = get_change_versions(conn)
+        with self._lock:
+            cached = self._inputs.get(user_slug)
+        if cached is not None:
+            cached_versions, computed_ms, expires_ms, inputs = cached
+            if cached_versions == versions and computed_ms <= now_ms < expires_ms:
+                return inputs
+
+        inputs = repo_get_home_kpi_inputs(
+            conn,
+            now_ms - FEED_TOTAL_WINDOW_MS,
+            now_ms,
+            user_slug=user_slug,
+            excluded_note=BREASTFEED_IN_PROGRESS_NOTE,
+        )
+        expires_ms = math.inf
+        if inputs["window_first_ms"] is not None:
+            expires_ms = inputs["window_first_ms"] + FEED_TOTAL_WINDOW_MS + 1
+        if inputs["upcoming_ms"] is not None:
+            expires_ms = min(expires_ms, inputs["upcoming_ms"])
+        with self._lock:
+            self._inputs[user_slug] = (versions, now_ms, expires_ms, inputs)
+        return inputs
+
+
+_caches: dict[str, HomeKpisCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_home_kpis_cache(db_path: str) -> HomeKpisCache:
+    with _caches_lock:
+        cache = _caches.get(db_path)
+        if cache is None:
+            cache = HomeKpisCache()
+            _caches[db_path] = cache
+        return cache
+
+
+def _load_home_kpi_inputs(db_path: str, user_slug: str | None, now: datetime) -> dict:
+    with get_connection(db_path) as conn:
+        return get_home_kpis_cache(db_path).get(conn, user_slug, datetime_to_ms(now))
+
 
-    next_feed = get_next_feed_time(db_path, user_slug=user_slug)
-    next_timestamp = _parse_utc(next_feed.get("timestamp_utc"))
+def _next_feed_due_ms(inputs: dict) -> int | None:
+    feed_interval_min = inputs["feed_interval_min"]
+    if inputs["last_feed_ms"] is None or not isinstance(feed_interval_min, int):
+        return None
+    return inputs["last_feed_ms"] + feed_interval_min * 60000
+
+
+def _render_home_kpis(inputs: dict, now: datetime) -> dict:
+    feed_total_ml = inputs["feed_total_ml"]
+    next_due_ms = _next_feed_due_ms(inputs)
+    next_timestamp = None if next_due_ms is None else ms_to_datetime(next_due_ms)
     next_feed_text = _format_time_until(next_timestamp, now)
 
-    current_goal = get_current_goal(db_path)
-    goal_ml = current_goal.get("goal_ml") if current_goal else None
+    goal_ml = inputs["goal_ml"]
     if goal_ml is None:
         goal_value = None
     else:
@@ -121,6 +162,11 @@ def build_home_kpis(db_path: str, user_slug: str | None = None) -> dict:
     }
 
 
+def build_home_kpis(db_path: str, user_slug: str | None = None) -> dict:
+    now = _now_utc()
+    return _render_home_kpis(_load_home_kpi_inputs(db_path, user_slug, now), now)
+
+
 def _send_home_kpis(webhook_url: str, payload: dict) -> bool:
     data = json.dumps(payload).encode("utf-8")
     req = urllib_request.Request(
@@ -137,6 +183,21 @@ def _send_home_kpis(webhook_url: str, payload: dict) -> bool:
         return False
 
 
+def _inputs_hash(user_slug: str | None, inputs: dict) -> str:
+    encoded = json.dumps(
+        {
+            "user_slug": user_slug,
+            "feed_total_ml": inputs["feed_total_ml"],
+            "last_feed_ms": inputs["last_feed_ms"],
+            "next_due_ms": _next_feed_due_ms(inputs),
+            "goal_ml": inputs["goal_ml"],
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
 def dispatch_home_kpis(
     db_path: str,
     user_slug: str | None = None,
@@ -146,13 +207,52 @@ def dispatch_home_kpis(
     webhook_url = settings.get("home_kpis_webhook_url")
     if not webhook_url:
         return {"sent": False, "reason": "missing_webhook_url"}
-    payload = build_home_kpis(db_path, user_slug=user_slug)
+    now = _now_utc()
+    inputs = _load_home_kpi_inputs(db_path, user_slug, now)
+    payload = _render_home_kpis(inputs, now)
+    payload_hash = _inputs_hash(user_slug, inputs)
+    attempted_at = now.isoformat()
+    with get_connection(db_path) as conn:
+        delivery = repo_get_home_kpis_delivery(conn, webhook_url)
+    if delivery is not None and delivery["payload_hash"] == payload_hash:
+        with get_connection(db_path) as conn:
+            repo_record_home_kpis_delivery(conn, webhook_url, "skipped", attempted_at)
+        return {"sent": False, "reason": "unchanged"}
+
     sender = send_fn or _send_home_kpis
     if sender(webhook_url, payload):
+        with get_connection(db_path) as conn:
+            repo_record_home_kpis_delivery(
+                conn, webhook_url, "sent", attempted_at, payload_hash=payload_hash
+            )
         return {"sent": True, "payload": payload}
+    with get_connection(db_path) as conn:
+        repo_record_home_kpis_delivery(
+            conn, webhook_url, "failed", attempted_at, error="push_failed"
+        )
     return {"sent": False, "reason": "push_failed"}
 
 
+def get_home_kpis_delivery_stats(db_path: str) -> dict:
+    webhook_url = get_settings(db_path).get("home_kpis_webhook_url")
+    delivery = None
+    if webhook_url:
+        with get_connection(db_path) as conn:
+            delivery = repo_get_home_kpis_delivery(conn, webhook_url)
+    if delivery is None:
+        delivery = {
+            "webhook_url": webhook_url,
+            "payload_hash": None,
+            "sent_count": 0,
+            "skipped_count": 0,
+            "failed_count": 0,
+            "last_sent_at_utc": None,
+            "last_attempt_at_utc": None,
+            "last_error": None,
+        }
+    return delivery
+
+
 def start_home_kpis_scheduler(app: Flask, poll_seconds: int) -> None:
     if poll_seconds <= 0:
         return
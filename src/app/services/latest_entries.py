@@ -0,0 +1,90 @@
+import sqlite3
+import threading
+
+from src.app.storage.change_versions import ENTRIES_VERSION, get_change_version
+from src.app.storage.entries import list_entries as repo_list_entries
+
+LatestKey = tuple[str | None, str]
+
+
+def _copy(entry: dict | None) -> dict | None:
+    return dict(entry) if entry is not None else None
+
+
+class LatestEntriesCache:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._version: int | None = None
+        self._entries: dict[LatestKey, dict | None] = {}
+
+    def version(self, conn: sqlite3.Connection) -> int:
+        return get_change_version(conn, ENTRIES_VERSION)
+
+    def get(
+        self,
+        conn: sqlite3.Connection,
+        entry_type: str,
+        user_slug: str | None = None,
+    ) -> dict | None:
+        key = (user_slug, entry_type)
+        version = self.version(conn)
+        with self._lock:
+            if version != self._version:
+                self._version = version
+                self._entries.clear()
+            elif key in self._entries:
+                return _copy(self._entries[key])
+
+        rows = repo_list_entries(conn, 1, user_slug=user_slug, entry_type=entry_type)
+        entry = rows[0] if rows else None
+        with self._lock:
+            if self._version == version:
+                self._entries[key] = entry
+        return _copy(entry)
+
+    def record_write(
+        self,
+        conn: sqlite3.Connection,
+        version_before: int,
+        entry_id: int,
+        entry: dict | None,
+    ) -> None:
+        version = self.version(conn)
+        with self._lock:
+            if self._version != version_before:
+                self._version = None
+                self._entries.clear()
+                return
+            self._version = version
+            for key, cached in list(self._entries.items()):
+                if cached is not None and cached["id"] == entry_id:
+                    del self._entries[key]
+            if entry is None or entry.get("deleted_at_utc"):
+                return
+            for key in ((entry["user_slug"], entry["type"]), (None, entry["type"])):
+                if key not in self._entries:
+                    continue
+                cached = self._entries[key]
+                if cached is None or (entry["timestamp_ms"], entry["id"]) > (
+                    cached["timestamp_ms"],
+                    cached["id"],
+                ):
+                    self._entries[key] = dict(entry)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._version = None
+            self._entries.clear()
+
+
+_caches: dict[str, LatestEntriesCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_latest_entries_cache(db_path: str) -> LatestEntriesCache:
+    with _caches_lock:
+        cache = _caches.get(db_path)
+        if cache is None:
+            cache = LatestEntriesCache()
+            _caches[db_path] = cache
+        return cache
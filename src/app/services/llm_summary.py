@@ -1,24 +1,69 @@
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from dataclasses import dataclass
+import hashlib
+import http.client
 import json
+from json import decoder as json_decoder
+import logging
 import os
 import socket
+import time
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from string import Template
+from typing import Callable, Iterator
 from urllib import error as urllib_error
 from urllib import request as urllib_request
 
 from src.app.services.settings import get_settings
-from src.app.storage.db import get_connection
-from src.app.storage.entries import list_entries as repo_list_entries
+from src.app.storage.db import commit_unit_of_work, get_connection
+from src.app.storage.entries import datetime_to_ms
+from src.app.storage.entries import (
+    iter_entries_for_export as repo_iter_entries_for_export,
+)
+from src.app.storage.llm_summaries import (
+    get_llm_summary as repo_get_llm_summary,
+    list_llm_provider_metrics as repo_list_llm_provider_metrics,
+    record_llm_provider_call as repo_record_llm_provider_call,
+    save_llm_summary as repo_save_llm_summary,
+)
 from src.lib.validation import normalize_user_slug
 
-MAX_SUMMARY_EVENTS = 500
 COMPARE_DAY_COUNT = 7
+DAY_MS = 24 * 60 * 60 * 1000
+SUMMARY_CACHE_DAYS = 30
 OPENAI_API_URL = "https://api.openai.com/v1/chat/completions"
 DEFAULT_PROMPT_PATH = (
     Path(__file__).resolve().parents[1] / "prompts" / "llm_summary_prompt.txt"
 )
 PROMPT_PATH_ENV_VAR = "BABY_TRACKER_LLM_SUMMARY_PROMPT_PATH"
+PROMPT_ENCODING_ENV_VAR = "BABY_TRACKER_LLM_SUMMARY_PROMPT_ENCODING"
+TOKEN_BUDGET_ENV_VAR = "BABY_TRACKER_LLM_SUMMARY_TOKEN_BUDGET"
+PROMPT_ENCODINGS = ("compact", "json")
+DEFAULT_PROMPT_ENCODING = "compact"
+DEFAULT_TOKEN_BUDGET = 6000
+COMPACT_NOTE_CHARS = 160
+BUDGET_NOTE_CHARS = (80, 24, 0)
+COMPACT_EVENT_COLUMNS = (
+    "type",
+    "amount_ml",
+    "expressed_ml",
+    "formula_ml",
+    "feed_duration_min",
+    "weight_kg",
+    "caregiver_id",
+    "notes",
+)
+SUMMARY_SYSTEM_PROMPT = (
+    "You produce concise, factual baby handover summaries in strict JSON."
+)
+SUMMARY_LIST_SECTIONS = (
+    "selected_day",
+    "comparison_to_previous_7_days",
+    "follow_up",
+)
+logger = logging.getLogger(__name__)
 
 
 class LlmSummaryError(Exception):
@@ -27,10 +72,318 @@ class LlmSummaryError(Exception):
         self.status_code = status_code
 
 
+class LlmProvider(ABC):
+    name = ""
+    label = ""
+
+    def __init__(self, model: str, timeout_seconds: int) -> None:
+        self.model = model
+        self.timeout_seconds = timeout_seconds
+
+    @abstractmethod
+    def complete(self, prompt: str) -> str: ...
+
+    @abstractmethod
+    def stream(self, prompt: str) -> Iterator[str]: ...
+
+
+class OpenAIProvider(LlmProvider):
+    name = "openai"
+    label = "OpenAI"
+
+    def complete(self, prompt: str) -> str:
+        return _call_openai(
+            model=self.model,
+            prompt=prompt,
+            timeout_seconds=self.timeout_seconds,
+        )
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        return _stream_openai(
+            model=self.model,
+            prompt=prompt,
+            timeout_seconds=self.timeout_seconds,
+        )
+
+
+class OllamaProvider(LlmProvider):
+    name = "ollama"
+    label = "Ollama"
+
+    def __init__(
+        self,
+        base_url: str,
+        model: str,
+        timeout_seconds: int,
+        thinking_enabled: bool = False,
+    ) -> None:
+        super().__init__(model, timeout_seconds)
+        self.base_url = base_url.rstrip("/")
+        self.thinking_enabled = thinking_enabled
+
+    def _request(self, prompt: str, stream: bool):
+        body = {
+            "model": self.model,
+            "stream": stream,
+            "format": "json",
+            "think": self.thinking_enabled,
+            "options": {"temperature": 0.2},
+            "messages": [
+                {"role": "system", "content": SUMMARY_SYSTEM_PROMPT},
+                {"role": "user", "content": prompt},
+            ],
+        }
+        return urllib_request.Request(
+            f"{self.base_url}/api/chat",
+            data=json.dumps(body).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+
+    def complete(self, prompt: str) -> str:
+        req = self._request(prompt, stream=False)
+        with _provider_errors(self.label):
+            with urllib_request.urlopen(req, timeout=self.timeout_seconds) as response:
+                raw = response.read().decode("utf-8")
+        try:
+            content = json.loads(raw)["message"].get("content")
+        except (json.JSONDecodeError, KeyError, TypeError, AttributeError) as exc:
+            raise LlmSummaryError("Ollama returned malformed JSON", 502) from exc
+        if not isinstance(content, str) or not content.strip():
+            raise LlmSummaryError("Ollama returned an empty summary", 502)
+        return content.strip()
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        req = self._request(prompt, stream=True)
+        received = False
+        with _provider_errors(self.label):
+            with urllib_request.urlopen(req, timeout=self.timeout_seconds) as response:
+                for raw_line in response:
+                    if not raw_line.strip():
+                        continue
+                    try:
+                        data = json.loads(raw_line)
+                        content = (data.get("message") or {}).get("content")
+                    except (json.JSONDecodeError, AttributeError) as exc:
+                        raise LlmSummaryError(
+                            "Ollama returned malformed JSON", 502
+                        ) from exc
+                    if data.get("error"):
+                        raise LlmSummaryError(f"Ollama error: {data['error']}", 502)
+                    if isinstance(content, str) and content:
+                        if content.strip():
+                            received = True
+                        yield content
+                    if data.get("done"):
+                        break
+        if not received:
+            raise LlmSummaryError("Ollama returned an empty summary", 502)
+
+
+def _openai_provider(settings: dict) -> LlmProvider:
+    return OpenAIProvider(settings["openai_model"], settings["openai_timeout_seconds"])
+
+
+def _ollama_provider(settings: dict) -> LlmProvider:
+    return OllamaProvider(
+        settings["ollama_base_url"],
+        settings["ollama_model"],
+        settings["ollama_timeout_seconds"],
+        thinking_enabled=settings["ollama_thinking_enabled"],
+    )
+
+
+LLM_PROVIDER_FACTORIES: dict[str, Callable[[dict], LlmProvider]] = {
+    "openai": _openai_provider,
+    "ollama": _ollama_provider,
+}
+
+
+def build_llm_providers(settings: dict) -> list[LlmProvider]:
+    names = [settings["llm_provider"]]
+    fallback = settings.get("llm_fallback_provider")
+    if fallback and fallback not in names:
+        names.append(fallback)
+    return [LLM_PROVIDER_FACTORIES[name](settings) for name in names]
+
+
+@dataclass
+class _PreparedSummary:
+    since_utc: datetime
+    until_utc: datetime
+    compare_since_utc: datetime
+    buckets: "_SummaryBuckets"
+    providers: list[LlmProvider]
+    user_slug: str | None
+    template: str | None = None
+    encoding: str = DEFAULT_PROMPT_ENCODING
+    token_budget: int = DEFAULT_TOKEN_BUDGET
+    prompt_over_budget: bool = False
+    cached: dict | None = None
+    cached_provider: LlmProvider | None = None
+
+
 def generate_llm_summary(
     db_path: str,
     payload: dict,
 ) -> dict:
+    prepared = _prepare_llm_summary(db_path, payload)
+    if not prepared.buckets.selected_entries:
+        return _skipped_summary_payload(prepared)
+    if prepared.cached is not None:
+        return _summary_payload(
+            prepared,
+            prepared.cached_provider,
+            prepared.cached["summary"],
+            prepared.cached["created_at_utc"],
+            "hit",
+        )
+    prompt = _prepared_prompt(prepared)
+    commit_unit_of_work(db_path)
+    first_error: LlmSummaryError | None = None
+    for index, provider in enumerate(prepared.providers):
+        started = time.perf_counter()
+        try:
+            structured_summary = _parse_structured_summary(
+                provider.complete(prompt), provider.label
+            )
+        except LlmSummaryError as exc:
+            _record_provider_call(
+                db_path, provider, "failure", _elapsed_ms(started), error=str(exc)
+            )
+            first_error = first_error or exc
+            continue
+        _record_provider_call(
+            db_path, provider, "success", _elapsed_ms(started), fallback=index > 0
+        )
+        generated_at_utc = _save_summary(
+            db_path, prepared, provider, structured_summary
+        )
+        return _summary_payload(
+            prepared, provider, structured_summary, generated_at_utc, "miss"
+        )
+    assert first_error is not None
+    raise first_error
+
+
+def stream_llm_summary(
+    db_path: str,
+    payload: dict,
+) -> Iterator[tuple[str, dict]]:
+    prepared = _prepare_llm_summary(db_path, payload)
+    return _stream_prepared_summary(db_path, prepared)
+
+
+def _stream_prepared_summary(
+    db_path: str,
+    prepared: _PreparedSummary,
+) -> Iterator[tuple[str, dict]]:
+    if not prepared.buckets.selected_entries:
+        yield "summary", _skipped_summary_payload(prepared)
+        return
+    if prepared.cached is not None:
+        structured_summary = prepared.cached["summary"]
+        for section in _summary_sections(structured_summary):
+            yield "section", section
+        yield "summary", _summary_payload(
+            prepared,
+            prepared.cached_provider,
+            structured_summary,
+            prepared.cached["created_at_utc"],
+            "hit",
+        )
+        return
+    prompt = _prepared_prompt(prepared)
+    commit_unit_of_work(db_path)
+    first_error: LlmSummaryError | None = None
+    for index, provider in enumerate(prepared.providers):
+        parser = _SummarySectionParser()
+        started = time.perf_counter()
+        first_chunk_ms = None
+        emitted = False
+        try:
+            for delta in provider.stream(prompt):
+                if first_chunk_ms is None:
+                    first_chunk_ms = _elapsed_ms(started)
+                for section in parser.feed(delta):
+                    emitted = True
+                    yield "section", section
+            structured_summary = _parse_structured_summary(
+                parser.text, provider.label
+            )
+        except LlmSummaryError as exc:
+            _record_provider_call(
+                db_path,
+                provider,
+                "failure",
+                _elapsed_ms(started),
+                first_chunk_ms=first_chunk_ms,
+                error=str(exc),
+            )
+            if emitted:
+                raise
+            first_error = first_error or exc
+            continue
+        _record_provider_call(
+            db_path,
+            provider,
+            "success",
+            _elapsed_ms(started),
+            first_chunk_ms=first_chunk_ms,
+            fallback=index > 0,
+        )
+        generated_at_utc = _save_summary(
+            db_path, prepared, provider, structured_summary
+        )
+        yield "summary", _summary_payload(
+            prepared, provider, structured_summary, generated_at_utc, "miss"
+        )
+        return
+    assert first_error is not None
+    raise first_error
+
+
+def get_llm_provider_metrics(db_path: str) -> dict:
+    settings = get_settings(db_path)
+    with get_connection(db_path) as conn:
+        providers = repo_list_llm_provider_metrics(conn)
+    return {
+        "provider": settings["llm_provider"],
+        "fallback_provider": settings["llm_fallback_provider"],
+        "providers": providers,
+    }
+
+
+def _elapsed_ms(started: float) -> int:
+    return int((time.perf_counter() - started) * 1000)
+
+
+def _record_provider_call(
+    db_path: str,
+    provider: LlmProvider,
+    outcome: str,
+    latency_ms: int,
+    first_chunk_ms: int | None = None,
+    fallback: bool = False,
+    error: str | None = None,
+) -> None:
+    if outcome == "failure":
+        logger.warning("%s summary request failed: %s", provider.label, error)
+    with get_connection(db_path) as conn:
+        repo_record_llm_provider_call(
+            conn,
+            provider.name,
+            provider.model,
+            outcome,
+            latency_ms,
+            datetime.now(timezone.utc).isoformat(),
+            first_chunk_ms=first_chunk_ms,
+            fallback=fallback,
+            error=error,
+        )
+
+
+def _prepare_llm_summary(db_path: str, payload: dict) -> _PreparedSummary:
     since_utc = _normalize_timestamp(payload.get("since_utc"), "since_utc")
     until_utc = _normalize_timestamp(payload.get("until_utc"), "until_utc")
     if since_utc >= until_utc:
@@ -41,73 +394,167 @@ def generate_llm_summary(
     normalized_slug = normalize_user_slug(user_slug) if user_slug else None
     compare_since_utc = since_utc - timedelta(days=COMPARE_DAY_COUNT)
 
+    buckets = _SummaryBuckets(since_utc, until_utc)
     with get_connection(db_path) as conn:
-        entries = repo_list_entries(
+        for batch in repo_iter_entries_for_export(
             conn,
-            MAX_SUMMARY_EVENTS,
             user_slug=normalized_slug,
             since_utc=compare_since_utc.isoformat(),
             until_utc=until_utc.isoformat(),
             include_deleted=False,
-        )
+        ):
+            for entry in batch:
+                buckets.add(entry)
+    prepared = _PreparedSummary(
+        since_utc=since_utc,
+        until_utc=until_utc,
+        compare_since_utc=compare_since_utc,
+        buckets=buckets,
+        providers=build_llm_providers(get_settings(db_path)),
+        user_slug=normalized_slug,
+    )
+    if not buckets.selected_entries:
+        return prepared
+
+    prepared.template = _load_prompt_template()
+    prepared.encoding = _get_prompt_encoding()
+    prepared.token_budget = _get_token_budget()
+    with get_connection(db_path) as conn:
+        for provider in prepared.providers:
+            cached = repo_get_llm_summary(
+                conn, _provider_cache_key(prepared, provider)
+            )
+            if cached is not None:
+                prepared.cached = cached
+                prepared.cached_provider = provider
+                break
+    return prepared
 
-    ordered_entries = sorted(entries, key=lambda entry: entry["timestamp_utc"])
-    selected_entries = [
-        entry
-        for entry in ordered_entries
-        if since_utc <= _normalize_timestamp(entry["timestamp_utc"], "timestamp_utc")
-        < until_utc
-    ]
-    settings = get_settings(db_path)
-    model = settings["openai_model"]
-    if not selected_entries:
-        return {
-            "summary": "",
-            "event_count": 0,
-            "context_event_count": len(ordered_entries),
-            "model": model,
-            "provider": "openai",
-            "generated_at_utc": datetime.now(timezone.utc).isoformat(),
-            "window": {
-                "since_utc": since_utc.isoformat(),
-                "until_utc": until_utc.isoformat(),
-            },
-            "comparison_window": {
-                "since_utc": compare_since_utc.isoformat(),
-                "until_utc": since_utc.isoformat(),
-                "days": COMPARE_DAY_COUNT,
-            },
-            "skipped": True,
-        }
 
-    prompt = _build_prompt(ordered_entries, selected_entries, since_utc, until_utc)
-    response = _call_openai(
-        model=model,
-        prompt=prompt,
-        timeout_seconds=settings["openai_timeout_seconds"],
+def _provider_cache_key(prepared: _PreparedSummary, provider: LlmProvider) -> str:
+    return _summary_cache_key(
+        provider=provider.name,
+        model=provider.model,
+        since_utc=prepared.since_utc,
+        until_utc=prepared.until_utc,
+        user_slug=prepared.user_slug,
+        template=prepared.template or "",
+        fingerprint=prepared.buckets.fingerprint,
+        prompt_encoding=f"{prepared.encoding}:{prepared.token_budget}",
     )
-    structured_summary = _parse_structured_summary(response)
-    summary_text = _render_summary_markdown(structured_summary)
+
+
+def _prepared_prompt(prepared: _PreparedSummary) -> str:
+    prompt, prepared.prompt_over_budget = _fit_prompt(
+        prepared.buckets.comparison_days(),
+        prepared.buckets.selected_entries,
+        prepared.since_utc,
+        prepared.until_utc,
+        prepared.template,
+        encoding=prepared.encoding,
+        token_budget=prepared.token_budget,
+    )
+    return prompt
+
+
+def _save_summary(
+    db_path: str,
+    prepared: _PreparedSummary,
+    provider: LlmProvider,
+    structured_summary: dict,
+) -> str:
+    generated_at = datetime.now(timezone.utc)
+    generated_at_utc = generated_at.isoformat()
+    with get_connection(db_path) as conn:
+        repo_save_llm_summary(
+            conn,
+            _provider_cache_key(prepared, provider),
+            provider.name,
+            provider.model,
+            structured_summary,
+            generated_at_utc,
+            (generated_at - timedelta(days=SUMMARY_CACHE_DAYS)).isoformat(),
+        )
+    return generated_at_utc
+
+
+def _summary_windows(prepared: _PreparedSummary) -> dict:
     return {
-        "summary": summary_text,
-        "structured_summary": structured_summary,
-        "event_count": len(selected_entries),
-        "context_event_count": len(ordered_entries),
-        "model": model,
-        "provider": "openai",
-        "generated_at_utc": datetime.now(timezone.utc).isoformat(),
         "window": {
-            "since_utc": since_utc.isoformat(),
-            "until_utc": until_utc.isoformat(),
+            "since_utc": prepared.since_utc.isoformat(),
+            "until_utc": prepared.until_utc.isoformat(),
         },
         "comparison_window": {
-            "since_utc": compare_since_utc.isoformat(),
-            "until_utc": since_utc.isoformat(),
+            "since_utc": prepared.compare_since_utc.isoformat(),
+            "until_utc": prepared.since_utc.isoformat(),
             "days": COMPARE_DAY_COUNT,
         },
     }
 
 
+def _skipped_summary_payload(prepared: _PreparedSummary) -> dict:
+    provider = prepared.providers[0]
+    return {
+        "summary": "",
+        "event_count": 0,
+        "context_event_count": prepared.buckets.event_count,
+        "model": provider.model,
+        "provider": provider.name,
+        "generated_at_utc": datetime.now(timezone.utc).isoformat(),
+        **_summary_windows(prepared),
+        "skipped": True,
+    }
+
+
+def _summary_payload(
+    prepared: _PreparedSummary,
+    provider: LlmProvider,
+    structured_summary: dict,
+    generated_at_utc: str,
+    cache_status: str,
+) -> dict:
+    return {
+        "summary": _render_summary_markdown(structured_summary),
+        "structured_summary": structured_summary,
+        "event_count": len(prepared.buckets.selected_entries),
+        "context_event_count": prepared.buckets.event_count,
+        "model": provider.model,
+        "provider": provider.name,
+        "fallback": provider is not prepared.providers[0],
+        "generated_at_utc": generated_at_utc,
+        "cache": cache_status,
+        "prompt_over_budget": prepared.prompt_over_budget,
+        **_summary_windows(prepared),
+    }
+
+
+def _summary_cache_key(
+    *,
+    provider: str,
+    model: str,
+    since_utc: datetime,
+    until_utc: datetime,
+    user_slug: str | None,
+    template: str,
+    fingerprint: list[tuple[int | None, str | None]],
+    prompt_encoding: str,
+) -> str:
+    material = json.dumps(
+        {
+            "provider": provider,
+            "model": model,
+            "since_utc": since_utc.isoformat(),
+            "until_utc": until_utc.isoformat(),
+            "user_slug": user_slug,
+            "template": template,
+            "prompt_encoding": prompt_encoding,
+            "entries": sorted(fingerprint),
+        },
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
 def _normalize_timestamp(value: object, field: str) -> datetime:
     if not isinstance(value, str):
         raise ValueError(f"{field} must be ISO-8601")
@@ -130,29 +577,221 @@ def _build_prompt(
     selected_entries: list[dict],
     since_utc: datetime,
     until_utc: datetime,
+    template: str | None = None,
 ) -> str:
     comparison_days = _build_comparison_days(all_entries, since_utc, until_utc)
-    selected_day_stats = _build_day_stats(selected_entries)
-    selected_lines = json.dumps(
-        [_summarize_entry(entry) for entry in selected_entries],
-        ensure_ascii=False,
-        indent=2,
+    return _render_prompt(
+        comparison_days, selected_entries, since_utc, until_utc, template
     )
-    comparison_lines = json.dumps(comparison_days, ensure_ascii=False, indent=2)
-    template = _load_prompt_template()
-    return _render_prompt_template(
+
+
+def _render_prompt(
+    comparison_days: list[dict],
+    selected_entries: list[dict],
+    since_utc: datetime,
+    until_utc: datetime,
+    template: str | None = None,
+    encoding: str = "json",
+    token_budget: int = 0,
+) -> str:
+    prompt, _over_budget = _fit_prompt(
+        comparison_days,
+        selected_entries,
+        since_utc,
+        until_utc,
         template,
-        {
-            "selected_day_since_utc": since_utc.isoformat(),
-            "selected_day_until_utc": until_utc.isoformat(),
-            "selected_day_stats_json": json.dumps(
-                selected_day_stats,
-                ensure_ascii=False,
-            ),
-            "selected_day_events_json": selected_lines,
-            "comparison_days_json": comparison_lines,
-        },
+        encoding=encoding,
+        token_budget=token_budget,
     )
+    return prompt
+
+
+def _fit_prompt(
+    comparison_days: list[dict],
+    selected_entries: list[dict],
+    since_utc: datetime,
+    until_utc: datetime,
+    template: str | None = None,
+    encoding: str = "json",
+    token_budget: int = 0,
+) -> tuple[str, bool]:
+    if template is None:
+        template = _load_prompt_template()
+    selected_day_stats = _build_day_stats(selected_entries)
+    if encoding == "compact":
+        stats_text = json.dumps(
+            {key: value for key, value in selected_day_stats.items() if value},
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+    else:
+        stats_text = json.dumps(selected_day_stats, ensure_ascii=False)
+
+    def render_events(note_chars: int | None) -> str:
+        if encoding == "compact":
+            return _compact_events_table(selected_entries, since_utc, note_chars)
+        return json.dumps(
+            [_summarize_entry(entry, note_chars) for entry in selected_entries],
+            ensure_ascii=False,
+            indent=2,
+        )
+
+    def render(notes: list[list[str]], events_text: str, first_day: int) -> str:
+        days = comparison_days[first_day:]
+        if encoding == "compact":
+            comparison_text = _compact_comparison_table(days, notes[first_day:])
+        else:
+            comparison_text = json.dumps(
+                [
+                    {**day, "sample_notes": day_notes}
+                    for day, day_notes in zip(days, notes[first_day:])
+                ],
+                ensure_ascii=False,
+                indent=2,
+            )
+        return _render_prompt_template(
+            template,
+            {
+                "selected_day_since_utc": since_utc.isoformat(),
+                "selected_day_until_utc": until_utc.isoformat(),
+                "selected_day_stats_json": stats_text,
+                "selected_day_events_json": events_text,
+                "comparison_days_json": comparison_text,
+            },
+        )
+
+    notes = [list(day["sample_notes"]) for day in comparison_days]
+    if encoding == "compact":
+        notes = _dedupe_comparison_notes(notes, selected_entries)
+    events_text = render_events(None)
+    first_day = 0
+    prompt = render(notes, events_text, first_day)
+    if token_budget <= 0:
+        return prompt, False
+
+    def over_budget() -> bool:
+        return _estimate_tokens(prompt) > token_budget
+
+    while over_budget() and any(notes):
+        index = max(range(len(notes)), key=lambda day: (len(notes[day]), -day))
+        notes[index].pop()
+        prompt = render(notes, events_text, first_day)
+    for note_chars in BUDGET_NOTE_CHARS:
+        if not over_budget():
+            break
+        events_text = render_events(note_chars)
+        prompt = render(notes, events_text, first_day)
+    while over_budget() and first_day < len(comparison_days):
+        first_day += 1
+        prompt = render(notes, events_text, first_day)
+    if over_budget():
+        logger.warning(
+            "AI summary prompt is ~%s tokens, over the %s token budget",
+            _estimate_tokens(prompt),
+            token_budget,
+        )
+        return prompt, True
+    return prompt, False
+
+
+def _estimate_tokens(text: str) -> int:
+    return (len(text) + 3) // 4
+
+
+def _clip_text(text: str, limit: int) -> str:
+    if len(text) > limit:
+        return text[: limit - 1].rstrip() + "…"
+    return text
+
+
+def _compact_text(value: object, limit: int = COMPACT_NOTE_CHARS) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return _clip_text(" ".join(str(value).replace("|", "/").split()), limit)
+
+
+def _compact_offset(timestamp_ms: int, since_ms: int) -> str:
+    minutes = (timestamp_ms - since_ms) // 60000
+    sign = "-" if minutes < 0 else "+"
+    hours, minutes = divmod(abs(minutes), 60)
+    return f"{sign}{hours}:{minutes:02d}"
+
+
+def _compact_events_table(
+    entries: list[dict], since_utc: datetime, note_chars: int | None = None
+) -> str:
+    if not entries:
+        return "(none)"
+    since_ms = datetime_to_ms(since_utc)
+    slugs = list(dict.fromkeys(entry.get("user_slug") or "-" for entry in entries))
+    columns = [
+        column
+        for column in COMPACT_EVENT_COLUMNS
+        if any(entry.get(column) not in (None, "") for entry in entries)
+        and not (column == "notes" and note_chars == 0)
+    ]
+    limits = {"notes": note_chars or COMPACT_NOTE_CHARS}
+    lines = ["(time = h:mm after the window start)"]
+    if len(slugs) == 1:
+        lines.append(f"user: {slugs[0]}")
+        header = ["time", *columns]
+    else:
+        aliases = {slug: f"u{index}" for index, slug in enumerate(slugs, start=1)}
+        lines.append(
+            "users: " + " ".join(f"{alias}={slug}" for slug, alias in aliases.items())
+        )
+        header = ["time", "user", *columns]
+    lines.append("|".join(header))
+    for entry in entries:
+        row = [_compact_offset(entry["timestamp_ms"], since_ms)]
+        if len(slugs) > 1:
+            row.append(aliases[entry.get("user_slug") or "-"])
+        row.extend(
+            _compact_text(entry.get(column), limits.get(column, COMPACT_NOTE_CHARS))
+            for column in columns
+        )
+        lines.append("|".join(row))
+    return "\n".join(lines)
+
+
+def _compact_comparison_table(
+    comparison_days: list[dict], notes: list[list[str]]
+) -> str:
+    keys = [
+        key
+        for key in _new_day_stats()
+        if any(day["stats"].get(key) for day in comparison_days)
+    ]
+    lines = [
+        "(day = days before the selected window)",
+        "|".join(["day", *keys, "notes"]),
+    ]
+    for index, day in enumerate(comparison_days):
+        row = [f"-{len(comparison_days) - index}d"]
+        row.extend(_compact_text(day["stats"].get(key)) for key in keys)
+        row.append("; ".join(_compact_text(note) for note in notes[index]))
+        lines.append("|".join(row))
+    return "\n".join(lines)
+
+
+def _dedupe_comparison_notes(
+    notes: list[list[str]], selected_entries: list[dict]
+) -> list[list[str]]:
+    seen = {
+        _compact_text(entry.get("notes")).casefold()
+        for entry in selected_entries
+        if entry.get("notes")
+    }
+    deduped: list[list[str]] = [[] for _ in notes]
+    for index in range(len(notes) - 1, -1, -1):
+        for note in notes[index]:
+            key = _compact_text(note).casefold()
+            if key not in seen:
+                seen.add(key)
+                deduped[index].append(note)
+    return deduped
 
 
 def _get_prompt_path() -> Path:
@@ -162,6 +801,33 @@ def _get_prompt_path() -> Path:
     return DEFAULT_PROMPT_PATH
 
 
+def _get_prompt_encoding() -> str:
+    value = (os.getenv(PROMPT_ENCODING_ENV_VAR) or "").strip().lower()
+    if not value:
+        return DEFAULT_PROMPT_ENCODING
+    if value not in PROMPT_ENCODINGS:
+        raise LlmSummaryError(
+            f"{PROMPT_ENCODING_ENV_VAR} must be one of: {', '.join(PROMPT_ENCODINGS)}",
+            500,
+        )
+    return value
+
+
+def _get_token_budget() -> int:
+    value = (os.getenv(TOKEN_BUDGET_ENV_VAR) or "").strip()
+    if not value:
+        return DEFAULT_TOKEN_BUDGET
+    try:
+        budget = int(value)
+    except ValueError:
+        budget = -1
+    if budget < 0:
+        raise LlmSummaryError(
+            f"{TOKEN_BUDGET_ENV_VAR} must be a non-negative integer", 500
+        )
+    return budget
+
+
 def _load_prompt_template() -> str:
     prompt_path = _get_prompt_path()
     try:
@@ -190,37 +856,70 @@ def _render_prompt_template(template_text: str, values: dict[str, str]) -> str:
         ) from exc
 
 
+class _SummaryBuckets:
+    def __init__(self, since_utc: datetime, until_utc: datetime) -> None:
+        self.since_utc = since_utc
+        self.until_utc = until_utc
+        self.since_ms = datetime_to_ms(since_utc)
+        self.until_ms = datetime_to_ms(until_utc)
+        self.event_count = 0
+        self.fingerprint: list[tuple[int | None, str | None]] = []
+        self.selected_entries: list[dict] = []
+        self._stats = [_new_day_stats() for _ in range(COMPARE_DAY_COUNT)]
+        self._notes: list[list[str]] = [[] for _ in range(COMPARE_DAY_COUNT)]
+
+    def add(self, entry: dict) -> None:
+        timestamp_ms = entry["timestamp_ms"]
+        self.event_count += 1
+        self.fingerprint.append((entry.get("id"), entry.get("updated_at_utc")))
+        if self.since_ms <= timestamp_ms < self.until_ms:
+            self.selected_entries.append(entry)
+        offset = max(1, (self.since_ms - timestamp_ms - 1) // DAY_MS + 1)
+        note = entry.get("notes")
+        while offset <= COMPARE_DAY_COUNT and (
+            timestamp_ms < self.until_ms - offset * DAY_MS
+        ):
+            index = COMPARE_DAY_COUNT - offset
+            _add_to_day_stats(self._stats[index], entry)
+            notes = self._notes[index]
+            if len(notes) < 3 and isinstance(note, str) and note.strip():
+                notes.append(note.strip())
+            offset += 1
+
+    def comparison_days(self) -> list[dict]:
+        comparison_days: list[dict] = []
+        for index, offset in enumerate(range(COMPARE_DAY_COUNT, 0, -1)):
+            comparison_days.append(
+                {
+                    "window": {
+                        "since_utc": (
+                            self.since_utc - timedelta(days=offset)
+                        ).isoformat(),
+                        "until_utc": (
+                            self.until_utc - timedelta(days=offset)
+                        ).isoformat(),
+                    },
+                    "stats": _finish_day_stats(dict(self._stats[index])),
+                    "sample_notes": list(self._notes[index]),
+                }
+            )
+        return comparison_days
+
+
 def _build_comparison_days(
     all_entries: list[dict],
     since_utc: datetime,
     until_utc: datetime,
 ) -> list[dict]:
-    comparison_days: list[dict] = []
-    for offset in range(COMPARE_DAY_COUNT, 0, -1):
-        window_since = since_utc - timedelta(days=offset)
-        window_until = until_utc - timedelta(days=offset)
-        day_entries = []
-        for entry in all_entries:
-            entry_ts = _normalize_timestamp(entry["timestamp_utc"], "timestamp_utc")
-            if window_since <= entry_ts < window_until:
-                day_entries.append(entry)
-        day_entries.sort(key=lambda entry: entry["timestamp_utc"])
-        comparison_days.append(
-            {
-                "window": {
-                    "since_utc": window_since.isoformat(),
-                    "until_utc": window_until.isoformat(),
-                },
-                "stats": _build_day_stats(day_entries),
-                "sample_notes": _collect_sample_notes(day_entries),
-            }
-        )
-    return comparison_days
+    buckets = _SummaryBuckets(since_utc, until_utc)
+    for entry in sorted(all_entries, key=lambda entry: entry["timestamp_ms"]):
+        buckets.add(entry)
+    return buckets.comparison_days()
 
 
-def _build_day_stats(entries: list[dict]) -> dict:
-    stats = {
-        "event_count": len(entries),
+def _new_day_stats() -> dict:
+    return {
+        "event_count": 0,
         "feed_count": 0,
         "total_feed_ml": 0.0,
         "amount_total_ml": 0.0,
@@ -236,65 +935,63 @@ def _build_day_stats(entries: list[dict]) -> dict:
         "cry_count": 0,
         "timed_event_count": 0,
     }
-    for entry in entries:
-        entry_type = str(entry.get("type") or "").strip().lower()
-        total_amount = 0.0
-        for key in ("amount_ml", "expressed_ml", "formula_ml"):
-            value = entry.get(key)
-            if isinstance(value, (int, float)):
-                total_amount += float(value)
-        duration = entry.get("feed_duration_min")
-        duration_min = int(duration) if isinstance(duration, int) else 0
-        if entry_type == "feed":
-            stats["feed_count"] += 1
-            stats["total_feed_ml"] += total_amount
-            amount_value = entry.get("amount_ml")
-            if isinstance(amount_value, (int, float)):
-                stats["amount_total_ml"] += float(amount_value)
-            expressed_value = entry.get("expressed_ml")
-            if isinstance(expressed_value, (int, float)):
-                stats["expressed_total_ml"] += float(expressed_value)
-            formula_value = entry.get("formula_ml")
-            if isinstance(formula_value, (int, float)):
-                stats["formula_total_ml"] += float(formula_value)
-            if duration_min > 0:
-                stats["breastfeed_count"] += 1
-            if isinstance(entry.get("formula_ml"), (int, float)):
-                stats["formula_feed_count"] += 1
-            if isinstance(entry.get("expressed_ml"), (int, float)):
-                stats["expressed_feed_count"] += 1
-        elif entry_type == "wee":
-            stats["wee_count"] += 1
-        elif entry_type == "poo":
-            stats["poo_count"] += 1
-        elif entry_type == "sleep":
-            stats["sleep_count"] += 1
-            stats["sleep_total_min"] += duration_min
-            stats["timed_event_count"] += 1
-        elif entry_type == "cry":
-            stats["cry_count"] += 1
-            stats["timed_event_count"] += 1
-        elif duration_min > 0:
-            stats["timed_event_count"] += 1
+
+
+def _add_to_day_stats(stats: dict, entry: dict) -> None:
+    stats["event_count"] += 1
+    entry_type = str(entry.get("type") or "").strip().lower()
+    duration = entry.get("feed_duration_min")
+    duration_min = duration if isinstance(duration, (int, float)) else 0
+    if entry_type == "feed":
+        stats["feed_count"] += 1
+        amount_value = entry.get("amount_ml")
+        if isinstance(amount_value, (int, float)):
+            stats["amount_total_ml"] += float(amount_value)
+            stats["total_feed_ml"] += float(amount_value)
+        expressed_value = entry.get("expressed_ml")
+        if isinstance(expressed_value, (int, float)):
+            stats["expressed_total_ml"] += float(expressed_value)
+            stats["total_feed_ml"] += float(expressed_value)
+            stats["expressed_feed_count"] += 1
+        formula_value = entry.get("formula_ml")
+        if isinstance(formula_value, (int, float)):
+            stats["formula_total_ml"] += float(formula_value)
+            stats["total_feed_ml"] += float(formula_value)
+            stats["formula_feed_count"] += 1
+        if duration_min > 0:
+            stats["breastfeed_count"] += 1
+    elif entry_type == "wee":
+        stats["wee_count"] += 1
+    elif entry_type == "poo":
+        stats["poo_count"] += 1
+    elif entry_type == "sleep":
+        stats["sleep_count"] += 1
+        stats["sleep_total_min"] += duration_min
+        stats["timed_event_count"] += 1
+    elif entry_type == "cry":
+        stats["cry_count"] += 1
+        stats["timed_event_count"] += 1
+    elif duration_min > 0:
+        stats["timed_event_count"] += 1
+
+
+def _finish_day_stats(stats: dict) -> dict:
     stats["total_feed_ml"] = round(stats["total_feed_ml"], 1)
     stats["amount_total_ml"] = round(stats["amount_total_ml"], 1)
     stats["expressed_total_ml"] = round(stats["expressed_total_ml"], 1)
     stats["formula_total_ml"] = round(stats["formula_total_ml"], 1)
+    stats["sleep_total_min"] = round(stats["sleep_total_min"], 1)
     return stats
 
 
-def _collect_sample_notes(entries: list[dict], limit: int = 3) -> list[str]:
-    notes: list[str] = []
+def _build_day_stats(entries: list[dict]) -> dict:
+    stats = _new_day_stats()
     for entry in entries:
-        note = entry.get("notes")
-        if isinstance(note, str) and note.strip():
-            notes.append(note.strip())
-        if len(notes) >= limit:
-            break
-    return notes
+        _add_to_day_stats(stats, entry)
+    return _finish_day_stats(stats)
 
 
-def _summarize_entry(entry: dict) -> dict:
+def _summarize_entry(entry: dict, note_chars: int | None = None) -> dict:
     result = {
         "type": entry.get("type"),
         "timestamp_utc": entry.get("timestamp_utc"),
@@ -312,53 +1009,69 @@ def _summarize_entry(entry: dict) -> dict:
         value = entry.get(key)
         if value is not None:
             result[key] = value
+    if note_chars is not None and isinstance(result.get("notes"), str):
+        if note_chars:
+            result["notes"] = _clip_text(result["notes"], note_chars)
+        else:
+            del result["notes"]
     return result
 
 
-def _call_openai(
-    model: str,
-    prompt: str,
-    timeout_seconds: int,
-) -> str:
+@contextmanager
+def _provider_errors(label: str):
+    try:
+        yield
+    except TimeoutError as exc:
+        raise LlmSummaryError(f"{label} request timed out", 504) from exc
+    except socket.timeout as exc:
+        raise LlmSummaryError(f"{label} request timed out", 504) from exc
+    except urllib_error.HTTPError as exc:
+        raise LlmSummaryError(f"{label} returned HTTP {exc.code}", 502) from exc
+    except urllib_error.URLError as exc:
+        raise LlmSummaryError(f"{label} is unavailable", 503) from exc
+    except ConnectionError as exc:
+        raise LlmSummaryError(f"{label} is unavailable", 503) from exc
+    except http.client.HTTPException as exc:
+        raise LlmSummaryError(
+            f"{label} returned an incomplete response", 502
+        ) from exc
+
+
+def _openai_request(model: str, prompt: str, stream: bool = False):
     api_key = os.getenv("BABY_TRACKER_OPENAI_API_KEY") or os.getenv("OPENAI_API_KEY")
     if not api_key:
         raise LlmSummaryError("OpenAI API key is not configured", 503)
-    body = json.dumps(
-        {
-            "model": model,
-            "temperature": 0.2,
-            "response_format": {"type": "json_object"},
-            "messages": [
-                {
-                    "role": "system",
-                    "content": (
-                        "You produce concise, factual baby handover summaries in strict JSON."
-                    ),
-                },
-                {"role": "user", "content": prompt},
-            ],
-        }
-    ).encode("utf-8")
-    req = urllib_request.Request(
+    request_body = {
+        "model": model,
+        "temperature": 0.2,
+        "response_format": {"type": "json_object"},
+        "messages": [
+            {"role": "system", "content": SUMMARY_SYSTEM_PROMPT},
+            {"role": "user", "content": prompt},
+        ],
+    }
+    if stream:
+        request_body["stream"] = True
+    return urllib_request.Request(
         OPENAI_API_URL,
-        data=body,
+        data=json.dumps(request_body).encode("utf-8"),
         headers={
             "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json",
         },
         method="POST",
     )
-    try:
+
+
+def _call_openai(
+    model: str,
+    prompt: str,
+    timeout_seconds: int,
+) -> str:
+    req = _openai_request(model, prompt)
+    with _provider_errors("OpenAI"):
         with urllib_request.urlopen(req, timeout=timeout_seconds) as response:
             raw = response.read().decode("utf-8")
-    except TimeoutError as exc:
-        raise LlmSummaryError("OpenAI request timed out", 504) from exc
-    except socket.timeout as exc:
-        raise LlmSummaryError("OpenAI request timed out", 504) from exc
-    except urllib_error.HTTPError as exc:
-        raise LlmSummaryError(f"OpenAI returned HTTP {exc.code}", 502) from exc
-    except urllib_error.URLError as exc:
-        raise LlmSummaryError("OpenAI is unavailable", 503) from exc
 
     try:
         data = json.loads(raw)
@@ -372,7 +1085,96 @@ def _call_openai(
     return content.strip()
 
 
-def _parse_structured_summary(content: str) -> dict:
+def _stream_openai(
+    model: str,
+    prompt: str,
+    timeout_seconds: int,
+) -> Iterator[str]:
+    req = _openai_request(model, prompt, stream=True)
+    received = False
+    with _provider_errors("OpenAI"):
+        with urllib_request.urlopen(req, timeout=timeout_seconds) as response:
+            for raw_line in response:
+                line = raw_line.decode("utf-8").strip()
+                if not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    break
+                try:
+                    choices = json.loads(data).get("choices") or [{}]
+                    content = (choices[0].get("delta") or {}).get("content")
+                except (json.JSONDecodeError, AttributeError, TypeError) as exc:
+                    raise LlmSummaryError(
+                        "OpenAI returned malformed JSON", 502
+                    ) from exc
+                if isinstance(content, str) and content:
+                    if content.strip():
+                        received = True
+                    yield content
+    if not received:
+        raise LlmSummaryError("OpenAI returned an empty summary", 502)
+
+
+class _SummarySectionParser:
+    def __init__(self) -> None:
+        self.text = ""
+        self._index = 0
+        self._key: str | None = None
+        self._expect_key = False
+        self._in_list = False
+
+    def feed(self, delta: str) -> list[dict]:
+        self.text += delta
+        sections: list[dict] = []
+        text = self.text
+        while self._index < len(text):
+            char = text[self._index]
+            if char == '"':
+                try:
+                    value, end = json_decoder.scanstring(text, self._index + 1)
+                except json.JSONDecodeError:
+                    break
+                self._index = end
+                if self._in_list or not self._expect_key:
+                    section = self._section(value)
+                    if section is not None:
+                        sections.append(section)
+                else:
+                    self._key = value
+                continue
+            if char in "{,":
+                self._expect_key = not self._in_list
+            elif char == ":":
+                self._expect_key = False
+            elif char == "[":
+                self._in_list = True
+            elif char == "]":
+                self._in_list = False
+            self._index += 1
+        return sections
+
+    def _section(self, value: str) -> dict | None:
+        text = value.strip()
+        if not text:
+            return None
+        if self._key == "headline" and not self._in_list:
+            return {"section": "headline", "text": text}
+        if self._key in SUMMARY_LIST_SECTIONS and self._in_list:
+            return {"section": self._key, "text": text}
+        return None
+
+
+def _summary_sections(structured_summary: dict) -> list[dict]:
+    sections = [{"section": "headline", "text": structured_summary["headline"]}]
+    for key in SUMMARY_LIST_SECTIONS:
+        sections.extend(
+            {"section": key, "text": bullet} for bullet in structured_summary[key]
+        )
+    return sections
+
+
+def _parse_structured_summary(content: str, label: str = "OpenAI") -> dict:
     cleaned = content.strip()
     if cleaned.startswith("```"):
         cleaned = cleaned.strip("`")
@@ -382,18 +1184,21 @@ def _parse_structured_summary(content: str) -> dict:
     try:
         data = json.loads(cleaned)
     except json.JSONDecodeError as exc:
-        raise LlmSummaryError("OpenAI returned invalid summary JSON", 502) from exc
+        raise LlmSummaryError(f"{label} returned invalid summary JSON", 502) from exc
     if not isinstance(data, dict):
-        raise LlmSummaryError("OpenAI returned invalid summary JSON", 502)
+        raise LlmSummaryError(f"{label} returned invalid summary JSON", 502)
     headline = data.get("headline")
-    selected_day = _normalize_bullet_list(data.get("selected_day"), "selected_day")
+    selected_day = _normalize_bullet_list(
+        data.get("selected_day"), "selected_day", label
+    )
     comparison = _normalize_bullet_list(
         data.get("comparison_to_previous_7_days"),
         "comparison_to_previous_7_days",
+        label,
     )
-    follow_up = _normalize_bullet_list(data.get("follow_up"), "follow_up")
+    follow_up = _normalize_bullet_list(data.get("follow_up"), "follow_up", label)
     if not isinstance(headline, str) or not headline.strip():
-        raise LlmSummaryError("OpenAI returned invalid summary JSON", 502)
+        raise LlmSummaryError(f"{label} returned invalid summary JSON", 502)
     return {
         "headline": headline.strip(),
         "selected_day": selected_day,
@@ -402,16 +1207,18 @@ def _parse_structured_summary(content: str) -> dict:
     }
 
 
-def _normalize_bullet_list(value: object, field: str) -> list[str]:
+def _normalize_bullet_list(
+    value: object, field: str, label: str = "OpenAI"
+) -> list[str]:
     if not isinstance(value, list):
-        raise LlmSummaryError(f"OpenAI returned invalid {field}", 502)
+        raise LlmSummaryError(f"{label} returned invalid {field}", 502)
     cleaned = [
         item.strip()
         for item in value
         if isinstance(item, str) and item.strip()
     ]
     if not cleaned:
-        raise LlmSummaryError(f"OpenAI returned empty {field}", 502)
+        raise LlmSummaryError(f"{label} returned empty {field}", 502)
     return cleaned
 
 
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+import logging
+import threading
+from typing import Callable
+
+from flask import Flask
+
+from src.app.services.entry_confirmation import dispatch_entry_confirmation_push
+from src.app.services.home_kpis import dispatch_home_kpis
+from src.app.services.webhooks import send_entry_webhook
+from src.app.storage.db import get_connection
+from src.app.storage.entries import datetime_to_ms
+from src.app.storage.outbox import (
+    claim_due_outbox as repo_claim_due_outbox,
+    complete_outbox as repo_complete_outbox,
+    count_outbox as repo_count_outbox,
+    enqueue_coalesced_outbox as repo_enqueue_coalesced_outbox,
+    enqueue_outbox as repo_enqueue_outbox,
+    fail_outbox as repo_fail_outbox,
+    retry_outbox as repo_retry_outbox,
+)
+
+ENTRY_CONFIRMATION_PUSH = "entry_confirmation_push"
+ENTRY_WEBHOOK = "entry_webhook"
+HOME_KPIS_WEBHOOK = "home_kpis_webhook"
+OUTBOX_BATCH_SIZE = 20
+OUTBOX_LEASE_MS = 60_000
+OUTBOX_BACKOFF_BASE_MS = 5_000
+OUTBOX_BACKOFF_MAX_MS = 15 * 60_000
+OUTBOX_MAX_ATTEMPTS = 8
+logger = logging.getLogger(__name__)
+
+OutboxHandler = Callable[[Flask, dict], None]
+
+
+class OutboxRetry(Exception):
+    pass
+
+
+def _now_utc() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _deliver_entry_confirmation_push(app: Flask, payload: dict) -> None:
+    result = dispatch_entry_confirmation_push(
+        app.config["DB_PATH"],
+        payload["entry"],
+        vapid_config=app.config.get("VAPID_CONFIG"),
+        base_path=app.config.get("BASE_PATH", ""),
+    )
+    if result.get("reason") == "push_failed":
+        raise OutboxRetry("push_failed")
+
+
+def _deliver_entry_webhook(app: Flask, payload: dict) -> None:
+    if not send_entry_webhook(app.config["DB_PATH"], payload["entry"]):
+        raise OutboxRetry("webhook_failed")
+
+
+def _deliver_home_kpis_webhook(app: Flask, payload: dict) -> None:
+    result = dispatch_home_kpis(app.config["DB_PATH"])
+    if result.get("reason") == "push_failed":
+        raise OutboxRetry("push_failed")
+
+
+OUTBOX_HANDLERS: dict[str, OutboxHandler] = {
+    ENTRY_CONFIRMATION_PUSH: _deliver_entry_confirmation_push,
+    ENTRY_WEBHOOK: _deliver_entry_webhook,
+    HOME_KPIS_WEBHOOK: _deliver_home_kpis_webhook,
+}
+COALESCED_KINDS = frozenset({HOME_KPIS_WEBHOOK})
+
+
+def enqueue_outbox(
+    db_path: str, kind: str, payload: dict, delay_ms: int = 0
+) -> int | None:
+    if kind not in OUTBOX_HANDLERS:
+        raise ValueError(f"Unknown outbox kind: {kind}")
+    now = _now_utc()
+    next_attempt_ms = datetime_to_ms(now) + delay_ms
+    enqueue = (
+        repo_enqueue_coalesced_outbox
+        if kind in COALESCED_KINDS
+        else repo_enqueue_outbox
+    )
+    with get_connection(db_path) as conn:
+        return enqueue(conn, kind, payload, now.isoformat(), next_attempt_ms)
+
+
+def enqueue_entry_created(
+    db_path: str,
+    entry: dict,
+    include_webhooks: bool = True,
+    home_kpis_coalesce_seconds: int = 0,
+) -> None:
+    enqueue_outbox(db_path, ENTRY_CONFIRMATION_PUSH, {"entry": entry})
+    if include_webhooks:
+        enqueue_outbox(db_path, ENTRY_WEBHOOK, {"entry": entry})
+        enqueue_outbox(
+            db_path,
+            HOME_KPIS_WEBHOOK,
+            {},
+            delay_ms=home_kpis_coalesce_seconds * 1000,
+        )
+
+
+def outbox_backoff_ms(attempts: int) -> int:
+    return min(OUTBOX_BACKOFF_BASE_MS * 2 ** (attempts - 1), OUTBOX_BACKOFF_MAX_MS)
+
+
+def dispatch_outbox(app: Flask, limit: int = OUTBOX_BATCH_SIZE) -> dict:
+    db_path = app.config["DB_PATH"]
+    now_ms = datetime_to_ms(_now_utc())
+    with get_connection(db_path) as conn:
+        claimed = repo_claim_due_outbox(conn, now_ms, OUTBOX_LEASE_MS, limit)
+    stats = {"claimed": len(claimed), "delivered": 0, "retried": 0, "failed": 0}
+
+    for item in claimed:
+        handler = OUTBOX_HANDLERS.get(item["kind"])
+        error = None
+        try:
+            if handler is None:
+                raise LookupError(f"Unknown outbox kind: {item['kind']}")
+            with app.app_context():
+                handler(app, item["payload"])
+        except OutboxRetry as exc:
+            error = str(exc)
+        except Exception as exc:
+            logger.exception("Outbox delivery failed for %s", item["kind"])
+            error = str(exc) or exc.__class__.__name__
+
+        now = _now_utc()
+        with get_connection(db_path) as conn:
+            if error is None:
+                repo_complete_outbox(conn, item["id"])
+                stats["delivered"] += 1
+            elif item["attempts"] >= OUTBOX_MAX_ATTEMPTS or handler is None:
+                repo_fail_outbox(conn, item["id"], now.isoformat(), error)
+                stats["failed"] += 1
+            else:
+                repo_retry_outbox(
+                    conn,
+                    item["id"],
+                    datetime_to_ms(now) + outbox_backoff_ms(item["attempts"]),
+                    error,
+                )
+                stats["retried"] += 1
+    return stats
+
+
+def get_outbox_status(db_path: str) -> dict:
+    with get_connection(db_path) as conn:
+        return repo_count_outbox(conn)
+
+
+def wake_outbox_dispatcher(app: Flask) -> None:
+    wake = app.extensions.get("outbox_wake")
+    if wake is not None:
+        wake.set()
+
+
+def start_outbox_dispatcher(app: Flask, poll_seconds: int) -> None:
+    if poll_seconds <= 0:
+        return
+    wake = threading.Event()
+
+    def _loop() -> None:
+        while True:
+            wake.wait(poll_seconds)
+            wake.clear()
+            try:
+                while dispatch_outbox(app)["claimed"] == OUTBOX_BATCH_SIZE:
+                    pass
+            except Exception:
+                logger.exception("Outbox dispatcher failed")
+
+    thread = threading.Thread(
+        target=_loop,
+        daemon=True,
+        name="outbox-dispatcher",
+    )
+    thread.start()
+    app.extensions["outbox_wake"] = wake
+    app.extensions["outbox_dispatcher"] = thread
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import threading
+
+from src.app.services.push_subscriptions import (
+    SendPushFn,
+    VapidConfig,
+    send_web_push,
+)
+
+PUSH_MAX_WORKERS = 4
+logger = logging.getLogger(__name__)
+
+PushMessage = tuple[dict, dict]
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=PUSH_MAX_WORKERS,
+                thread_name_prefix="web-push",
+            )
+        return _executor
+
+
+def _send(
+    sender: SendPushFn, subscription: dict, payload: dict, vapid_config: VapidConfig
+) -> dict:
+    try:
+        return sender(subscription, payload, vapid_config)
+    except Exception:
+        logger.exception("Web push delivery failed for %s", subscription.get("user_slug"))
+        return {"sent": False, "reason": "push_failed"}
+
+
+def deliver_web_pushes(
+    messages: list[PushMessage],
+    vapid_config: VapidConfig,
+    send_fn: SendPushFn | None = None,
+) -> list[dict]:
+    sender = send_fn or send_web_push
+    if len(messages) <= 1:
+        return [
+            _send(sender, subscription, payload, vapid_config)
+            for subscription, payload in messages
+        ]
+    executor = _get_executor()
+    futures = [
+        executor.submit(_send, sender, subscription, payload, vapid_config)
+        for subscription, payload in messages
+    ]
+    return [future.result() for future in futures]
+
+
+def summarize_push_results(results: list[dict]) -> dict:
+    summary = {"sent": 0, "invalid_subscription": 0, "push_failed": 0}
+    for result in results:
+        if result.get("sent"):
+            summary["sent"] += 1
+        elif result.get("reason") == "invalid_subscription":
+            summary["invalid_subscription"] += 1
+        else:
+            summary["push_failed"] += 1
+    return summary
@@ -1,9 +1,14 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import importlib
 import json
+import logging
+import os
+import threading
+import time
 from typing import Callable
+from urllib.parse import urlsplit
 
 from src.app.storage.db import get_connection
 from src.app.storage.push_subscriptions import (
@@ -15,12 +20,59 @@ from src.app.storage.push_subscriptions import (
 )
 from src.lib.validation import normalize_user_slug
 
+PUSH_SEND_TIMEOUT_SECONDS = 10
+PUSH_SESSION_POOL_SIZE = 4
+VAPID_TOKEN_TTL_SECONDS = 12 * 60 * 60
+VAPID_TOKEN_REFRESH_SECONDS = 60 * 60
+logger = logging.getLogger(__name__)
+
+
+class VapidHeaderCache:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._headers: dict[str, tuple[int, dict]] = {}
+
+    def headers_for(
+        self,
+        signer,
+        subject: str,
+        audience: str,
+        now: int | None = None,
+    ) -> dict:
+        now = int(time.time()) if now is None else now
+        with self._lock:
+            cached = self._headers.get(audience)
+            if cached is not None and cached[0] - now > VAPID_TOKEN_REFRESH_SECONDS:
+                return dict(cached[1])
+            expires = now + VAPID_TOKEN_TTL_SECONDS
+            headers = signer.sign({"sub": subject, "aud": audience, "exp": expires})
+            self._headers[audience] = (expires, headers)
+        return dict(headers)
+
 
 @dataclass(frozen=True)
 class VapidConfig:
     public_key: str
     private_key: str
     subject: str
+    signer: object | None = field(default=None, compare=False, repr=False)
+    header_cache: VapidHeaderCache = field(
+        default_factory=VapidHeaderCache, compare=False, repr=False
+    )
+
+
+def _load_vapid_signer(private_key: str):
+    try:
+        py_vapid = importlib.import_module("py_vapid")
+    except ImportError:
+        return None
+    try:
+        if os.path.isfile(private_key):
+            return py_vapid.Vapid.from_file(private_key_file=private_key)
+        return py_vapid.Vapid.from_string(private_key=private_key)
+    except Exception:
+        logger.warning("VAPID private key could not be parsed; signing per push")
+        return None
 
 
 def build_vapid_config(
@@ -34,6 +86,7 @@ def build_vapid_config(
         public_key=public_key,
         private_key=private_key,
         subject=subject,
+        signer=_load_vapid_signer(private_key),
     )
 
 
@@ -132,29 +185,91 @@ def build_push_payload(
     }
 
 
-def send_web_push(subscription: dict, payload: dict, vapid_config: VapidConfig) -> dict:
+def _endpoint_origin(endpoint: str) -> str:
+    parts = urlsplit(endpoint)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+class PushSessionPool:
+    def __init__(self, pool_size: int = PUSH_SESSION_POOL_SIZE) -> None:
+        self._pool_size = pool_size
+        self._lock = threading.Lock()
+        self._sessions: dict[str, object] = {}
+
+    def session_for(self, endpoint: str):
+        origin = _endpoint_origin(endpoint)
+        with self._lock:
+            session = self._sessions.get(origin)
+            if session is None:
+                requests = importlib.import_module("requests")
+                session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(
+                    pool_connections=1,
+                    pool_maxsize=self._pool_size,
+                )
+                session.mount(f"{origin}/", adapter)
+                self._sessions[origin] = session
+            return session
+
+    def close(self) -> None:
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+
+_push_sessions = PushSessionPool()
+
+
+def get_push_session_pool() -> PushSessionPool:
+    return _push_sessions
+
+
+def send_web_push(
+    subscription: dict,
+    payload: dict,
+    vapid_config: VapidConfig,
+    timeout: float = PUSH_SEND_TIMEOUT_SECONDS,
+) -> dict:
     try:
         pywebpush = importlib.import_module("pywebpush")
     except ImportError as exc:
         raise RuntimeError(
             "pywebpush is required for native push notifications"
         ) from exc
+    requests = importlib.import_module("requests")
 
     webpush = pywebpush.webpush
     webpush_exception = pywebpush.WebPushException
+    endpoint = subscription["endpoint"]
+    if vapid_config.signer is not None:
+        vapid_kwargs = {
+            "headers": vapid_config.header_cache.headers_for(
+                vapid_config.signer,
+                vapid_config.subject,
+                _endpoint_origin(endpoint),
+            )
+        }
+    else:
+        vapid_kwargs = {
+            "vapid_private_key": vapid_config.private_key,
+            "vapid_claims": {"sub": vapid_config.subject},
+        }
 
     try:
         webpush(
             subscription_info={
-                "endpoint": subscription["endpoint"],
+                "endpoint": endpoint,
                 "keys": {
                     "p256dh": subscription["p256dh"],
                     "auth": subscription["auth"],
                 },
             },
             data=json.dumps(payload),
-            vapid_private_key=vapid_config.private_key,
-            vapid_claims={"sub": vapid_config.subject},
+            timeout=timeout,
+            requests_session=_push_sessions.session_for(endpoint),
+            **vapid_kwargs,
         )
         return {"sent": True}
     except webpush_exception as exc:
@@ -162,6 +277,8 @@ def send_web_push(subscription: dict, payload: dict, vapid_config: VapidConfig)
         if status_code in {404, 410}:
             return {"sent": False, "reason": "invalid_subscription"}
         return {"sent": False, "reason": "push_failed"}
+    except requests.RequestException:
+        return {"sent": False, "reason": "push_failed"}
 
 
 SendPushFn = Callable[[dict, dict, VapidConfig], dict]
@@ -1,8 +1,12 @@
+import copy
 from datetime import date, datetime, timezone
 import json
+import sqlite3
+import threading
 import unicodedata
 from urllib.parse import urlparse
 
+from src.app.storage.change_versions import SETTINGS_VERSION, get_change_version
 from src.app.storage.db import get_connection
 from src.lib.validation import normalize_user_slug
 from src.app.storage.settings import get_settings as repo_get_settings
@@ -12,6 +16,7 @@ from src.app.storage.settings import (
     DEFAULT_FEED_SIZE_SMALL_ML,
     DEFAULT_OPENAI_TIMEOUT_SECONDS,
     DEFAULT_OLLAMA_TIMEOUT_SECONDS,
+    LLM_PROVIDERS,
 )
 
 
@@ -247,9 +252,48 @@ def _normalize_openai_timeout(value: object) -> int:
     return value
 
 
+def _normalize_llm_provider(value: object, field: str) -> str | None:
+    if value is None:
+        return None
+    if not isinstance(value, str) or value.strip().lower() not in LLM_PROVIDERS:
+        raise ValueError(f"{field} must be one of: {', '.join(LLM_PROVIDERS)}")
+    return value.strip().lower()
+
+
+class SettingsCache:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._version: int | None = None
+        self._settings: dict | None = None
+
+    def get(self, conn: sqlite3.Connection) -> dict:
+        version = get_change_version(conn, SETTINGS_VERSION)
+        with self._lock:
+            if self._settings is not None and self._version == version:
+                return copy.deepcopy(self._settings)
+        settings = repo_get_settings(conn)
+        with self._lock:
+            self._version = version
+            self._settings = settings
+        return copy.deepcopy(settings)
+
+
+_settings_caches: dict[str, SettingsCache] = {}
+_settings_caches_lock = threading.Lock()
+
+
+def get_settings_cache(db_path: str) -> SettingsCache:
+    with _settings_caches_lock:
+        cache = _settings_caches.get(db_path)
+        if cache is None:
+            cache = SettingsCache()
+            _settings_caches[db_path] = cache
+        return cache
+
+
 def get_settings(db_path: str) -> dict:
     with get_connection(db_path) as conn:
-        return repo_get_settings(conn)
+        return get_settings_cache(db_path).get(conn)
 
 
 def update_settings(db_path: str, payload: dict) -> dict:
@@ -308,6 +352,14 @@ def update_settings(db_path: str, payload: dict) -> dict:
         fields["openai_timeout_seconds"] = _normalize_openai_timeout(
             payload["openai_timeout_seconds"]
         )
+    if "llm_provider" in payload:
+        fields["llm_provider"] = _normalize_llm_provider(
+            payload["llm_provider"], "llm_provider"
+        )
+    if "llm_fallback_provider" in payload:
+        fields["llm_fallback_provider"] = _normalize_llm_provider(
+            payload["llm_fallback_provider"], "llm_fallback_provider"
+        )
     with get_connection(db_path) as conn:
         current = repo_get_settings(conn)
         if "feed_goal_min" in payload:
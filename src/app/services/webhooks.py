@@ -9,11 +9,11 @@ from src.app.services.settings import get_settings
 logger = logging.getLogger(__name__)
 
 
-def send_entry_webhook(db_path: str, entry: dict) -> None:
+def send_entry_webhook(db_path: str, entry: dict) -> bool:
     settings = get_settings(db_path)
     webhook_url = settings.get("entry_webhook_url")
     if not webhook_url:
-        return
+        return True
     payload = json.dumps(entry).encode("utf-8")
     req = request.Request(
         webhook_url,
@@ -23,6 +23,7 @@ def send_entry_webhook(db_path: str, entry: dict) -> None:
     )
     try:
         with request.urlopen(req, timeout=5):
-            return None
+            return True
     except Exception:
         logger.exception("Entry webhook delivery failed")
+        return False
@@ -52,7 +52,6 @@ def create_bottle(conn: sqlite3.Connection | None, payload: dict) -> dict:
                 payload.get("deleted_at_utc"),
             ),
         )
-    conn.commit()
     return get_bottle(conn, cursor.lastrowid)
 
 
@@ -106,7 +105,6 @@ def update_bottle(conn: sqlite3.Connection | None, bottle_id: int, fields: dict)
         f"UPDATE bottles SET {', '.join(assignments)} WHERE id = ?",
         values,
     )
-    conn.commit()
     return get_bottle(conn, bottle_id)
 
 
@@ -122,5 +120,4 @@ def delete_bottle(
         """,
         (deleted_at_utc, updated_at_utc, bottle_id),
     )
-    conn.commit()
     return cursor.rowcount > 0
@@ -36,7 +36,6 @@ def create_event(conn: sqlite3.Connection | None, payload: dict) -> dict:
             payload.get("deleted_at_utc"),
         ),
     )
-    conn.commit()
     return get_event(conn, cursor.lastrowid)
 
 
@@ -109,7 +108,6 @@ def update_event(conn: sqlite3.Connection | None, event_id: int, fields: dict) -
         f"UPDATE calendar_events SET {', '.join(assignments)} WHERE id = ?",
         values,
     )
-    conn.commit()
     return get_event(conn, event_id)
 
 
@@ -123,5 +121,4 @@ def delete_event(conn: sqlite3.Connection | None, event_id: int, deleted_at_utc:
         """,
         (deleted_at_utc, updated_at_utc, event_id),
     )
-    conn.commit()
     return cursor.rowcount > 0
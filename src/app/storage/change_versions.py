@@ -0,0 +1,23 @@
+import sqlite3
+
+ENTRIES_VERSION = "entries"
+SETTINGS_VERSION = "settings"
+FEEDING_GOALS_VERSION = "feeding_goals"
+PUSH_SUBSCRIPTIONS_VERSION = "push_subscriptions"
+
+
+def get_change_version(conn: sqlite3.Connection | None, name: str) -> int:
+    assert conn is not None
+    row = conn.execute(
+        "SELECT version FROM change_versions WHERE name = ?",
+        (name,),
+    ).fetchone()
+    return int(row[0]) if row else 0
+
+
+def get_change_versions(conn: sqlite3.Connection | None) -> tuple[tuple[str, int], ...]:
+    assert conn is not None
+    rows = conn.execute(
+        "SELECT name, version FROM change_versions ORDER BY name"
+    ).fetchall()
+    return tuple((row[0], int(row[1])) for row in rows)
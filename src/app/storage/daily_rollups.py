@@ -0,0 +1,124 @@
+from datetime import date, timedelta
+import sqlite3
+from typing import Iterable
+
+DAY_MS = 86_400_000
+EPOCH_DATE = date(1970, 1, 1)
+
+RollupKey = tuple[str, str, str]
+
+
+def rollup_key(entry: dict) -> RollupKey:
+    day = EPOCH_DATE + timedelta(days=entry["timestamp_ms"] // DAY_MS)
+    return (entry["user_slug"], entry["type"], day.isoformat())
+
+
+def _day_start_ms(day_utc: str) -> int:
+    return (date.fromisoformat(day_utc) - EPOCH_DATE).days * DAY_MS
+
+
+def refresh_daily_rollups(
+    conn: sqlite3.Connection | None, keys: Iterable[RollupKey]
+) -> None:
+    assert conn is not None
+    for user_slug, entry_type, day_utc in set(keys):
+        start_ms = _day_start_ms(day_utc)
+        conn.execute(
+            """
+            DELETE FROM daily_rollups
+            WHERE user_slug = ? AND type = ? AND day_utc = ?
+            """,
+            (user_slug, entry_type, day_utc),
+        )
+        conn.execute(
+            """
+            INSERT INTO daily_rollups (
+                user_slug,
+                type,
+                day_utc,
+                entry_count,
+                amount_ml,
+                expressed_ml,
+                formula_ml,
+                duration_min,
+                duration_count
+            )
+            SELECT user_slug, type, ?, COUNT(*), TOTAL(amount_ml), TOTAL(expressed_ml),
+                   TOTAL(formula_ml), TOTAL(feed_duration_min), COUNT(feed_duration_min)
+            FROM entries
+            WHERE user_slug = ?
+              AND type = ?
+              AND deleted_at_utc IS NULL
+              AND timestamp_ms >= ?
+              AND timestamp_ms < ?
+            GROUP BY user_slug, type
+            """,
+            (day_utc, user_slug, entry_type, start_ms, start_ms + DAY_MS),
+        )
+
+
+def rebuild_daily_rollups(conn: sqlite3.Connection | None) -> int:
+    assert conn is not None
+    conn.execute("DELETE FROM daily_rollups")
+    cursor = conn.execute(
+        """
+        INSERT INTO daily_rollups (
+            user_slug,
+            type,
+            day_utc,
+            entry_count,
+            amount_ml,
+            expressed_ml,
+            formula_ml,
+            duration_min,
+            duration_count
+        )
+        SELECT user_slug, type, date(timestamp_ms / 1000, 'unixepoch') AS day_utc,
+               COUNT(*), TOTAL(amount_ml), TOTAL(expressed_ml), TOTAL(formula_ml),
+               TOTAL(feed_duration_min), COUNT(feed_duration_min)
+        FROM entries
+        WHERE deleted_at_utc IS NULL
+        GROUP BY user_slug, type, day_utc
+        """
+    )
+    return cursor.rowcount
+
+
+def list_daily_rollups(
+    conn: sqlite3.Connection | None,
+    since_day: str | None = None,
+    until_day: str | None = None,
+    user_slug: str | None = None,
+    entry_type: str | None = None,
+) -> list[dict]:
+    assert conn is not None
+    clauses: list[str] = []
+    params: list[object] = []
+    if since_day:
+        clauses.append("day_utc >= ?")
+        params.append(since_day)
+    if until_day:
+        clauses.append("day_utc <= ?")
+        params.append(until_day)
+    if user_slug:
+        clauses.append("user_slug = ?")
+        params.append(user_slug)
+    if entry_type:
+        clauses.append("type = ?")
+        params.append(entry_type)
+
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    cursor = conn.execute(
+        f"""
+        SELECT day_utc, type, SUM(entry_count) AS entry_count,
+               SUM(amount_ml) AS amount_ml, SUM(expressed_ml) AS expressed_ml,
+               SUM(formula_ml) AS formula_ml, SUM(duration_min) AS duration_min,
+               SUM(duration_count) AS duration_count
+        FROM daily_rollups
+        {where}
+        GROUP BY day_utc, type
+        ORDER BY day_utc ASC, type ASC
+        """,
+        params,
+    )
+    return [dict(row) for row in cursor.fetchall()]
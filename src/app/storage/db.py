@@ -1,8 +1,25 @@
-from datetime import datetime, timedelta, timezone
 from contextlib import contextmanager
+import logging
+import os
 import sqlite3
+import threading
+import time
 from pathlib import Path
 
+from flask import Flask, g, got_request_exception, has_app_context, jsonify, request
+
+from src.app.storage.migrations import migrate
+
+DEFAULT_POOL_SIZE = 4
+DEFAULT_POOL_TIMEOUT_SECONDS = 5.0
+READ_ONLY_METHODS = {"GET", "HEAD", "OPTIONS"}
+MIGRATION_BUSY_TIMEOUT_MS = 30000
+logger = logging.getLogger(__name__)
+
+
+class ConnectionPoolTimeout(Exception):
+    pass
+
 
 def _connect(db_path: str) -> sqlite3.Connection:
     conn = sqlite3.connect(db_path, check_same_thread=False)
@@ -13,428 +30,365 @@ def _connect(db_path: str) -> sqlite3.Connection:
     return conn
 
 
-def init_db(db_path: str) -> None:
+class ConnectionPool:
+    def __init__(
+        self,
+        db_path: str,
+        size: int = DEFAULT_POOL_SIZE,
+        timeout_seconds: float = DEFAULT_POOL_TIMEOUT_SECONDS,
+    ):
+        if size <= 0:
+            raise ValueError("pool size must be a positive integer")
+        self.db_path = db_path
+        self.size = size
+        self.timeout_seconds = timeout_seconds
+        self.pid = os.getpid()
+        self._idle: list[sqlite3.Connection] = []
+        self._open = 0
+        self._closed = False
+        self._created = 0
+        self._recycled = 0
+        self._cond = threading.Condition()
+
+    def acquire(self) -> sqlite3.Connection:
+        deadline = time.monotonic() + self.timeout_seconds
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("connection pool is closed")
+                if self._idle:
+                    return self._idle.pop()
+                if self._open < self.size:
+                    self._open += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise ConnectionPoolTimeout(
+                        f"No SQLite connection available for {self.db_path}"
+                    )
+                self._cond.wait(remaining)
+        try:
+            conn = _connect(self.db_path)
+        except Exception:
+            with self._cond:
+                self._open -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._created += 1
+        return conn
+
+    def release(self, conn: sqlite3.Connection, discard: bool = False) -> None:
+        if not discard:
+            try:
+                if conn.in_transaction:
+                    conn.rollback()
+            except sqlite3.Error:
+                discard = True
+        with self._cond:
+            if discard or self._closed or self._open > self.size:
+                self._open -= 1
+                if discard:
+                    self._recycled += 1
+                close_conn = True
+            else:
+                self._idle.append(conn)
+                close_conn = False
+            self._cond.notify()
+        if close_conn:
+            _close_quietly(conn)
+
+    @contextmanager
+    def connection(self):
+        conn = self.acquire()
+        try:
+            yield conn
+        except sqlite3.IntegrityError:
+            self.release(conn)
+            raise
+        except sqlite3.Error:
+            self.release(conn, discard=True)
+            raise
+        except BaseException:
+            self.release(conn)
+            raise
+        else:
+            self.release(conn)
+
+    def health_check(self) -> dict:
+        with self._cond:
+            idle = self._idle
+            self._idle = []
+        healthy: list[sqlite3.Connection] = []
+        for conn in idle:
+            try:
+                conn.execute("SELECT 1").fetchone()
+            except sqlite3.Error:
+                self.release(conn, discard=True)
+                continue
+            healthy.append(conn)
+        for conn in healthy:
+            self.release(conn)
+
+        error = None
+        try:
+            with self.connection() as conn:
+                conn.execute("SELECT 1").fetchone()
+        except Exception as exc:
+            error = str(exc)
+        with self._cond:
+            status = {
+                "ok": error is None,
+                "size": self.size,
+                "open": self._open,
+                "idle": len(self._idle),
+                "created": self._created,
+                "recycled": self._recycled,
+            }
+        if error:
+            status["error"] = error
+        return status
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            idle = self._idle
+            self._idle = []
+            self._open -= len(idle)
+            self._cond.notify_all()
+        for conn in idle:
+            _close_quietly(conn)
+
+
+_pools: dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def _close_quietly(conn: sqlite3.Connection) -> None:
+    try:
+        conn.close()
+    except sqlite3.Error:
+        pass
+
+
+def get_connection_pool(db_path: str) -> ConnectionPool:
+    with _pools_lock:
+        pool = _pools.get(db_path)
+        if pool is None or pool.pid != os.getpid():
+            pool = ConnectionPool(db_path)
+            _pools[db_path] = pool
+        return pool
+
+
+def configure_connection_pool(
+    db_path: str,
+    size: int = DEFAULT_POOL_SIZE,
+    timeout_seconds: float = DEFAULT_POOL_TIMEOUT_SECONDS,
+) -> ConnectionPool:
+    if size <= 0:
+        raise ValueError("pool size must be a positive integer")
+    pool = get_connection_pool(db_path)
+    with pool._cond:
+        pool.size = size
+        pool.timeout_seconds = timeout_seconds
+        pool._cond.notify_all()
+    return pool
+
+
+def check_connection_pool(db_path: str) -> dict:
+    return get_connection_pool(db_path).health_check()
+
+
+def close_connection_pools() -> None:
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        if pool.pid == os.getpid():
+            pool.close()
+
+
+def init_db(db_path: str) -> list[int]:
     db_file = Path(db_path)
     db_file.parent.mkdir(parents=True, exist_ok=True)
 
-    schema_path = Path(__file__).with_name("schema.sql")
     conn = _connect(db_path)
     try:
-        with schema_path.open("r", encoding="utf-8") as schema_file:
-            conn.executescript(schema_file.read())
-        _ensure_entry_type_constraint(conn)
-        _ensure_user_slug_column(conn)
-        _ensure_feed_duration_column(conn)
-        _ensure_feed_amount_columns(conn)
-        _ensure_entries_weight_kg_column(conn)
-        _ensure_entries_deleted_at_column(conn)
-        _ensure_settings_table(conn)
-        _ensure_bottles_table(conn)
-        _ensure_feeding_goals_table(conn)
-        _ensure_current_goal_view(conn)
-        _ensure_reminders_table(conn)
-        _ensure_default_reminders(conn)
-        _ensure_calendar_events_table(conn)
-        _ensure_push_subscriptions_table(conn)
-        conn.commit()
+        conn.execute(f"PRAGMA busy_timeout = {MIGRATION_BUSY_TIMEOUT_MS};")
+        return migrate(conn)
     finally:
         conn.close()
 
 
-def _ensure_entry_type_constraint(conn: sqlite3.Connection) -> None:
-    row = conn.execute(
-        "SELECT sql FROM sqlite_master WHERE type='table' AND name='entries'"
-    ).fetchone()
-    if not row or not row["sql"]:
-        return
-    if "CHECK (type IN" not in row["sql"]:
-        return
-
-    conn.execute("ALTER TABLE entries RENAME TO entries_old")
-    conn.execute(
-        """
-        CREATE TABLE entries (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_slug TEXT NOT NULL,
-            type TEXT NOT NULL,
-            timestamp_utc TEXT NOT NULL,
-            client_event_id TEXT NOT NULL UNIQUE,
-            notes TEXT,
-            amount_ml REAL,
-            expressed_ml REAL,
-            formula_ml REAL,
-            feed_duration_min REAL,
-            caregiver_id INTEGER,
-            created_at_utc TEXT NOT NULL,
-            updated_at_utc TEXT NOT NULL,
-            deleted_at_utc TEXT
-        )
-        """
-    )
-    new_cols = [
-        row["name"] for row in conn.execute("PRAGMA table_info(entries)").fetchall()
-    ]
-    old_cols = {
-        row["name"] for row in conn.execute("PRAGMA table_info(entries_old)").fetchall()
-    }
-    copy_cols = [col for col in new_cols if col in old_cols]
-    if copy_cols:
-        col_list = ", ".join(copy_cols)
-        conn.execute(
-            f"INSERT INTO entries ({col_list}) SELECT {col_list} FROM entries_old"
-        )
-    conn.execute("DROP TABLE entries_old")
-    conn.execute(
-        "CREATE INDEX IF NOT EXISTS idx_entries_timestamp_utc ON entries (timestamp_utc DESC)"
-    )
-    conn.execute(
-        "CREATE INDEX IF NOT EXISTS idx_entries_user_slug ON entries (user_slug)"
-    )
-    conn.execute(
-        "CREATE INDEX IF NOT EXISTS idx_entries_updated_at_utc ON entries (updated_at_utc DESC)"
-    )
-
-
-def _ensure_user_slug_column(conn: sqlite3.Connection) -> None:
-    columns = {
-        row["name"] for row in conn.execute("PRAGMA table_info(entries)").fetchall()
-    }
-    if "user_slug" not in columns:
-        conn.execute(
-            "ALTER TABLE entries ADD COLUMN user_slug TEXT NOT NULL DEFAULT 'default'"
-        )
-    conn.execute(
-        "CREATE INDEX IF NOT EXISTS idx_entries_user_slug ON entries (user_slug)"
-    )
-
-
-def _ensure_feed_duration_column(conn: sqlite3.Connection) -> None:
-    columns = {
-        row["name"] for row in conn.execute("PRAGMA table_info(entries)").fetchall()
-    }
-    if "feed_duration_min" not in columns:
-        conn.execute("ALTER TABLE entries ADD COLUMN feed_duration_min REAL")
-
-
-def _ensure_feed_amount_columns(conn: sqlite3.Connection) -> None:
-    columns = {
-        row["name"] for row in conn.execute("PRAGMA table_info(entries)").fetchall()
-    }
-    if "expressed_ml" not in columns:
-        conn.execute("ALTER TABLE entries ADD COLUMN expressed_ml REAL")
-    if "formula_ml" not in columns:
-        conn.execute("ALTER TABLE entries ADD COLUMN formula_ml REAL")
-
-
-def _ensure_entries_weight_kg_column(conn: sqlite3.Connection) -> None:
-    columns = {
-        row["name"] for row in conn.execute("PRAGMA table_info(entries)").fetchall()
-    }
-    if "weight_kg" not in columns:
-        conn.execute("ALTER TABLE entries ADD COLUMN weight_kg REAL")
-
-
-def _ensure_entries_deleted_at_column(conn: sqlite3.Connection) -> None:
-    columns = {
-        row["name"] for row in conn.execute("PRAGMA table_info(entries)").fetchall()
-    }
-    if "deleted_at_utc" not in columns:
-        conn.execute("ALTER TABLE entries ADD COLUMN deleted_at_utc TEXT")
-    conn.execute(
-        "CREATE INDEX IF NOT EXISTS idx_entries_updated_at_utc ON entries (updated_at_utc DESC)"
-    )
-
-
-def _ensure_settings_table(conn: sqlite3.Connection) -> None:
-    conn.execute(
-        """
-        CREATE TABLE IF NOT EXISTS baby_settings (
-            id INTEGER PRIMARY KEY CHECK (id = 1),
-            dob TEXT,
-            feed_interval_min INTEGER,
-            custom_event_types TEXT,
-            updated_at_utc TEXT NOT NULL
-        )
-        """
-    )
-    columns = {
-        row["name"]
-        for row in conn.execute("PRAGMA table_info(baby_settings)").fetchall()
-    }
-    if "custom_event_types" not in columns:
-        conn.execute("ALTER TABLE baby_settings ADD COLUMN custom_event_types TEXT")
-    if "feed_goal_min" not in columns:
-        conn.execute("ALTER TABLE baby_settings ADD COLUMN feed_goal_min INTEGER")
-    if "feed_goal_max" not in columns:
-        conn.execute("ALTER TABLE baby_settings ADD COLUMN feed_goal_max INTEGER")
-    if "overnight_gap_min_hours" not in columns:
-        conn.execute(
-            "ALTER TABLE baby_settings ADD COLUMN overnight_gap_min_hours REAL"
-        )
-    if "overnight_gap_max_hours" not in columns:
-        conn.execute(
-            "ALTER TABLE baby_settings ADD COLUMN overnight_gap_max_hours REAL"
-        )
-    if "behind_target_mode" not in columns:
-        conn.execute("ALTER TABLE baby_settings ADD COLUMN behind_target_mode TEXT")
-    if "entry_webhook_url" not in columns:
-        conn.execute("ALTER TABLE baby_settings ADD COLUMN entry_webhook_url TEXT")
-    if "default_user_slug" not in columns:
-        conn.execute("ALTER TABLE baby_settings ADD COLUMN default_user_slug TEXT")
-    if "pushcut_feed_due_url" not in columns:
-        conn.execute("ALTER TABLE baby_settings ADD COLUMN pushcut_feed_due_url TEXT")
-    if "home_kpis_webhook_url" not in columns:
-        conn.execute("ALTER TABLE baby_settings ADD COLUMN home_kpis_webhook_url TEXT")
-    if "feed_size_small_ml" not in columns:
-        conn.execute("ALTER TABLE baby_settings ADD COLUMN feed_size_small_ml REAL")
-    if "feed_size_big_ml" not in columns:
-        conn.execute("ALTER TABLE baby_settings ADD COLUMN feed_size_big_ml REAL")
-    if "ollama_base_url" not in columns:
-        conn.execute("ALTER TABLE baby_settings ADD COLUMN ollama_base_url TEXT")
-    if "ollama_model" not in columns:
-        conn.execute("ALTER TABLE baby_settings ADD COLUMN ollama_model TEXT")
-    if "ollama_timeout_seconds" not in columns:
-        conn.execute(
-            "ALTER TABLE baby_settings ADD COLUMN ollama_timeout_seconds INTEGER"
-        )
-    if "ollama_thinking_enabled" not in columns:
-        conn.execute(
-            "ALTER TABLE baby_settings ADD COLUMN ollama_thinking_enabled INTEGER"
-        )
-    if "openai_model" not in columns:
-        conn.execute("ALTER TABLE baby_settings ADD COLUMN openai_model TEXT")
-    if "openai_timeout_seconds" not in columns:
-        conn.execute(
-            "ALTER TABLE baby_settings ADD COLUMN openai_timeout_seconds INTEGER"
-        )
-    if "feed_due_last_entry_id" not in columns:
-        conn.execute(
-            "ALTER TABLE baby_settings ADD COLUMN feed_due_last_entry_id INTEGER"
-        )
-    if "feed_due_last_sent_at_utc" not in columns:
-        conn.execute(
-            "ALTER TABLE baby_settings ADD COLUMN feed_due_last_sent_at_utc TEXT"
-        )
-    row = conn.execute("SELECT id FROM baby_settings WHERE id = 1").fetchone()
-    if not row:
-        now = datetime.now(timezone.utc).isoformat()
-        conn.execute(
-            """
-            INSERT INTO baby_settings
-                (id, dob, feed_interval_min, custom_event_types,
-                 feed_goal_min, feed_goal_max,
-                 overnight_gap_min_hours, overnight_gap_max_hours,
-                 behind_target_mode, entry_webhook_url, default_user_slug,
-                 pushcut_feed_due_url, home_kpis_webhook_url,
-                 feed_size_small_ml, feed_size_big_ml,
-                 ollama_base_url, ollama_model, ollama_timeout_seconds,
-                 ollama_thinking_enabled,
-                 openai_model, openai_timeout_seconds,
-                 feed_due_last_entry_id, feed_due_last_sent_at_utc,
-                 updated_at_utc)
-            VALUES (1, NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL, ?)
-            """,
-            (now,),
-        )
+class UnitOfWork:
+    def __init__(self, db_path: str, immediate: bool = False):
+        self.db_path = db_path
+        self.immediate = immediate
+        self._conn: sqlite3.Connection | None = None
+        self._pool: ConnectionPool | None = None
+        self._in_transaction = False
+        self._committed = False
+        self._broken = False
+        self._depth = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._pool = get_connection_pool(self.db_path)
+            self._conn = self._pool.acquire()
+        if not self._in_transaction and not self._committed:
+            self._conn.execute("BEGIN IMMEDIATE" if self.immediate else "BEGIN")
+            self._in_transaction = True
+        return self._conn
+
+    @contextmanager
+    def scope(self):
+        try:
+            conn = self._connection()
+        except sqlite3.Error:
+            self._broken = True
+            raise
+        if not self._in_transaction:
+            try:
+                yield conn
+            except BaseException as exc:
+                self._note_error(exc)
+                conn.rollback()
+                raise
+            conn.commit()
+            return
+
+        self._depth += 1
+        savepoint = f"unit_of_work_{self._depth}"
+        conn.execute(f"SAVEPOINT {savepoint}")
+        try:
+            yield conn
+        except BaseException as exc:
+            self._note_error(exc)
+            conn.execute(f"ROLLBACK TO {savepoint}")
+            conn.execute(f"RELEASE {savepoint}")
+            raise
+        else:
+            conn.execute(f"RELEASE {savepoint}")
+        finally:
+            self._depth -= 1
+
+    def _note_error(self, exc: BaseException) -> None:
+        if isinstance(exc, sqlite3.Error) and not isinstance(
+            exc, sqlite3.IntegrityError
+        ):
+            self._broken = True
+
+    def commit(self) -> None:
+        if self._conn is not None and self._in_transaction:
+            try:
+                self._conn.commit()
+            except sqlite3.Error:
+                self._broken = True
+                raise
+            self._in_transaction = False
+        self._committed = True
+
+    def close(self, commit: bool = True) -> None:
+        conn = self._conn
+        if conn is None or self._pool is None:
+            return
+        self._conn = None
+        try:
+            if self._in_transaction:
+                if commit and not self._broken:
+                    conn.commit()
+                else:
+                    conn.rollback()
+        except sqlite3.Error:
+            self._broken = True
+            raise
+        finally:
+            self._in_transaction = False
+            self._pool.release(conn, discard=self._broken)
+
+
+_local = threading.local()
+
+
+def _current_unit_of_work(db_path: str) -> UnitOfWork | None:
+    if has_app_context():
+        unit = g.get("db_unit_of_work")
+        if unit is not None and unit.db_path == db_path:
+            return unit
+    for unit in reversed(getattr(_local, "units", [])):
+        if unit.db_path == db_path:
+            return unit
+    return None
 
 
-def _ensure_bottles_table(conn: sqlite3.Connection) -> None:
-    conn.execute(
-        """
-        CREATE TABLE IF NOT EXISTS bottles (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            empty_weight_g REAL NOT NULL,
-            created_at_utc TEXT NOT NULL,
-            updated_at_utc TEXT NOT NULL,
-            deleted_at_utc TEXT
-        )
-        """
-    )
-    columns = {
-        row["name"] for row in conn.execute("PRAGMA table_info(bottles)").fetchall()
-    }
-    if "name" not in columns:
-        conn.execute("ALTER TABLE bottles ADD COLUMN name TEXT NOT NULL DEFAULT ''")
-    if "empty_weight_g" not in columns:
-        conn.execute(
-            "ALTER TABLE bottles ADD COLUMN empty_weight_g REAL NOT NULL DEFAULT 0"
-        )
-    if "created_at_utc" not in columns:
-        conn.execute(
-            "ALTER TABLE bottles ADD COLUMN created_at_utc TEXT NOT NULL DEFAULT ''"
-        )
-    if "updated_at_utc" not in columns:
-        conn.execute(
-            "ALTER TABLE bottles ADD COLUMN updated_at_utc TEXT NOT NULL DEFAULT ''"
-        )
-    if "deleted_at_utc" not in columns:
-        conn.execute("ALTER TABLE bottles ADD COLUMN deleted_at_utc TEXT")
-    conn.execute(
-        "CREATE INDEX IF NOT EXISTS idx_bottles_updated_at_utc ON bottles (updated_at_utc DESC)"
-    )
-
-
-def _ensure_reminders_table(conn: sqlite3.Connection) -> None:
-    conn.execute(
-        """
-        CREATE TABLE IF NOT EXISTS reminders (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            kind TEXT NOT NULL,
-            interval_min INTEGER NOT NULL CHECK (interval_min > 0),
-            message TEXT NOT NULL,
-            active INTEGER NOT NULL DEFAULT 1,
-            last_sent_at_utc TEXT,
-            next_due_at_utc TEXT NOT NULL,
-            created_at_utc TEXT NOT NULL,
-            updated_at_utc TEXT NOT NULL
-        )
-        """
-    )
-    conn.execute(
-        "CREATE INDEX IF NOT EXISTS idx_reminders_next_due_at_utc ON reminders (next_due_at_utc)"
-    )
-
-
-def _ensure_calendar_events_table(conn: sqlite3.Connection) -> None:
-    conn.execute(
-        """
-        CREATE TABLE IF NOT EXISTS calendar_events (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            title TEXT NOT NULL,
-            date_local TEXT NOT NULL,
-            start_time_local TEXT NOT NULL,
-            end_time_local TEXT,
-            location TEXT,
-            notes TEXT,
-            category TEXT NOT NULL,
-            recurrence TEXT NOT NULL,
-            recurrence_until_local TEXT,
-            created_at_utc TEXT NOT NULL,
-            updated_at_utc TEXT NOT NULL,
-            deleted_at_utc TEXT
-        )
-        """
-    )
-    conn.execute(
-        "CREATE INDEX IF NOT EXISTS idx_calendar_events_date_local ON calendar_events (date_local)"
-    )
-    conn.execute(
-        "CREATE INDEX IF NOT EXISTS idx_calendar_events_updated_at_utc ON calendar_events (updated_at_utc DESC)"
-    )
-
-
-def _ensure_push_subscriptions_table(conn: sqlite3.Connection) -> None:
-    conn.execute(
-        """
-        CREATE TABLE IF NOT EXISTS push_subscriptions (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_slug TEXT NOT NULL UNIQUE,
-            endpoint TEXT NOT NULL UNIQUE,
-            p256dh TEXT NOT NULL,
-            auth TEXT NOT NULL,
-            user_agent TEXT,
-            created_at_utc TEXT NOT NULL,
-            updated_at_utc TEXT NOT NULL,
-            last_notified_entry_id INTEGER,
-            last_notified_due_at_utc TEXT,
-            last_sent_at_utc TEXT
-        )
-        """
-    )
-    columns = {
-        row["name"]
-        for row in conn.execute("PRAGMA table_info(push_subscriptions)").fetchall()
-    }
-    if "last_notified_entry_id" not in columns:
-        conn.execute(
-            "ALTER TABLE push_subscriptions ADD COLUMN last_notified_entry_id INTEGER"
-        )
-    if "last_notified_due_at_utc" not in columns:
-        conn.execute(
-            "ALTER TABLE push_subscriptions ADD COLUMN last_notified_due_at_utc TEXT"
-        )
-    if "last_sent_at_utc" not in columns:
-        conn.execute("ALTER TABLE push_subscriptions ADD COLUMN last_sent_at_utc TEXT")
-    conn.execute(
-        "CREATE UNIQUE INDEX IF NOT EXISTS idx_push_subscriptions_user_slug ON push_subscriptions (user_slug)"
-    )
-    conn.execute(
-        "CREATE UNIQUE INDEX IF NOT EXISTS idx_push_subscriptions_endpoint ON push_subscriptions (endpoint)"
-    )
-
-
-def _ensure_feeding_goals_table(conn: sqlite3.Connection) -> None:
-    conn.execute(
-        """
-        CREATE TABLE IF NOT EXISTS feeding_goals (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            goal_ml REAL NOT NULL,
-            start_date TEXT NOT NULL,
-            created_at_utc TEXT NOT NULL
+@contextmanager
+def unit_of_work(db_path: str, immediate: bool = False):
+    unit = UnitOfWork(db_path, immediate=immediate)
+    units = getattr(_local, "units", None)
+    if units is None:
+        units = _local.units = []
+    units.append(unit)
+    try:
+        yield unit
+    except BaseException:
+        units.pop()
+        unit.close(commit=False)
+        raise
+    units.pop()
+    unit.close(commit=True)
+
+
+def commit_unit_of_work(db_path: str) -> None:
+    unit = _current_unit_of_work(db_path)
+    if unit is not None:
+        unit.commit()
+
+
+def init_unit_of_work(app: Flask) -> None:
+    @app.before_request
+    def _begin_unit_of_work():
+        g.db_unit_of_work = UnitOfWork(
+            app.config["DB_PATH"],
+            immediate=request.method not in READ_ONLY_METHODS,
         )
-        """
-    )
-    conn.execute(
-        """
-        CREATE INDEX IF NOT EXISTS idx_feeding_goals_start_date
-            ON feeding_goals (start_date DESC, created_at_utc DESC)
-        """
-    )
-
-
-def _ensure_current_goal_view(conn: sqlite3.Connection) -> None:
-    conn.execute("DROP VIEW IF EXISTS current_goal")
-    conn.execute(
-        """
-        CREATE VIEW current_goal AS
-        SELECT id, goal_ml, start_date, created_at_utc
-        FROM feeding_goals
-        ORDER BY datetime(created_at_utc) DESC, id DESC
-        LIMIT 1
-        """
-    )
-
-
-def _ensure_default_reminders(conn: sqlite3.Connection) -> None:
-    row = conn.execute("SELECT COUNT(*) AS count FROM reminders").fetchone()
-    if not row:
-        return
-    if row["count"] >= 2:
-        return
 
-    now = datetime.now(timezone.utc)
-    created_at = now.isoformat()
-    next_due_at = (now + timedelta(minutes=180)).isoformat()
-    defaults = [
-        ("Nappy check", "nappy", 180, "Time for a nappy check."),
-        ("Feed", "food", 180, "Time for a feed."),
-    ]
-    for name, kind, interval_min, message in defaults[row["count"] :]:
-        conn.execute(
-            """
-            INSERT INTO reminders (
-                name,
-                kind,
-                interval_min,
-                message,
-                active,
-                last_sent_at_utc,
-                next_due_at_utc,
-                created_at_utc,
-                updated_at_utc
-            )
-            VALUES (?, ?, ?, ?, 1, NULL, ?, ?, ?)
-            """,
-            (name, kind, interval_min, message, next_due_at, created_at, created_at),
-        )
+    @app.after_request
+    def _commit_unit_of_work(response):
+        unit = g.get("db_unit_of_work")
+        if unit is None:
+            return response
+        if response.status_code >= 400:
+            g.pop("db_unit_of_work", None)
+            unit.close(commit=False)
+            return response
+        try:
+            unit.commit()
+        except sqlite3.Error:
+            logger.exception("Failed to commit request transaction")
+            response = jsonify({"error": "Unable to save changes"})
+            response.status_code = 500
+        return response
+
+    @got_request_exception.connect_via(app)
+    def _abort_unit_of_work(sender, exception, **extra):
+        unit = g.pop("db_unit_of_work", None)
+        if unit is not None:
+            unit.close(commit=False)
+
+    @app.teardown_request
+    def _end_unit_of_work(exc):
+        unit = g.pop("db_unit_of_work", None)
+        if unit is not None:
+            unit.close(commit=False)
 
 
 @contextmanager
 def get_connection(db_path: str):
-    conn = _connect(db_path)
-    try:
+    unit = _current_unit_of_work(db_path)
+    if unit is not None:
+        with unit.scope() as conn:
+            yield conn
+        return
+    with get_connection_pool(db_path).connection() as conn:
         yield conn
-    finally:
-        conn.close()
+        conn.commit()
@@ -1,5 +1,35 @@
+from datetime import datetime, timedelta, timezone
 import sqlite3
-from typing import Optional
+from typing import Iterator, Optional
+
+from src.app.storage.daily_rollups import refresh_daily_rollups, rollup_key
+
+EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+UPSERT_BATCH_SIZE = 50
+DELETE_BATCH_SIZE = 500
+EXPORT_BATCH_SIZE = 500
+AGGREGATE_BUCKETS_MS = {
+    "hour": (3_600_000, 0),
+    "day": (86_400_000, 0),
+    "week": (604_800_000, 345_600_000),
+}
+
+
+def timestamp_to_ms(value: str) -> int:
+    cleaned = value.strip()
+    if cleaned.endswith("Z"):
+        cleaned = cleaned[:-1] + "+00:00"
+    return datetime_to_ms(datetime.fromisoformat(cleaned))
+
+
+def datetime_to_ms(value: datetime) -> int:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return (value - EPOCH_UTC) // timedelta(milliseconds=1)
+
+
+def ms_to_datetime(value: int) -> datetime:
+    return EPOCH_UTC + timedelta(milliseconds=value)
 
 
 def create_entry(conn: sqlite3.Connection | None, payload: dict) -> tuple[dict, bool]:
@@ -20,8 +50,10 @@ def create_entry(conn: sqlite3.Connection | None, payload: dict) -> tuple[dict,
                 weight_kg,
                 caregiver_id,
                 created_at_utc,
-                updated_at_utc
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                updated_at_utc,
+                timestamp_ms,
+                updated_ms
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """,
             (
                 payload["user_slug"],
@@ -37,17 +69,76 @@ def create_entry(conn: sqlite3.Connection | None, payload: dict) -> tuple[dict,
                 payload.get("caregiver_id"),
                 payload["created_at_utc"],
                 payload["updated_at_utc"],
+                timestamp_to_ms(payload["timestamp_utc"]),
+                timestamp_to_ms(payload["updated_at_utc"]),
             ),
         )
-        conn.commit()
         entry_id = cursor.lastrowid
         entry = get_entry(conn, entry_id)
+        refresh_daily_rollups(conn, [rollup_key(entry)])
         return entry, False
     except sqlite3.IntegrityError:
         existing = get_entry_by_client_event_id(conn, payload["client_event_id"])
         return existing, True
 
 
+def create_entries(conn: sqlite3.Connection | None, payloads: list[dict]) -> int:
+    assert conn is not None
+    cursor = conn.executemany(
+        """
+        INSERT INTO entries (
+            user_slug,
+            type,
+            timestamp_utc,
+            client_event_id,
+            notes,
+            amount_ml,
+            expressed_ml,
+            formula_ml,
+            feed_duration_min,
+            weight_kg,
+            caregiver_id,
+            created_at_utc,
+            updated_at_utc,
+            timestamp_ms,
+            updated_ms
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(client_event_id) DO NOTHING
+        """,
+        (
+            (
+                payload["user_slug"],
+                payload["type"],
+                payload["timestamp_utc"],
+                payload["client_event_id"],
+                payload.get("notes"),
+                payload.get("amount_ml"),
+                payload.get("expressed_ml"),
+                payload.get("formula_ml"),
+                payload.get("feed_duration_min"),
+                payload.get("weight_kg"),
+                payload.get("caregiver_id"),
+                payload["created_at_utc"],
+                payload["updated_at_utc"],
+                timestamp_to_ms(payload["timestamp_utc"]),
+                timestamp_to_ms(payload["updated_at_utc"]),
+            )
+            for payload in payloads
+        ),
+    )
+    created = cursor.rowcount
+    refresh_daily_rollups(
+        conn,
+        (
+            rollup_key(
+                {**payload, "timestamp_ms": timestamp_to_ms(payload["timestamp_utc"])}
+            )
+            for payload in payloads
+        ),
+    )
+    return created
+
+
 def list_entries(
     conn: sqlite3.Connection | None,
     limit: int,
@@ -56,6 +147,7 @@ def list_entries(
     until_utc: str | None = None,
     entry_type: str | None = None,
     include_deleted: bool = False,
+    before: tuple[int, int] | None = None,
 ) -> list[dict]:
     assert conn is not None
     clauses: list[str] = []
@@ -67,11 +159,14 @@ def list_entries(
         clauses.append("type = ?")
         params.append(entry_type)
     if since_utc:
-        clauses.append("timestamp_utc >= ?")
-        params.append(since_utc)
+        clauses.append("timestamp_ms >= ?")
+        params.append(timestamp_to_ms(since_utc))
     if until_utc:
-        clauses.append("timestamp_utc <= ?")
-        params.append(until_utc)
+        clauses.append("timestamp_ms <= ?")
+        params.append(timestamp_to_ms(until_utc))
+    if before:
+        clauses.append("(timestamp_ms, id) < (?, ?)")
+        params.extend(before)
     if not include_deleted:
         clauses.append("deleted_at_utc IS NULL")
 
@@ -80,10 +175,11 @@ def list_entries(
         f"""
         SELECT id, user_slug, type, timestamp_utc, client_event_id, notes, amount_ml,
                expressed_ml, formula_ml, feed_duration_min, weight_kg, caregiver_id,
-               created_at_utc, updated_at_utc, deleted_at_utc
+               created_at_utc, updated_at_utc, deleted_at_utc, timestamp_ms,
+               updated_ms
         FROM entries
         {where}
-        ORDER BY timestamp_utc DESC
+        ORDER BY timestamp_ms DESC, id DESC
         LIMIT ?
         """,
         (*params, limit),
@@ -91,13 +187,59 @@ def list_entries(
     return [dict(row) for row in cursor.fetchall()]
 
 
-def list_entries_for_export(
+def aggregate_entries(
     conn: sqlite3.Connection | None,
+    bucket: str,
     user_slug: str | None = None,
     since_utc: str | None = None,
     until_utc: str | None = None,
     entry_type: str | None = None,
+    tz_offset_min: int = 0,
 ) -> list[dict]:
+    assert conn is not None
+    span_ms, offset_ms = AGGREGATE_BUCKETS_MS[bucket]
+    offset_ms -= tz_offset_min * 60_000
+    clauses = ["deleted_at_utc IS NULL"]
+    params: list[object] = [offset_ms, span_ms, span_ms, offset_ms]
+    if user_slug:
+        clauses.append("user_slug = ?")
+        params.append(user_slug)
+    if entry_type:
+        clauses.append("type = ?")
+        params.append(entry_type)
+    if since_utc:
+        clauses.append("timestamp_ms >= ?")
+        params.append(timestamp_to_ms(since_utc))
+    if until_utc:
+        clauses.append("timestamp_ms <= ?")
+        params.append(timestamp_to_ms(until_utc))
+
+    cursor = conn.execute(
+        f"""
+        SELECT ((timestamp_ms - ?) / ?) * ? + ? AS bucket_start_ms, type,
+               COUNT(*) AS entry_count, TOTAL(amount_ml) AS amount_ml,
+               TOTAL(expressed_ml) AS expressed_ml, TOTAL(formula_ml) AS formula_ml,
+               TOTAL(feed_duration_min) AS duration_min,
+               COUNT(feed_duration_min) AS duration_count
+        FROM entries
+        WHERE {' AND '.join(clauses)}
+        GROUP BY bucket_start_ms, type
+        ORDER BY bucket_start_ms ASC, type ASC
+        """,
+        params,
+    )
+    return [dict(row) for row in cursor.fetchall()]
+
+
+def iter_entries_for_export(
+    conn: sqlite3.Connection | None,
+    user_slug: str | None = None,
+    since_utc: str | None = None,
+    until_utc: str | None = None,
+    entry_type: str | None = None,
+    batch_size: int = EXPORT_BATCH_SIZE,
+    include_deleted: bool = True,
+) -> Iterator[list[dict]]:
     assert conn is not None
     clauses: list[str] = []
     params: list[object] = []
@@ -108,25 +250,35 @@ def list_entries_for_export(
         clauses.append("type = ?")
         params.append(entry_type)
     if since_utc:
-        clauses.append("timestamp_utc >= ?")
-        params.append(since_utc)
+        clauses.append("timestamp_ms >= ?")
+        params.append(timestamp_to_ms(since_utc))
     if until_utc:
-        clauses.append("timestamp_utc <= ?")
-        params.append(until_utc)
+        clauses.append("timestamp_ms <= ?")
+        params.append(timestamp_to_ms(until_utc))
+    if not include_deleted:
+        clauses.append("deleted_at_utc IS NULL")
 
     where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
     cursor = conn.execute(
         f"""
         SELECT id, user_slug, type, timestamp_utc, client_event_id, notes, amount_ml,
                expressed_ml, formula_ml, feed_duration_min, weight_kg, caregiver_id,
-               created_at_utc, updated_at_utc, deleted_at_utc
+               created_at_utc, updated_at_utc, deleted_at_utc, timestamp_ms,
+               updated_ms
         FROM entries
         {where}
-        ORDER BY timestamp_utc ASC
+        ORDER BY timestamp_ms ASC
         """,
         params,
     )
-    return [dict(row) for row in cursor.fetchall()]
+    try:
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            yield [dict(row) for row in rows]
+    finally:
+        cursor.close()
 
 
 def get_entry(conn: sqlite3.Connection | None, entry_id: int) -> Optional[dict]:
@@ -135,7 +287,8 @@ def get_entry(conn: sqlite3.Connection | None, entry_id: int) -> Optional[dict]:
         """
         SELECT id, user_slug, type, timestamp_utc, client_event_id, notes, amount_ml,
                expressed_ml, formula_ml, feed_duration_min, weight_kg, caregiver_id,
-               created_at_utc, updated_at_utc, deleted_at_utc
+               created_at_utc, updated_at_utc, deleted_at_utc, timestamp_ms,
+               updated_ms
         FROM entries
         WHERE id = ?
         """,
@@ -153,7 +306,8 @@ def get_entry_by_client_event_id(
         """
         SELECT id, user_slug, type, timestamp_utc, client_event_id, notes, amount_ml,
                expressed_ml, formula_ml, feed_duration_min, weight_kg, caregiver_id,
-               created_at_utc, updated_at_utc, deleted_at_utc
+               created_at_utc, updated_at_utc, deleted_at_utc, timestamp_ms,
+               updated_ms
         FROM entries
         WHERE client_event_id = ?
         """,
@@ -180,10 +334,11 @@ def get_latest_active_timed_entry(
         f"""
         SELECT id, user_slug, type, timestamp_utc, client_event_id, notes, amount_ml,
                expressed_ml, formula_ml, feed_duration_min, weight_kg, caregiver_id,
-               created_at_utc, updated_at_utc, deleted_at_utc
+               created_at_utc, updated_at_utc, deleted_at_utc, timestamp_ms,
+               updated_ms
         FROM entries
         WHERE {' AND '.join(clauses)}
-        ORDER BY timestamp_utc DESC
+        ORDER BY timestamp_ms DESC
         LIMIT 1
         """,
         params,
@@ -214,17 +369,26 @@ def update_entry(
         if key in fields:
             assignments.append(f"{key} = ?")
             values.append(fields[key])
+    if fields.get("timestamp_utc"):
+        assignments.append("timestamp_ms = ?")
+        values.append(timestamp_to_ms(fields["timestamp_utc"]))
+    if fields.get("updated_at_utc"):
+        assignments.append("updated_ms = ?")
+        values.append(timestamp_to_ms(fields["updated_at_utc"]))
 
     if not assignments:
         return get_entry(conn, entry_id)
 
+    previous = get_entry(conn, entry_id)
     values.append(entry_id)
     conn.execute(
         f"UPDATE entries SET {', '.join(assignments)} WHERE id = ?",
         values,
     )
-    conn.commit()
-    return get_entry(conn, entry_id)
+    entry = get_entry(conn, entry_id)
+    if previous and entry:
+        refresh_daily_rollups(conn, [rollup_key(previous), rollup_key(entry)])
+    return entry
 
 
 def delete_entry(
@@ -237,13 +401,15 @@ def delete_entry(
     cursor = conn.execute(
         """
         UPDATE entries
-        SET deleted_at_utc = ?, updated_at_utc = ?
+        SET deleted_at_utc = ?, updated_at_utc = ?, updated_ms = ?
         WHERE id = ? AND deleted_at_utc IS NULL
+        RETURNING user_slug, type, timestamp_ms
         """,
-        (deleted_at_utc, updated_at_utc, entry_id),
+        (deleted_at_utc, updated_at_utc, timestamp_to_ms(updated_at_utc), entry_id),
     )
-    conn.commit()
-    return cursor.rowcount > 0
+    deleted = [dict(row) for row in cursor.fetchall()]
+    refresh_daily_rollups(conn, (rollup_key(row) for row in deleted))
+    return bool(deleted)
 
 
 def list_entries_updated_since(
@@ -253,6 +419,8 @@ def list_entries_updated_since(
     clauses: list[str] = []
     params: list[object] = []
     if since_utc:
+        clauses.append("updated_ms >= ?")
+        params.append(timestamp_to_ms(since_utc))
         clauses.append("updated_at_utc > ?")
         params.append(since_utc)
     where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
@@ -260,10 +428,11 @@ def list_entries_updated_since(
         f"""
         SELECT id, user_slug, type, timestamp_utc, client_event_id, notes, amount_ml,
                expressed_ml, formula_ml, feed_duration_min, weight_kg, caregiver_id,
-               created_at_utc, updated_at_utc, deleted_at_utc
+               created_at_utc, updated_at_utc, deleted_at_utc, timestamp_ms,
+               updated_ms
         FROM entries
         {where}
-        ORDER BY updated_at_utc ASC
+        ORDER BY updated_ms ASC, updated_at_utc ASC
         LIMIT ?
         """,
         (*params, limit),
@@ -271,24 +440,122 @@ def list_entries_updated_since(
     return [dict(row) for row in cursor.fetchall()]
 
 
-def upsert_entry_by_client_event_id(
-    conn: sqlite3.Connection | None, payload: dict
-) -> dict:
-    existing = get_entry_by_client_event_id(conn, payload["client_event_id"])
-    if not existing:
-        entry, _ = create_entry(conn, payload)
-        return entry
-    fields = {
-        "type": payload["type"],
-        "timestamp_utc": payload["timestamp_utc"],
-        "notes": payload.get("notes"),
-        "amount_ml": payload.get("amount_ml"),
-        "expressed_ml": payload.get("expressed_ml"),
-        "formula_ml": payload.get("formula_ml"),
-        "feed_duration_min": payload.get("feed_duration_min"),
-        "weight_kg": payload.get("weight_kg"),
-        "caregiver_id": payload.get("caregiver_id"),
-        "updated_at_utc": payload["updated_at_utc"],
-        "deleted_at_utc": payload.get("deleted_at_utc"),
-    }
-    return update_entry(conn, existing["id"], fields)
+def upsert_entries_by_client_event_id(
+    conn: sqlite3.Connection | None, payloads: list[dict]
+) -> dict[str, dict]:
+    assert conn is not None
+    results: dict[str, dict] = {}
+    for start in range(0, len(payloads), UPSERT_BATCH_SIZE):
+        batch = payloads[start : start + UPSERT_BATCH_SIZE]
+        placeholders = ", ".join(
+            "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)" for _ in batch
+        )
+        params: list[object] = []
+        for payload in batch:
+            params.extend(
+                (
+                    payload["user_slug"],
+                    payload["type"],
+                    payload["timestamp_utc"],
+                    payload["client_event_id"],
+                    payload.get("notes"),
+                    payload.get("amount_ml"),
+                    payload.get("expressed_ml"),
+                    payload.get("formula_ml"),
+                    payload.get("feed_duration_min"),
+                    payload.get("weight_kg"),
+                    payload.get("caregiver_id"),
+                    payload["created_at_utc"],
+                    payload["updated_at_utc"],
+                    payload.get("deleted_at_utc"),
+                    timestamp_to_ms(payload["timestamp_utc"]),
+                    timestamp_to_ms(payload["updated_at_utc"]),
+                )
+            )
+        previous = conn.execute(
+            f"""
+            SELECT client_event_id, user_slug, type, timestamp_ms
+            FROM entries
+            WHERE client_event_id IN ({", ".join("?" for _ in batch)})
+            """,
+            [payload["client_event_id"] for payload in batch],
+        ).fetchall()
+        existing = {row["client_event_id"] for row in previous}
+        keys = {rollup_key(dict(row)) for row in previous}
+        cursor = conn.execute(
+            f"""
+            INSERT INTO entries (
+                user_slug,
+                type,
+                timestamp_utc,
+                client_event_id,
+                notes,
+                amount_ml,
+                expressed_ml,
+                formula_ml,
+                feed_duration_min,
+                weight_kg,
+                caregiver_id,
+                created_at_utc,
+                updated_at_utc,
+                deleted_at_utc,
+                timestamp_ms,
+                updated_ms
+            ) VALUES {placeholders}
+            ON CONFLICT(client_event_id) DO UPDATE SET
+                type = excluded.type,
+                timestamp_utc = excluded.timestamp_utc,
+                notes = excluded.notes,
+                amount_ml = excluded.amount_ml,
+                expressed_ml = excluded.expressed_ml,
+                formula_ml = excluded.formula_ml,
+                feed_duration_min = excluded.feed_duration_min,
+                weight_kg = excluded.weight_kg,
+                caregiver_id = excluded.caregiver_id,
+                updated_at_utc = excluded.updated_at_utc,
+                deleted_at_utc = excluded.deleted_at_utc,
+                timestamp_ms = excluded.timestamp_ms,
+                updated_ms = excluded.updated_ms
+            RETURNING id, client_event_id, user_slug, type, timestamp_ms
+            """,
+            params,
+        )
+        rows = cursor.fetchall()
+        keys.update(rollup_key(dict(row)) for row in rows)
+        refresh_daily_rollups(conn, keys)
+        for row in rows:
+            client_event_id = row["client_event_id"]
+            results[client_event_id] = {
+                "id": row["id"],
+                "created": client_event_id not in results
+                and client_event_id not in existing,
+            }
+    return results
+
+
+def delete_entries_by_client_event_id(
+    conn: sqlite3.Connection | None,
+    client_event_ids: list[str],
+    deleted_at_utc: str,
+    updated_at_utc: str,
+) -> dict[str, int]:
+    assert conn is not None
+    deleted: dict[str, int] = {}
+    updated_ms = timestamp_to_ms(updated_at_utc)
+    for start in range(0, len(client_event_ids), DELETE_BATCH_SIZE):
+        batch = client_event_ids[start : start + DELETE_BATCH_SIZE]
+        placeholders = ", ".join("?" for _ in batch)
+        cursor = conn.execute(
+            f"""
+            UPDATE entries
+            SET deleted_at_utc = ?, updated_at_utc = ?, updated_ms = ?
+            WHERE client_event_id IN ({placeholders}) AND deleted_at_utc IS NULL
+            RETURNING id, client_event_id, user_slug, type, timestamp_ms
+            """,
+            (deleted_at_utc, updated_at_utc, updated_ms, *batch),
+        )
+        rows = cursor.fetchall()
+        refresh_daily_rollups(conn, (rollup_key(dict(row)) for row in rows))
+        for row in rows:
+            deleted[row["client_event_id"]] = row["id"]
+    return deleted
@@ -10,7 +10,6 @@ def create_goal(conn: sqlite3.Connection | None, payload: dict) -> dict:
         """,
         (payload["goal_ml"], payload["start_date"], payload["created_at_utc"]),
     )
-    conn.commit()
     goal_id = cursor.lastrowid
     return get_goal(conn, goal_id)
 
@@ -70,7 +69,6 @@ def update_goal(conn: sqlite3.Connection | None, goal_id: int, fields: dict) ->
         f"UPDATE feeding_goals SET {', '.join(assignments)} WHERE id = ?",
         values,
     )
-    conn.commit()
     return get_goal(conn, goal_id)
 
 
@@ -83,5 +81,4 @@ def delete_goal(conn: sqlite3.Connection | None, goal_id: int) -> bool:
         """,
         (goal_id,),
     )
-    conn.commit()
     return cursor.rowcount > 0
@@ -0,0 +1,119 @@
+import sqlite3
+
+
+def get_home_kpi_inputs(
+    conn: sqlite3.Connection | None,
+    since_ms: int,
+    until_ms: int,
+    user_slug: str | None = None,
+    excluded_note: str | None = None,
+) -> dict:
+    assert conn is not None
+    user_clause = "AND user_slug = :user_slug" if user_slug else ""
+    row = conn.execute(
+        f"""
+        SELECT
+            (
+                SELECT TOTAL(
+                    IFNULL(amount_ml, 0) + IFNULL(expressed_ml, 0)
+                    + IFNULL(formula_ml, 0)
+                )
+                FROM entries
+                WHERE type = 'feed' AND deleted_at_utc IS NULL {user_clause}
+                  AND timestamp_ms >= :since_ms AND timestamp_ms <= :until_ms
+                  AND notes IS NOT :excluded_note
+            ) AS feed_total_ml,
+            (
+                SELECT MIN(timestamp_ms)
+                FROM entries
+                WHERE type = 'feed' AND deleted_at_utc IS NULL {user_clause}
+                  AND timestamp_ms >= :since_ms AND timestamp_ms <= :until_ms
+                  AND notes IS NOT :excluded_note
+            ) AS window_first_ms,
+            (
+                SELECT MIN(timestamp_ms)
+                FROM entries
+                WHERE type = 'feed' AND deleted_at_utc IS NULL {user_clause}
+                  AND timestamp_ms > :until_ms
+                  AND notes IS NOT :excluded_note
+            ) AS upcoming_ms,
+            (
+                SELECT timestamp_ms
+                FROM entries
+                WHERE type = 'feed' AND deleted_at_utc IS NULL {user_clause}
+                ORDER BY timestamp_ms DESC, id DESC
+                LIMIT 1
+            ) AS last_feed_ms,
+            (SELECT goal_ml FROM current_goal) AS goal_ml,
+            (SELECT feed_interval_min FROM baby_settings WHERE id = 1)
+                AS feed_interval_min
+        """,
+        {
+            "since_ms": since_ms,
+            "until_ms": until_ms,
+            "user_slug": user_slug,
+            "excluded_note": excluded_note,
+        },
+    ).fetchone()
+    return dict(row)
+
+
+def get_home_kpis_delivery(
+    conn: sqlite3.Connection | None, webhook_url: str
+) -> dict | None:
+    assert conn is not None
+    row = conn.execute(
+        """
+        SELECT webhook_url, payload_hash, sent_count, skipped_count, failed_count,
+               last_sent_at_utc, last_attempt_at_utc, last_error
+        FROM home_kpis_deliveries
+        WHERE webhook_url = ?
+        """,
+        (webhook_url,),
+    ).fetchone()
+    return dict(row) if row else None
+
+
+def record_home_kpis_delivery(
+    conn: sqlite3.Connection | None,
+    webhook_url: str,
+    outcome: str,
+    attempted_at_utc: str,
+    payload_hash: str | None = None,
+    error: str | None = None,
+) -> None:
+    assert conn is not None
+    assert outcome in {"sent", "skipped", "failed"}
+    sent = 1 if outcome == "sent" else 0
+    conn.execute(
+        """
+        INSERT INTO home_kpis_deliveries (
+            webhook_url, payload_hash, sent_count, skipped_count, failed_count,
+            last_sent_at_utc, last_attempt_at_utc, last_error
+        )
+        VALUES (:webhook_url, :payload_hash, :sent, :skipped, :failed,
+                :sent_at, :attempted_at, :error)
+        ON CONFLICT(webhook_url) DO UPDATE SET
+            payload_hash = COALESCE(excluded.payload_hash, payload_hash),
+            sent_count = sent_count + excluded.sent_count,
+            skipped_count = skipped_count + excluded.skipped_count,
+            failed_count = failed_count + excluded.failed_count,
+            last_sent_at_utc = COALESCE(excluded.last_sent_at_utc, last_sent_at_utc),
+            last_attempt_at_utc = excluded.last_attempt_at_utc,
+            last_error = CASE
+                WHEN :failed THEN excluded.last_error
+                WHEN :sent THEN NULL
+                ELSE last_error
+            END
+        """,
+        {
+            "webhook_url": webhook_url,
+            "payload_hash": payload_hash if sent else None,
+            "sent": sent,
+            "skipped": 1 if outcome == "skipped" else 0,
+            "failed": 1 if outcome == "failed" else 0,
+            "sent_at": attempted_at_utc if sent else None,
+            "attempted_at": attempted_at_utc,
+            "error": error,
+        },
+    )
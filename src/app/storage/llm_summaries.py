@@ -0,0 +1,113 @@
+import json
+import sqlite3
+
+
+def get_llm_summary(conn: sqlite3.Connection | None, cache_key: str) -> dict | None:
+    assert conn is not None
+    row = conn.execute(
+        """
+        SELECT cache_key, provider, model, summary, created_at_utc
+        FROM llm_summaries
+        WHERE cache_key = ?
+        """,
+        (cache_key,),
+    ).fetchone()
+    if not row:
+        return None
+    result = dict(row)
+    result["summary"] = json.loads(result["summary"])
+    return result
+
+
+def save_llm_summary(
+    conn: sqlite3.Connection | None,
+    cache_key: str,
+    provider: str,
+    model: str,
+    summary: dict,
+    created_at_utc: str,
+    expire_before_utc: str,
+) -> None:
+    assert conn is not None
+    conn.execute(
+        "DELETE FROM llm_summaries WHERE created_at_utc < ?",
+        (expire_before_utc,),
+    )
+    conn.execute(
+        """
+        INSERT OR REPLACE INTO llm_summaries (
+            cache_key, provider, model, summary, created_at_utc
+        )
+        VALUES (?, ?, ?, ?, ?)
+        """,
+        (cache_key, provider, model, json.dumps(summary), created_at_utc),
+    )
+
+
+def record_llm_provider_call(
+    conn: sqlite3.Connection | None,
+    provider: str,
+    model: str,
+    outcome: str,
+    latency_ms: int,
+    attempted_at_utc: str,
+    first_chunk_ms: int | None = None,
+    fallback: bool = False,
+    error: str | None = None,
+) -> None:
+    assert conn is not None
+    assert outcome in {"success", "failure"}
+    success = 1 if outcome == "success" else 0
+    conn.execute(
+        """
+        INSERT INTO llm_provider_metrics (
+            provider, model, success_count, failure_count, fallback_count,
+            total_latency_ms, last_latency_ms, last_first_chunk_ms,
+            last_attempt_at_utc, last_error
+        )
+        VALUES (:provider, :model, :success, :failure, :fallback,
+                :total_latency_ms, :latency_ms, :first_chunk_ms,
+                :attempted_at, :error)
+        ON CONFLICT(provider) DO UPDATE SET
+            model = excluded.model,
+            success_count = success_count + excluded.success_count,
+            failure_count = failure_count + excluded.failure_count,
+            fallback_count = fallback_count + excluded.fallback_count,
+            total_latency_ms = total_latency_ms + excluded.total_latency_ms,
+            last_latency_ms = excluded.last_latency_ms,
+            last_first_chunk_ms = COALESCE(
+                excluded.last_first_chunk_ms, last_first_chunk_ms
+            ),
+            last_attempt_at_utc = excluded.last_attempt_at_utc,
+            last_error = CASE WHEN :success THEN NULL ELSE excluded.last_error END
+        """,
+        {
+            "provider": provider,
+            "model": model,
+            "success": success,
+            "failure": 1 - success,
+            "fallback": 1 if success and fallback else 0,
+            "total_latency_ms": latency_ms if success else 0,
+            "latency_ms": latency_ms,
+            "first_chunk_ms": first_chunk_ms,
+            "attempted_at": attempted_at_utc,
+            "error": error,
+        },
+    )
+
+
+def list_llm_provider_metrics(conn: sqlite3.Connection | None) -> list[dict]:
+    assert conn is not None
+    rows = conn.execute(
+        """
+        SELECT provider, model, success_count, failure_count, fallback_count,
+               CASE WHEN success_count > 0
+                    THEN CAST(round(1.0 * total_latency_ms / success_count) AS INTEGER)
+               END AS avg_latency_ms,
+               last_latency_ms, last_first_chunk_ms, last_attempt_at_utc,
+               last_error
+        FROM llm_provider_metrics
+        ORDER BY provider
+        """
+    ).fetchall()
+    return [dict(row) for row in rows]
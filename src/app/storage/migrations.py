@@ -0,0 +1,879 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+import sqlite3
+from typing import Callable
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    apply: Callable[[sqlite3.Connection], None]
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    return int(conn.execute("PRAGMA user_version").fetchone()[0])
+
+
+def pending_migrations(conn: sqlite3.Connection) -> list[Migration]:
+    current = get_schema_version(conn)
+    return [migration for migration in MIGRATIONS if migration.version > current]
+
+
+def migrate(conn: sqlite3.Connection) -> list[int]:
+    if get_schema_version(conn) >= LATEST_SCHEMA_VERSION:
+        return []
+    if conn.in_transaction:
+        conn.commit()
+    conn.execute("BEGIN EXCLUSIVE")
+    applied: list[int] = []
+    try:
+        for migration in pending_migrations(conn):
+            migration.apply(conn)
+            conn.execute(f"PRAGMA user_version = {migration.version}")
+            applied.append(migration.version)
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    return applied
+
+
+def _execute_script(conn: sqlite3.Connection, script: str) -> None:
+    statement = ""
+    for line in script.splitlines(keepends=True):
+        statement += line
+        if sqlite3.complete_statement(statement):
+            conn.execute(statement)
+            statement = ""
+    if statement.strip():
+        conn.execute(statement)
+
+
+def _migrate_baseline(conn: sqlite3.Connection) -> None:
+    schema_path = Path(__file__).with_name("schema.sql")
+    with schema_path.open("r", encoding="utf-8") as schema_file:
+        _execute_script(conn, schema_file.read())
+    _ensure_entry_type_constraint(conn)
+    _ensure_user_slug_column(conn)
+    _ensure_feed_duration_column(conn)
+    _ensure_feed_amount_columns(conn)
+    _ensure_entries_weight_kg_column(conn)
+    _ensure_entries_deleted_at_column(conn)
+    _ensure_settings_table(conn)
+    _ensure_bottles_table(conn)
+    _ensure_feeding_goals_table(conn)
+    _ensure_current_goal_view(conn)
+    _ensure_reminders_table(conn)
+    _ensure_default_reminders(conn)
+    _ensure_calendar_events_table(conn)
+    _ensure_push_subscriptions_table(conn)
+
+
+def _ensure_entry_type_constraint(conn: sqlite3.Connection) -> None:
+    row = conn.execute(
+        "SELECT sql FROM sqlite_master WHERE type='table' AND name='entries'"
+    ).fetchone()
+    if not row or not row["sql"]:
+        return
+    if "CHECK (type IN" not in row["sql"]:
+        return
+
+    conn.execute("ALTER TABLE entries RENAME TO entries_old")
+    conn.execute(
+        """
+        CREATE TABLE entries (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_slug TEXT NOT NULL,
+            type TEXT NOT NULL,
+            timestamp_utc TEXT NOT NULL,
+            client_event_id TEXT NOT NULL UNIQUE,
+            notes TEXT,
+            amount_ml REAL,
+            expressed_ml REAL,
+            formula_ml REAL,
+            feed_duration_min REAL,
+            caregiver_id INTEGER,
+            created_at_utc TEXT NOT NULL,
+            updated_at_utc TEXT NOT NULL,
+            deleted_at_utc TEXT
+        )
+        """
+    )
+    new_cols = [
+        row["name"] for row in conn.execute("PRAGMA table_info(entries)").fetchall()
+    ]
+    old_cols = {
+        row["name"] for row in conn.execute("PRAGMA table_info(entries_old)").fetchall()
+    }
+    copy_cols = [col for col in new_cols if col in old_cols]
+    if copy_cols:
+        col_list = ", ".join(copy_cols)
+        conn.execute(
+            f"INSERT INTO entries ({col_list}) SELECT {col_list} FROM entries_old"
+        )
+    conn.execute("DROP TABLE entries_old")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_entries_timestamp_utc ON entries (timestamp_utc DESC)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_entries_user_slug ON entries (user_slug)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_entries_updated_at_utc ON entries (updated_at_utc DESC)"
+    )
+
+
+def _ensure_user_slug_column(conn: sqlite3.Connection) -> None:
+    columns = {
+        row["name"] for row in conn.execute("PRAGMA table_info(entries)").fetchall()
+    }
+    if "user_slug" not in columns:
+        conn.execute(
+            "ALTER TABLE entries ADD COLUMN user_slug TEXT NOT NULL DEFAULT 'default'"
+        )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_entries_user_slug ON entries (user_slug)"
+    )
+
+
+def _ensure_feed_duration_column(conn: sqlite3.Connection) -> None:
+    columns = {
+        row["name"] for row in conn.execute("PRAGMA table_info(entries)").fetchall()
+    }
+    if "feed_duration_min" not in columns:
+        conn.execute("ALTER TABLE entries ADD COLUMN feed_duration_min REAL")
+
+
+def _ensure_feed_amount_columns(conn: sqlite3.Connection) -> None:
+    columns = {
+        row["name"] for row in conn.execute("PRAGMA table_info(entries)").fetchall()
+    }
+    if "expressed_ml" not in columns:
+        conn.execute("ALTER TABLE entries ADD COLUMN expressed_ml REAL")
+    if "formula_ml" not in columns:
+        conn.execute("ALTER TABLE entries ADD COLUMN formula_ml REAL")
+
+
+def _ensure_entries_weight_kg_column(conn: sqlite3.Connection) -> None:
+    columns = {
+        row["name"] for row in conn.execute("PRAGMA table_info(entries)").fetchall()
+    }
+    if "weight_kg" not in columns:
+        conn.execute("ALTER TABLE entries ADD COLUMN weight_kg REAL")
+
+
+def _ensure_entries_deleted_at_column(conn: sqlite3.Connection) -> None:
+    columns = {
+        row["name"] for row in conn.execute("PRAGMA table_info(entries)").fetchall()
+    }
+    if "deleted_at_utc" not in columns:
+        conn.execute("ALTER TABLE entries ADD COLUMN deleted_at_utc TEXT")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_entries_updated_at_utc ON entries (updated_at_utc DESC)"
+    )
+
+
+def _ensure_settings_table(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS baby_settings (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            dob TEXT,
+            feed_interval_min INTEGER,
+            custom_event_types TEXT,
+            updated_at_utc TEXT NOT NULL
+        )
+        """
+    )
+    columns = {
+        row["name"]
+        for row in conn.execute("PRAGMA table_info(baby_settings)").fetchall()
+    }
+    if "custom_event_types" not in columns:
+        conn.execute("ALTER TABLE baby_settings ADD COLUMN custom_event_types TEXT")
+    if "feed_goal_min" not in columns:
+        conn.execute("ALTER TABLE baby_settings ADD COLUMN feed_goal_min INTEGER")
+    if "feed_goal_max" not in columns:
+        conn.execute("ALTER TABLE baby_settings ADD COLUMN feed_goal_max INTEGER")
+    if "overnight_gap_min_hours" not in columns:
+        conn.execute(
+            "ALTER TABLE baby_settings ADD COLUMN overnight_gap_min_hours REAL"
+        )
+    if "overnight_gap_max_hours" not in columns:
+        conn.execute(
+            "ALTER TABLE baby_settings ADD COLUMN overnight_gap_max_hours REAL"
+        )
+    if "behind_target_mode" not in columns:
+        conn.execute("ALTER TABLE baby_settings ADD COLUMN behind_target_mode TEXT")
+    if "entry_webhook_url" not in columns:
+        conn.execute("ALTER TABLE baby_settings ADD COLUMN entry_webhook_url TEXT")
+    if "default_user_slug" not in columns:
+        conn.execute("ALTER TABLE baby_settings ADD COLUMN default_user_slug TEXT")
+    if "pushcut_feed_due_url" not in columns:
+        conn.execute("ALTER TABLE baby_settings ADD COLUMN pushcut_feed_due_url TEXT")
+    if "home_kpis_webhook_url" not in columns:
+        conn.execute("ALTER TABLE baby_settings ADD COLUMN home_kpis_webhook_url TEXT")
+    if "feed_size_small_ml" not in columns:
+        conn.execute("ALTER TABLE baby_settings ADD COLUMN feed_size_small_ml REAL")
+    if "feed_size_big_ml" not in columns:
+        conn.execute("ALTER TABLE baby_settings ADD COLUMN feed_size_big_ml REAL")
+    if "ollama_base_url" not in columns:
+        conn.execute("ALTER TABLE baby_settings ADD COLUMN ollama_base_url TEXT")
+    if "ollama_model" not in columns:
+        conn.execute("ALTER TABLE baby_settings ADD COLUMN ollama_model TEXT")
+    if "ollama_timeout_seconds" not in columns:
+        conn.execute(
+            "ALTER TABLE baby_settings ADD COLUMN ollama_timeout_seconds INTEGER"
+        )
+    if "ollama_thinking_enabled" not in columns:
+        conn.execute(
+            "ALTER TABLE baby_settings ADD COLUMN ollama_thinking_enabled INTEGER"
+        )
+    if "openai_model" not in columns:
+        conn.execute("ALTER TABLE baby_settings ADD COLUMN openai_model TEXT")
+    if "openai_timeout_seconds" not in columns:
+        conn.execute(
+            "ALTER TABLE baby_settings ADD COLUMN openai_timeout_seconds INTEGER"
+        )
+    if "feed_due_last_entry_id" not in columns:
+        conn.execute(
+            "ALTER TABLE baby_settings ADD COLUMN feed_due_last_entry_id INTEGER"
+        )
+    if "feed_due_last_sent_at_utc" not in columns:
+        conn.execute(
+            "ALTER TABLE baby_settings ADD COLUMN feed_due_last_sent_at_utc TEXT"
+        )
+    row = conn.execute("SELECT id FROM baby_settings WHERE id = 1").fetchone()
+    if not row:
+        now = datetime.now(timezone.utc).isoformat()
+        conn.execute(
+            """
+            INSERT INTO baby_settings
+                (id, dob, feed_interval_min, custom_event_types,
+                 feed_goal_min, feed_goal_max,
+                 overnight_gap_min_hours, overnight_gap_max_hours,
+                 behind_target_mode, entry_webhook_url, default_user_slug,
+                 pushcut_feed_due_url, home_kpis_webhook_url,
+                 feed_size_small_ml, feed_size_big_ml,
+                 ollama_base_url, ollama_model, ollama_timeout_seconds,
+                 ollama_thinking_enabled,
+                 openai_model, openai_timeout_seconds,
+                 feed_due_last_entry_id, feed_due_last_sent_at_utc,
+                 updated_at_utc)
+            VALUES (1, NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL, ?)
+            """,
+            (now,),
+        )
+
+
+def _ensure_bottles_table(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS bottles (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            empty_weight_g REAL NOT NULL,
+            created_at_utc TEXT NOT NULL,
+            updated_at_utc TEXT NOT NULL,
+            deleted_at_utc TEXT
+        )
+        """
+    )
+    columns = {
+        row["name"] for row in conn.execute("PRAGMA table_info(bottles)").fetchall()
+    }
+    if "name" not in columns:
+        conn.execute("ALTER TABLE bottles ADD COLUMN name TEXT NOT NULL DEFAULT ''")
+    if "empty_weight_g" not in columns:
+        conn.execute(
+            "ALTER TABLE bottles ADD COLUMN empty_weight_g REAL NOT NULL DEFAULT 0"
+        )
+    if "created_at_utc" not in columns:
+        conn.execute(
+            "ALTER TABLE bottles ADD COLUMN created_at_utc TEXT NOT NULL DEFAULT ''"
+        )
+    if "updated_at_utc" not in columns:
+        conn.execute(
+            "ALTER TABLE bottles ADD COLUMN updated_at_utc TEXT NOT NULL DEFAULT ''"
+        )
+    if "deleted_at_utc" not in columns:
+        conn.execute("ALTER TABLE bottles ADD COLUMN deleted_at_utc TEXT")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_bottles_updated_at_utc ON bottles (updated_at_utc DESC)"
+    )
+
+
+def _ensure_reminders_table(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS reminders (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            kind TEXT NOT NULL,
+            interval_min INTEGER NOT NULL CHECK (interval_min > 0),
+            message TEXT NOT NULL,
+            active INTEGER NOT NULL DEFAULT 1,
+            last_sent_at_utc TEXT,
+            next_due_at_utc TEXT NOT NULL,
+            created_at_utc TEXT NOT NULL,
+            updated_at_utc TEXT NOT NULL
+        )
+        """
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_reminders_next_due_at_utc ON reminders (next_due_at_utc)"
+    )
+
+
+def _ensure_calendar_events_table(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS calendar_events (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            date_local TEXT NOT NULL,
+            start_time_local TEXT NOT NULL,
+            end_time_local TEXT,
+            location TEXT,
+            notes TEXT,
+            category TEXT NOT NULL,
+            recurrence TEXT NOT NULL,
+            recurrence_until_local TEXT,
+            created_at_utc TEXT NOT NULL,
+            updated_at_utc TEXT NOT NULL,
+            deleted_at_utc TEXT
+        )
+        """
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_calendar_events_date_local ON calendar_events (date_local)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_calendar_events_updated_at_utc ON calendar_events (updated_at_utc DESC)"
+    )
+
+
+def _ensure_push_subscriptions_table(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS push_subscriptions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_slug TEXT NOT NULL UNIQUE,
+            endpoint TEXT NOT NULL UNIQUE,
+            p256dh TEXT NOT NULL,
+            auth TEXT NOT NULL,
+            user_agent TEXT,
+            created_at_utc TEXT NOT NULL,
+            updated_at_utc TEXT NOT NULL,
+            last_notified_entry_id INTEGER,
+            last_notified_due_at_utc TEXT,
+            last_sent_at_utc TEXT
+        )
+        """
+    )
+    columns = {
+        row["name"]
+        for row in conn.execute("PRAGMA table_info(push_subscriptions)").fetchall()
+    }
+    if "last_notified_entry_id" not in columns:
+        conn.execute(
+            "ALTER TABLE push_subscriptions ADD COLUMN last_notified_entry_id INTEGER"
+        )
+    if "last_notified_due_at_utc" not in columns:
+        conn.execute(
+            "ALTER TABLE push_subscriptions ADD COLUMN last_notified_due_at_utc TEXT"
+        )
+    if "last_sent_at_utc" not in columns:
+        conn.execute("ALTER TABLE push_subscriptions ADD COLUMN last_sent_at_utc TEXT")
+    conn.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_push_subscriptions_user_slug ON push_subscriptions (user_slug)"
+    )
+    conn.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_push_subscriptions_endpoint ON push_subscriptions (endpoint)"
+    )
+
+
+def _ensure_feeding_goals_table(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS feeding_goals (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            goal_ml REAL NOT NULL,
+            start_date TEXT NOT NULL,
+            created_at_utc TEXT NOT NULL
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_feeding_goals_start_date
+            ON feeding_goals (start_date DESC, created_at_utc DESC)
+        """
+    )
+
+
+def _ensure_current_goal_view(conn: sqlite3.Connection) -> None:
+    conn.execute("DROP VIEW IF EXISTS current_goal")
+    conn.execute(
+        """
+        CREATE VIEW current_goal AS
+        SELECT id, goal_ml, start_date, created_at_utc
+        FROM feeding_goals
+        ORDER BY datetime(created_at_utc) DESC, id DESC
+        LIMIT 1
+        """
+    )
+
+
+def _ensure_default_reminders(conn: sqlite3.Connection) -> None:
+    row = conn.execute("SELECT COUNT(*) AS count FROM reminders").fetchone()
+    if not row:
+        return
+    if row["count"] >= 2:
+        return
+
+    now = datetime.now(timezone.utc)
+    created_at = now.isoformat()
+    next_due_at = (now + timedelta(minutes=180)).isoformat()
+    defaults = [
+        ("Nappy check", "nappy", 180, "Time for a nappy check."),
+        ("Feed", "food", 180, "Time for a feed."),
+    ]
+    for name, kind, interval_min, message in defaults[row["count"] :]:
+        conn.execute(
+            """
+            INSERT INTO reminders (
+                name,
+                kind,
+                interval_min,
+                message,
+                active,
+                last_sent_at_utc,
+                next_due_at_utc,
+                created_at_utc,
+                updated_at_utc
+            )
+            VALUES (?, ?, ?, ?, 1, NULL, ?, ?, ?)
+            """,
+            (name, kind, interval_min, message, next_due_at, created_at, created_at),
+        )
+
+
+def _migrate_entries_hot_indexes(conn: sqlite3.Connection) -> None:
+    conn.execute("DROP INDEX IF EXISTS idx_entries_user_slug")
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_entries_live_user_type_ts
+            ON entries (user_slug, type, timestamp_utc)
+            WHERE deleted_at_utc IS NULL
+        """
+    )
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_entries_live_type_ts
+            ON entries (type, timestamp_utc)
+            WHERE deleted_at_utc IS NULL
+        """
+    )
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_entries_live_user_ts
+            ON entries (user_slug, timestamp_utc)
+            WHERE deleted_at_utc IS NULL
+        """
+    )
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_entries_live_ts
+            ON entries (timestamp_utc)
+            WHERE deleted_at_utc IS NULL
+        """
+    )
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_entries_active_timed
+            ON entries (type, user_slug, timestamp_utc)
+            WHERE feed_duration_min IS NULL AND deleted_at_utc IS NULL
+        """
+    )
+
+
+def _epoch_ms_v3(value: str) -> int:
+    cleaned = value.strip()
+    if cleaned.endswith("Z"):
+        cleaned = cleaned[:-1] + "+00:00"
+    parsed = datetime.fromisoformat(cleaned)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return (parsed - datetime(1970, 1, 1, tzinfo=timezone.utc)) // timedelta(
+        milliseconds=1
+    )
+
+
+def _migrate_entries_epoch_ms(conn: sqlite3.Connection) -> None:
+    columns = {
+        row["name"] for row in conn.execute("PRAGMA table_info(entries)").fetchall()
+    }
+    if "timestamp_ms" not in columns:
+        conn.execute("ALTER TABLE entries ADD COLUMN timestamp_ms INTEGER")
+    if "updated_ms" not in columns:
+        conn.execute("ALTER TABLE entries ADD COLUMN updated_ms INTEGER")
+    rows = conn.execute(
+        "SELECT id, timestamp_utc, updated_at_utc FROM entries"
+    ).fetchall()
+    conn.executemany(
+        "UPDATE entries SET timestamp_ms = ?, updated_ms = ? WHERE id = ?",
+        [
+            (
+                _epoch_ms_v3(row["timestamp_utc"]),
+                _epoch_ms_v3(row["updated_at_utc"]),
+                row["id"],
+            )
+            for row in rows
+        ],
+    )
+    for name in (
+        "idx_entries_timestamp_utc",
+        "idx_entries_updated_at_utc",
+        "idx_entries_live_user_type_ts",
+        "idx_entries_live_type_ts",
+        "idx_entries_live_user_ts",
+        "idx_entries_live_ts",
+        "idx_entries_active_timed",
+    ):
+        conn.execute(f"DROP INDEX IF EXISTS {name}")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_entries_timestamp_ms ON entries (timestamp_ms)"
+    )
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_entries_updated_ms
+            ON entries (updated_ms, updated_at_utc)
+        """
+    )
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_entries_live_user_type_ms
+            ON entries (user_slug, type, timestamp_ms)
+            WHERE deleted_at_utc IS NULL
+        """
+    )
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_entries_live_type_ms
+            ON entries (type, timestamp_ms)
+            WHERE deleted_at_utc IS NULL
+        """
+    )
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_entries_live_user_ms
+            ON entries (user_slug, timestamp_ms)
+            WHERE deleted_at_utc IS NULL
+        """
+    )
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_entries_live_ms
+            ON entries (timestamp_ms)
+            WHERE deleted_at_utc IS NULL
+        """
+    )
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_entries_active_timed_ms
+            ON entries (type, user_slug, timestamp_ms)
+            WHERE feed_duration_min IS NULL AND deleted_at_utc IS NULL
+        """
+    )
+
+
+def _migrate_daily_rollups(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS daily_rollups (
+            user_slug TEXT NOT NULL,
+            type TEXT NOT NULL,
+            day_utc TEXT NOT NULL,
+            entry_count INTEGER NOT NULL DEFAULT 0,
+            amount_ml REAL NOT NULL DEFAULT 0,
+            expressed_ml REAL NOT NULL DEFAULT 0,
+            formula_ml REAL NOT NULL DEFAULT 0,
+            duration_min REAL NOT NULL DEFAULT 0,
+            duration_count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (user_slug, type, day_utc)
+        ) WITHOUT ROWID
+        """
+    )
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_daily_rollups_day
+            ON daily_rollups (day_utc, type)
+        """
+    )
+    conn.execute("DELETE FROM daily_rollups")
+    conn.execute(
+        """
+        INSERT INTO daily_rollups (
+            user_slug,
+            type,
+            day_utc,
+            entry_count,
+            amount_ml,
+            expressed_ml,
+            formula_ml,
+            duration_min,
+            duration_count
+        )
+        SELECT user_slug, type, date(timestamp_ms / 1000, 'unixepoch') AS day_utc,
+               COUNT(*), TOTAL(amount_ml), TOTAL(expressed_ml), TOTAL(formula_ml),
+               TOTAL(feed_duration_min), COUNT(feed_duration_min)
+        FROM entries
+        WHERE deleted_at_utc IS NULL
+        GROUP BY user_slug, type, day_utc
+        """
+    )
+
+
+def _migrate_change_versions(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS change_versions (
+            name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID
+        """
+    )
+    conn.execute(
+        "INSERT OR IGNORE INTO change_versions (name, version) VALUES ('entries', 0)"
+    )
+    for event in ("INSERT", "UPDATE", "DELETE"):
+        conn.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_entries_version_{event.lower()}
+            AFTER {event} ON entries
+            BEGIN
+                UPDATE change_versions SET version = random() WHERE name = 'entries';
+            END
+            """
+        )
+
+
+def _migrate_settings_change_version(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        "INSERT OR IGNORE INTO change_versions (name, version) VALUES ('settings', 0)"
+    )
+    conn.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_settings_version_insert
+        AFTER INSERT ON baby_settings
+        BEGIN
+            UPDATE change_versions SET version = random() WHERE name = 'settings';
+        END
+        """
+    )
+    conn.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_settings_version_update
+        AFTER UPDATE OF dob, feed_interval_min, custom_event_types, feed_goal_min,
+            feed_goal_max, overnight_gap_min_hours, overnight_gap_max_hours,
+            behind_target_mode, entry_webhook_url, default_user_slug,
+            pushcut_feed_due_url, home_kpis_webhook_url, feed_size_small_ml,
+            feed_size_big_ml, ollama_base_url, ollama_model, ollama_timeout_seconds,
+            ollama_thinking_enabled, openai_model, openai_timeout_seconds
+        ON baby_settings
+        BEGIN
+            UPDATE change_versions SET version = random() WHERE name = 'settings';
+        END
+        """
+    )
+
+
+def _migrate_feeding_goals_change_version(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        INSERT OR IGNORE INTO change_versions (name, version)
+        VALUES ('feeding_goals', 0)
+        """
+    )
+    for event in ("INSERT", "UPDATE", "DELETE"):
+        conn.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_feeding_goals_version_{event.lower()}
+            AFTER {event} ON feeding_goals
+            BEGIN
+                UPDATE change_versions SET version = random()
+                WHERE name = 'feeding_goals';
+            END
+            """
+        )
+
+
+def _migrate_outbox(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS outbox (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            kind TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            next_attempt_ms INTEGER NOT NULL,
+            last_error TEXT,
+            created_at_utc TEXT NOT NULL,
+            failed_at_utc TEXT
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_outbox_pending
+            ON outbox (next_attempt_ms, id)
+            WHERE failed_at_utc IS NULL
+        """
+    )
+
+
+def _migrate_home_kpis_deliveries(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS home_kpis_deliveries (
+            webhook_url TEXT PRIMARY KEY,
+            payload_hash TEXT,
+            sent_count INTEGER NOT NULL DEFAULT 0,
+            skipped_count INTEGER NOT NULL DEFAULT 0,
+            failed_count INTEGER NOT NULL DEFAULT 0,
+            last_sent_at_utc TEXT,
+            last_attempt_at_utc TEXT NOT NULL,
+            last_error TEXT
+        )
+        """
+    )
+
+
+def _migrate_push_subscriptions_change_version(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        INSERT OR IGNORE INTO change_versions (name, version)
+        VALUES ('push_subscriptions', 0)
+        """
+    )
+    for event in ("INSERT", "DELETE"):
+        conn.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_push_subscriptions_version_{event.lower()}
+            AFTER {event} ON push_subscriptions
+            BEGIN
+                UPDATE change_versions SET version = random()
+                WHERE name = 'push_subscriptions';
+            END
+            """
+        )
+
+
+def _migrate_llm_summaries(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS llm_summaries (
+            cache_key TEXT PRIMARY KEY,
+            provider TEXT NOT NULL,
+            model TEXT NOT NULL,
+            summary TEXT NOT NULL,
+            created_at_utc TEXT NOT NULL
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_llm_summaries_created_at
+            ON llm_summaries (created_at_utc)
+        """
+    )
+
+
+def _migrate_llm_providers(conn: sqlite3.Connection) -> None:
+    columns = {
+        row["name"]
+        for row in conn.execute("PRAGMA table_info(baby_settings)").fetchall()
+    }
+    if "llm_provider" not in columns:
+        conn.execute("ALTER TABLE baby_settings ADD COLUMN llm_provider TEXT")
+    if "llm_fallback_provider" not in columns:
+        conn.execute("ALTER TABLE baby_settings ADD COLUMN llm_fallback_provider TEXT")
+    conn.execute("DROP TRIGGER IF EXISTS trg_settings_version_update")
+    conn.execute(
+        """
+        CREATE TRIGGER trg_settings_version_update
+        AFTER UPDATE OF dob, feed_interval_min, custom_event_types, feed_goal_min,
+            feed_goal_max, overnight_gap_min_hours, overnight_gap_max_hours,
+            behind_target_mode, entry_webhook_url, default_user_slug,
+            pushcut_feed_due_url, home_kpis_webhook_url, feed_size_small_ml,
+            feed_size_big_ml, ollama_base_url, ollama_model, ollama_timeout_seconds,
+            ollama_thinking_enabled, openai_model, openai_timeout_seconds,
+            llm_provider, llm_fallback_provider
+        ON baby_settings
+        BEGIN
+            UPDATE change_versions SET version = random() WHERE name = 'settings';
+        END
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS llm_provider_metrics (
+            provider TEXT PRIMARY KEY,
+            model TEXT NOT NULL,
+            success_count INTEGER NOT NULL DEFAULT 0,
+            failure_count INTEGER NOT NULL DEFAULT 0,
+            fallback_count INTEGER NOT NULL DEFAULT 0,
+            total_latency_ms INTEGER NOT NULL DEFAULT 0,
+            last_latency_ms INTEGER,
+            last_first_chunk_ms INTEGER,
+            last_attempt_at_utc TEXT NOT NULL,
+            last_error TEXT
+        )
+        """
+    )
+
+
+def _migrate_entries_sync_covering_index(conn: sqlite3.Connection) -> None:
+    conn.execute("DROP INDEX IF EXISTS idx_entries_updated_ms")
+    conn.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_entries_sync_covering
+            ON entries (
+                updated_ms, updated_at_utc, user_slug, type, timestamp_utc,
+                client_event_id, notes, amount_ml, expressed_ml, formula_ml,
+                feed_duration_min, weight_kg, caregiver_id, created_at_utc,
+                deleted_at_utc, timestamp_ms
+            )
+        """
+    )
+
+
+MIGRATIONS: list[Migration] = [
+    Migration(1, "baseline schema", _migrate_baseline),
+    Migration(2, "entries hot-query indexes", _migrate_entries_hot_indexes),
+    Migration(3, "entries epoch millisecond columns", _migrate_entries_epoch_ms),
+    Migration(4, "daily rollups", _migrate_daily_rollups),
+    Migration(5, "change versions", _migrate_change_versions),
+    Migration(6, "settings change version", _migrate_settings_change_version),
+    Migration(
+        7, "feeding goals change version", _migrate_feeding_goals_change_version
+    ),
+    Migration(8, "outbox", _migrate_outbox),
+    Migration(9, "home kpis deliveries", _migrate_home_kpis_deliveries),
+    Migration(
+        10,
+        "push subscriptions change version",
+        _migrate_push_subscriptions_change_version,
+    ),
+    Migration(11, "llm summaries", _migrate_llm_summaries),
+    Migration(12, "llm providers", _migrate_llm_providers),
+    Migration(
+        13, "entries sync covering index", _migrate_entries_sync_covering_index
+    ),
+]
+LATEST_SCHEMA_VERSION = MIGRATIONS[-1].version
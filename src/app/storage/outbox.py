@@ -0,0 +1,120 @@
+import json
+import sqlite3
+
+
+def enqueue_outbox(
+    conn: sqlite3.Connection | None,
+    kind: str,
+    payload: dict,
+    created_at_utc: str,
+    next_attempt_ms: int,
+) -> int:
+    assert conn is not None
+    cursor = conn.execute(
+        """
+        INSERT INTO outbox (kind, payload, next_attempt_ms, created_at_utc)
+        VALUES (?, ?, ?, ?)
+        """,
+        (kind, json.dumps(payload), next_attempt_ms, created_at_utc),
+    )
+    return int(cursor.lastrowid)
+
+
+def enqueue_coalesced_outbox(
+    conn: sqlite3.Connection | None,
+    kind: str,
+    payload: dict,
+    created_at_utc: str,
+    next_attempt_ms: int,
+) -> int | None:
+    assert conn is not None
+    row = conn.execute(
+        """
+        INSERT INTO outbox (kind, payload, next_attempt_ms, created_at_utc)
+        SELECT :kind, :payload, :next_attempt_ms, :created_at_utc
+        WHERE NOT EXISTS (
+            SELECT 1
+            FROM outbox
+            WHERE kind = :kind AND attempts = 0 AND failed_at_utc IS NULL
+        )
+        RETURNING id
+        """,
+        {
+            "kind": kind,
+            "payload": json.dumps(payload),
+            "next_attempt_ms": next_attempt_ms,
+            "created_at_utc": created_at_utc,
+        },
+    ).fetchone()
+    return int(row[0]) if row else None
+
+
+def claim_due_outbox(
+    conn: sqlite3.Connection | None,
+    now_ms: int,
+    lease_ms: int,
+    limit: int,
+) -> list[dict]:
+    assert conn is not None
+    cursor = conn.execute(
+        """
+        UPDATE outbox
+        SET attempts = attempts + 1, next_attempt_ms = ?
+        WHERE id IN (
+            SELECT id
+            FROM outbox
+            WHERE failed_at_utc IS NULL AND next_attempt_ms <= ?
+            ORDER BY next_attempt_ms ASC, id ASC
+            LIMIT ?
+        )
+        RETURNING id, kind, payload, attempts
+        """,
+        (now_ms + lease_ms, now_ms, limit),
+    )
+    rows = [dict(row) for row in cursor.fetchall()]
+    for row in rows:
+        row["payload"] = json.loads(row["payload"])
+    return sorted(rows, key=lambda row: row["id"])
+
+
+def complete_outbox(conn: sqlite3.Connection | None, outbox_id: int) -> None:
+    assert conn is not None
+    conn.execute("DELETE FROM outbox WHERE id = ?", (outbox_id,))
+
+
+def retry_outbox(
+    conn: sqlite3.Connection | None,
+    outbox_id: int,
+    next_attempt_ms: int,
+    error: str,
+) -> None:
+    assert conn is not None
+    conn.execute(
+        "UPDATE outbox SET next_attempt_ms = ?, last_error = ? WHERE id = ?",
+        (next_attempt_ms, error, outbox_id),
+    )
+
+
+def fail_outbox(
+    conn: sqlite3.Connection | None,
+    outbox_id: int,
+    failed_at_utc: str,
+    error: str,
+) -> None:
+    assert conn is not None
+    conn.execute(
+        "UPDATE outbox SET failed_at_utc = ?, last_error = ? WHERE id = ?",
+        (failed_at_utc, error, outbox_id),
+    )
+
+
+def count_outbox(conn: sqlite3.Connection | None) -> dict:
+    assert conn is not None
+    row = conn.execute(
+        """
+        SELECT COUNT(*) FILTER (WHERE failed_at_utc IS NULL) AS pending,
+               COUNT(*) FILTER (WHERE failed_at_utc IS NOT NULL) AS failed
+        FROM outbox
+        """
+    ).fetchone()
+    return dict(row)
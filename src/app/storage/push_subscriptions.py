@@ -92,7 +92,6 @@ def upsert_push_subscription(
             last_sent_at_utc,
         ),
     )
-    conn.commit()
     return get_push_subscription(conn, user_slug) or {}
 
 
@@ -102,7 +101,6 @@ def delete_push_subscription(conn: sqlite3.Connection | None, user_slug: str) ->
         "DELETE FROM push_subscriptions WHERE user_slug = ?",
         (user_slug,),
     )
-    conn.commit()
     return result.rowcount > 0
 
 
@@ -133,5 +131,88 @@ def update_push_subscription_delivery_state(
             user_slug,
         ),
     )
-    conn.commit()
     return get_push_subscription(conn, user_slug)
+
+
+def list_pending_feed_due(
+    conn: sqlite3.Connection | None,
+    until_ms: int | None = None,
+    include_notified: bool = False,
+) -> list[dict]:
+    assert conn is not None
+    rows = conn.execute(
+        """
+        WITH latest AS (
+            SELECT s.*,
+                   (
+                       SELECT e.id
+                       FROM entries AS e
+                       WHERE e.user_slug = s.user_slug AND e.type = 'feed'
+                         AND e.deleted_at_utc IS NULL
+                       ORDER BY e.timestamp_ms DESC, e.id DESC
+                       LIMIT 1
+                   ) AS source_entry_id
+            FROM push_subscriptions AS s
+        ),
+        due AS (
+            SELECT latest.*,
+                   feed.timestamp_ms + settings.feed_interval_min * 60000 AS due_ms
+            FROM latest
+            JOIN entries AS feed ON feed.id = latest.source_entry_id
+            JOIN baby_settings AS settings
+              ON settings.id = 1
+             AND typeof(settings.feed_interval_min) = 'integer'
+            WHERE feed.timestamp_ms IS NOT NULL
+        )
+        SELECT id, user_slug, endpoint, p256dh, auth, user_agent,
+               created_at_utc, updated_at_utc,
+               last_notified_entry_id, last_notified_due_at_utc, last_sent_at_utc,
+               source_entry_id, due_ms,
+               (
+                   last_notified_entry_id IS source_entry_id
+                   AND last_notified_due_at_utc IS NOT NULL
+                   AND CAST(
+                       ROUND(
+                           (julianday(last_notified_due_at_utc) - 2440587.5)
+                           * 86400000
+                       ) AS INTEGER
+                   ) = due_ms
+               ) AS notified
+        FROM due
+        WHERE (:until_ms IS NULL OR due_ms <= :until_ms)
+          AND (:include_notified OR NOT notified)
+        ORDER BY user_slug ASC
+        """,
+        {"until_ms": until_ms, "include_notified": include_notified},
+    ).fetchall()
+    return [dict(row) for row in rows]
+
+
+def count_push_subscriptions(conn: sqlite3.Connection | None) -> int:
+    assert conn is not None
+    row = conn.execute("SELECT COUNT(*) FROM push_subscriptions").fetchone()
+    return int(row[0])
+
+
+def record_feed_due_deliveries(
+    conn: sqlite3.Connection | None,
+    delivered: list[dict],
+    invalid_user_slugs: list[str],
+) -> None:
+    assert conn is not None
+    now = _now_utc_iso()
+    conn.executemany(
+        """
+        UPDATE push_subscriptions
+        SET last_notified_entry_id = :last_notified_entry_id,
+            last_notified_due_at_utc = :last_notified_due_at_utc,
+            last_sent_at_utc = :last_sent_at_utc,
+            updated_at_utc = :updated_at_utc
+        WHERE user_slug = :user_slug
+        """,
+        [{**state, "updated_at_utc": now} for state in delivered],
+    )
+    conn.executemany(
+        "DELETE FROM push_subscriptions WHERE user_slug = ?",
+        [(user_slug,) for user_slug in invalid_user_slugs],
+    )
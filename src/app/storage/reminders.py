@@ -57,7 +57,6 @@ def create_reminder(
             created_at,
         ),
     )
-    conn.commit()
     row = conn.execute(
         """
         SELECT id, name, kind, interval_min, message, active, last_sent_at_utc,
@@ -101,7 +100,6 @@ def mark_reminder_sent(
         """,
         (sent_at_utc_iso, next_due_at_utc, sent_at_utc_iso, reminder_id),
     )
-    conn.commit()
 
 
 def list_reminders(conn: sqlite3.Connection | None) -> list[dict]:
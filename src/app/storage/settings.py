@@ -10,6 +10,8 @@ DEFAULT_OLLAMA_TIMEOUT_SECONDS = 45
 DEFAULT_OLLAMA_THINKING_ENABLED = False
 DEFAULT_OPENAI_MODEL = "gpt-4.1-mini"
 DEFAULT_OPENAI_TIMEOUT_SECONDS = 45
+DEFAULT_LLM_PROVIDER = "openai"
+LLM_PROVIDERS = ("openai", "ollama")
 
 
 SETTINGS_KEYS = (
@@ -33,6 +35,8 @@ SETTINGS_KEYS = (
     "ollama_thinking_enabled",
     "openai_model",
     "openai_timeout_seconds",
+    "llm_provider",
+    "llm_fallback_provider",
 )
 
 
@@ -108,6 +112,14 @@ def _normalize_settings_payload(data: dict | None) -> dict:
         and openai_timeout > 0
         else DEFAULT_OPENAI_TIMEOUT_SECONDS
     )
+    llm_provider = raw.get("llm_provider")
+    settings["llm_provider"] = (
+        llm_provider if llm_provider in LLM_PROVIDERS else DEFAULT_LLM_PROVIDER
+    )
+    fallback_provider = raw.get("llm_fallback_provider")
+    settings["llm_fallback_provider"] = (
+        fallback_provider if fallback_provider in LLM_PROVIDERS else None
+    )
     return settings
 
 
@@ -120,7 +132,6 @@ def _ensure_settings_row(conn: sqlite3.Connection) -> None:
             VALUES (1, NULL, NULL, datetime('now'))
             """
         )
-        conn.commit()
 
 
 def get_settings(conn: sqlite3.Connection | None) -> dict:
@@ -135,7 +146,8 @@ def get_settings(conn: sqlite3.Connection | None) -> dict:
                default_user_slug, pushcut_feed_due_url,
                home_kpis_webhook_url, feed_size_small_ml, feed_size_big_ml,
                ollama_base_url, ollama_model, ollama_timeout_seconds,
-               ollama_thinking_enabled, openai_model, openai_timeout_seconds
+               ollama_thinking_enabled, openai_model, openai_timeout_seconds,
+               llm_provider, llm_fallback_provider
         FROM baby_settings
         WHERE id = 1
         """
@@ -170,6 +182,8 @@ def update_settings(conn: sqlite3.Connection | None, fields: dict) -> dict:
         "ollama_thinking_enabled",
         "openai_model",
         "openai_timeout_seconds",
+        "llm_provider",
+        "llm_fallback_provider",
         "updated_at_utc",
     ):
         if key in fields:
@@ -181,7 +195,6 @@ def update_settings(conn: sqlite3.Connection | None, fields: dict) -> dict:
             f"UPDATE baby_settings SET {', '.join(assignments)} WHERE id = ?",
             values,
         )
-        conn.commit()
     return get_settings(conn)
 
 
@@ -218,5 +231,4 @@ def update_feed_due_state(
         """,
         (last_entry_id, sent_at_utc, stamp),
     )
-    conn.commit()
     return get_feed_due_state(conn)
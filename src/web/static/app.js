@@ -232,6 +232,7 @@ const chartPanelsEl = document.getElementById("history-chart-panels");
 const chartEmptyEl = document.getElementById("chart-empty");
 const HOME_CHART_TOTAL_HOURS = 24;
 const HOME_CHART_CHUNK_HOURS = 6;
+const SLEEP_TREND_DAYS_SHOWN = 8;
 const logListEl = document.getElementById("log-entries");
 const logEmptyEl = document.getElementById("log-empty");
 const editEntryBackdropEl = document.getElementById("edit-entry-backdrop");
@@ -312,6 +313,8 @@ const homeKpisWebhookInputEl = document.getElementById("home-kpis-webhook-input"
 const defaultUserInputEl = document.getElementById("default-user-input");
 const openaiModelInputEl = document.getElementById("openai-model-input");
 const openaiTimeoutInputEl = document.getElementById("openai-timeout-input");
+const llmProviderSelectEl = document.getElementById("llm-provider-select");
+const llmFallbackProviderSelectEl = document.getElementById("llm-fallback-provider-select");
 const pushReminderUserEl = document.getElementById("push-reminder-user");
 const pushReminderStatusEl = document.getElementById("push-reminder-status");
 const enablePushRemindersBtn = document.getElementById("enable-push-reminders");
@@ -1296,6 +1299,7 @@ let summaryInsightsAnchor = null;
 let summaryInsightsLoading = null;
 let summaryInsightsLoadToken = 0;
 let summaryInsightsComplete = false;
+let summaryInsightsHistory = null;
 let sleepGanttOverlayTypes = new Set(SLEEP_GANTT_DEFAULT_OVERLAYS);
 let milkExpressSparklineMode = "all";
 let milkExpressAllEntries = [];
@@ -1331,8 +1335,8 @@ let timelineObserver = null;
 const timelineDayMap = new Map();
 const timelineHourMap = new Map();
 const SUMMARY_INSIGHTS_PAGE_LIMIT = 250;
-const SUMMARY_INSIGHTS_INITIAL_WINDOW_DAYS = 30;
 const SUMMARY_INSIGHTS_MAX_PAGES = 120;
+const SUMMARY_INSIGHTS_RAW_DAYS = 30;
 const SUMMARY_GANTT_LOOKBACK_HOURS = 24;
 const RULER_DAYS_BACK = 7;
 const RULER_WINDOW_MS = 24 * 60 * 60 * 1000;
@@ -1820,6 +1824,17 @@ function initSettingsHandlers() {
       void saveBabySettings({ openai_timeout_seconds: nextValue });
     });
   }
+  if (llmProviderSelectEl) {
+    llmProviderSelectEl.addEventListener("change", () => {
+      void saveBabySettings({ llm_provider: llmProviderSelectEl.value });
+    });
+  }
+  if (llmFallbackProviderSelectEl) {
+    llmFallbackProviderSelectEl.addEventListener("change", () => {
+      const value = llmFallbackProviderSelectEl.value;
+      void saveBabySettings({ llm_fallback_provider: value || null });
+    });
+  }
   if (enablePushRemindersBtn) {
     enablePushRemindersBtn.addEventListener("click", () => {
       void enablePushReminders();
@@ -4024,6 +4039,58 @@ function renderAiSummary(summary, thinking) {
   }
 }
 
+const AI_SUMMARY_SECTION_TITLES = {
+  selected_day: "Selected day",
+  comparison_to_previous_7_days: "Compared with previous 7 days",
+  follow_up: "Handover follow-up",
+};
+
+function renderAiSummarySections(sections) {
+  const lines = [];
+  let currentSection = null;
+  sections.forEach(({ section, text }) => {
+    if (section === "headline") {
+      lines.unshift(`## ${text}`);
+      return;
+    }
+    if (section !== currentSection) {
+      currentSection = section;
+      lines.push("", `### ${AI_SUMMARY_SECTION_TITLES[section] || section}`);
+    }
+    lines.push(`- ${text}`);
+  });
+  return lines.join("\n").trim();
+}
+
+async function readServerSentEvents(response, onEvent) {
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+  for (;;) {
+    const { value, done } = await reader.read();
+    buffer += decoder.decode(value || new Uint8Array(), { stream: !done });
+    let boundary = buffer.indexOf("\n\n");
+    while (boundary >= 0) {
+      const block = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+      let event = "message";
+      let data = "";
+      block.split("\n").forEach((line) => {
+        if (line.startsWith("event: ")) {
+          event = line.slice(7);
+        } else if (line.startsWith("data: ")) {
+          data += line.slice(6);
+        }
+      });
+      onEvent(event, data ? JSON.parse(data) : {});
+      boundary = buffer.indexOf("\n\n");
+    }
+    if (done) {
+      return;
+    }
+  }
+}
+
 async function generateAiSummary() {
   if (!state.userValid) {
     resetAiSummaryPanel();
@@ -4035,13 +4102,13 @@ async function generateAiSummary() {
   const dayWindow = getSummaryDayWindow(summaryDate || new Date());
   setAiSummaryLoading(true);
   if (aiSummaryMetaEl) {
-    aiSummaryMetaEl.textContent = "Generating with OpenAI...";
+    aiSummaryMetaEl.textContent = "Generating summary...";
   }
   if (aiSummaryOutputEl) {
     aiSummaryOutputEl.replaceChildren();
   }
   try {
-    const response = await fetch(buildUrl("/api/entries/llm-summary"), {
+    const response = await fetch(buildUrl("/api/entries/llm-summary/stream"), {
       method: "POST",
       headers: { "Content-Type": "application/json" },
       body: JSON.stringify({
@@ -4049,10 +4116,22 @@ async function generateAiSummary() {
         until_utc: dayWindow.untilIso,
       }),
     });
-    const data = await response.json().catch(() => ({}));
     if (!response.ok) {
-      throw new Error(data.error || "summary failed");
-    }
+      const failure = await response.json().catch(() => ({}));
+      throw new Error(failure.error || "summary failed");
+    }
+    const sections = [];
+    let data = {};
+    await readServerSentEvents(response, (event, payload) => {
+      if (event === "section") {
+        sections.push(payload);
+        renderAiSummary(renderAiSummarySections(sections), "");
+      } else if (event === "summary") {
+        data = payload;
+      } else if (event === "error") {
+        throw new Error(payload.error || "summary failed");
+      }
+    });
     if (!data.event_count) {
       if (aiSummaryMetaEl) {
         aiSummaryMetaEl.textContent = "No events found for this date.";
@@ -4067,7 +4146,8 @@ async function generateAiSummary() {
       const contextLabel = Number.isInteger(data.context_event_count)
         ? ` · ${data.context_event_count} events incl. 7-day context`
         : "";
-      aiSummaryMetaEl.textContent = `${data.event_count} selected-day events${contextLabel} · ${data.model || provider}`;
+      const fallbackLabel = data.fallback ? " (fallback)" : "";
+      aiSummaryMetaEl.textContent = `${data.event_count} selected-day events${contextLabel} · ${data.model || provider}${fallbackLabel}`;
     }
   } catch (err) {
     if (aiSummaryMetaEl) {
@@ -4530,23 +4610,20 @@ function renderMilkExpressSparkline(dayMatches) {
   milkExpressSparklineEl.appendChild(dot);
 }
 
-function renderSleepTrendChartInto(entries, { chartEl, labelsEl, averageChipEl, baseDate }) {
-  if (!chartEl || !labelsEl || !averageChipEl) {
-    return;
-  }
-  chartEl.innerHTML = "";
-  labelsEl.innerHTML = "";
-  averageChipEl.textContent = "";
-
+function buildSleepTrendDays(baseDate) {
   const today = baseDate ? new Date(baseDate) : new Date();
-  const daysShown = 8;
-  const averageWindowDays = 7;
-  const dailyTotals = [];
-
-  for (let i = daysShown - 1; i >= 0; i--) {
+  const days = [];
+  for (let i = SLEEP_TREND_DAYS_SHOWN - 1; i >= 0; i--) {
     const date = new Date(today);
     date.setDate(date.getDate() - i);
     date.setHours(0, 0, 0, 0);
+    days.push({ date, totalMinutes: 0 });
+  }
+  return days;
+}
+
+function buildSleepTrendTotalsFromEntries(entries, baseDate) {
+  return buildSleepTrendDays(baseDate).map(({ date }) => {
     const nextDate = new Date(date);
     nextDate.setDate(nextDate.getDate() + 1);
 
@@ -4561,8 +4638,61 @@ function renderSleepTrendChartInto(entries, { chartEl, labelsEl, averageChipEl,
       return sum + (Number.isFinite(duration) && duration > 0 ? duration : 0);
     }, 0);
 
-    dailyTotals.push({ date, totalMinutes });
+    return { date, totalMinutes };
+  });
+}
+
+function buildSleepTrendTotalsFromBuckets(buckets, baseDate, tzOffsetMin) {
+  const dailyTotals = buildSleepTrendDays(baseDate);
+  const byDay = new Map(dailyTotals.map((day) => [formatDateInputValue(day.date), day]));
+  buckets.forEach((bucket) => {
+    const localStartMs = Date.parse(bucket.bucket_start_utc || "") + tzOffsetMin * 60000;
+    if (Number.isNaN(localStartMs)) {
+      return;
+    }
+    const day = byDay.get(new Date(localStartMs).toISOString().slice(0, 10));
+    const duration = Number.parseFloat(bucket.duration_min);
+    if (day && Number.isFinite(duration) && duration > 0) {
+      day.totalMinutes += duration;
+    }
+  });
+  return dailyTotals;
+}
+
+async function loadSleepTrendTotals(trendWindow, baseDate) {
+  const tzOffsetMin = -(baseDate || new Date()).getTimezoneOffset();
+  try {
+    if (syncInFlight) {
+      await syncInFlight;
+    }
+    const buckets = await fetchEntriesAggregate({
+      bucket: "day",
+      type: "sleep",
+      since: trendWindow.sinceIso,
+      until: trendWindow.untilIso,
+      tz_offset_min: tzOffsetMin,
+    });
+    return buildSleepTrendTotalsFromBuckets(buckets, baseDate, tzOffsetMin);
+  } catch (err) {
+    const localEntries = await listEntriesLocalSafe({
+      limit: 500,
+      since: trendWindow.sinceIso,
+      until: trendWindow.untilIso,
+    });
+    return buildSleepTrendTotalsFromEntries(localEntries || [], baseDate);
+  }
+}
+
+function renderSleepTrendChartInto(dailyTotals, { chartEl, labelsEl, averageChipEl }) {
+  if (!chartEl || !labelsEl || !averageChipEl) {
+    return;
   }
+  chartEl.innerHTML = "";
+  labelsEl.innerHTML = "";
+  averageChipEl.textContent = "";
+
+  const daysShown = dailyTotals.length;
+  const averageWindowDays = 7;
 
   const averageWindowTotals = dailyTotals.slice(0, averageWindowDays);
   const maxMinutes = Math.max(...dailyTotals.map((d) => d.totalMinutes), 1);
@@ -4632,21 +4762,19 @@ function renderSleepTrendChartInto(entries, { chartEl, labelsEl, averageChipEl,
   });
 }
 
-function renderSleepTrendChart(entries) {
-  renderSleepTrendChartInto(entries, {
+function renderSleepTrendChart(dailyTotals) {
+  renderSleepTrendChartInto(dailyTotals, {
     chartEl: sleepTrendChartEl,
     labelsEl: sleepTrendLabelsEl,
     averageChipEl: sleepTrendAverageChipEl,
-    baseDate: summaryDate || new Date(),
   });
 }
 
-function renderHomeSleepTrendChart(entries) {
-  renderSleepTrendChartInto(entries, {
+function renderHomeSleepTrendChart(dailyTotals) {
+  renderSleepTrendChartInto(dailyTotals, {
     chartEl: homeSleepTrendChartEl,
     labelsEl: homeSleepTrendLabelsEl,
     averageChipEl: homeSleepTrendAverageChipEl,
-    baseDate: new Date(),
   });
 }
 
@@ -4942,7 +5070,36 @@ function computeWindowDaySpan(windowEntries, sinceMs, untilMs) {
   return Math.max(1, Math.ceil((untilMs - earliestMs) / 86400000));
 }
 
-function renderSummaryInsights(entries, anchorEnd) {
+function applyInsightHistory(feedStats, expressStats, sleepStats, history) {
+  const count = feedStats.count + history.feedCount;
+  const lastFeed = feedStats.entries[feedStats.entries.length - 1];
+  const lastFeedMs = lastFeed ? Date.parse(lastFeed.timestamp_utc) : history.lastFeedMs;
+  const feedSpanMs = Number.isFinite(lastFeedMs) && Number.isFinite(history.firstFeedMs)
+    ? lastFeedMs - history.firstFeedMs
+    : 0;
+  return {
+    feedStats: {
+      ...feedStats,
+      count,
+      durationTotal: feedStats.durationTotal + history.feedDurationTotal,
+      expressedTotal: feedStats.expressedTotal + history.expressedTotal,
+      formulaTotal: feedStats.formulaTotal + history.formulaTotal,
+      avgGap: count > 1 && feedSpanMs > 0 ? feedSpanMs / 60000 / (count - 1) : feedStats.avgGap,
+      medianGap: null,
+    },
+    expressStats: {
+      ...expressStats,
+      count: expressStats.count + history.expressCount,
+      totalMl: expressStats.totalMl + history.expressMl,
+    },
+    sleepStats: {
+      ...sleepStats,
+      durationTotal: sleepStats.durationTotal + history.sleepMinutes,
+    },
+  };
+}
+
+function renderSummaryInsights(entries, anchorEnd, history = null) {
   if (!entries.length) {
     if (insightLastFeedEl) {
       insightLastFeedEl.textContent = "--";
@@ -5054,13 +5211,25 @@ function renderSummaryInsights(entries, anchorEnd) {
   }
   timeframeSpecs.forEach((spec) => {
     const untilMs = anchorEnd.getTime();
-    const sinceMs = spec.hours ? untilMs - spec.hours * 3600000 : null;
+    const olderHistory = spec.hours ? null : history;
+    const sinceMs = spec.hours
+      ? untilMs - spec.hours * 3600000
+      : olderHistory && olderHistory.sinceMs;
     const windowEntries = filterEntriesByWindow(entries, sinceMs, untilMs);
-    const feedStats = computeFeedStats(windowEntries);
-    const expressStats = computeExpressStats(windowEntries);
+    let feedStats = computeFeedStats(windowEntries);
+    let expressStats = computeExpressStats(windowEntries);
     const diaperStats = computeDiaperStats(windowEntries);
-    const sleepStats = computeSleepStats(windowEntries);
-    const daySpan = computeWindowDaySpan(windowEntries, sinceMs, untilMs);
+    let sleepStats = computeSleepStats(windowEntries);
+    let daySpan = computeWindowDaySpan(windowEntries, sinceMs, untilMs);
+    if (olderHistory) {
+      ({ feedStats, expressStats, sleepStats } = applyInsightHistory(
+        feedStats,
+        expressStats,
+        sleepStats,
+        olderHistory,
+      ));
+      daySpan = computeWindowDaySpan(windowEntries, olderHistory.firstEntryMs, untilMs);
+    }
     const avgGapText = feedStats.avgGap ? formatDurationMinutes(feedStats.avgGap) : "--";
     const avgFeedTotalText = feedStats.count
       ? formatMl((feedStats.expressedTotal + feedStats.formulaTotal) / feedStats.count)
@@ -5526,6 +5695,64 @@ async function fetchEntries(params) {
   return normalizeEntriesResponse(data);
 }
 
+async function fetchEntriesPage(params) {
+  const query = params && params.cursor ? params : { ...params, paginate: 1 };
+  const response = await fetch(
+    buildUrl(`/api/entries${buildQuery(query)}`),
+  );
+  if (!response.ok) {
+    let detail = "";
+    try {
+      const err = await response.json();
+      detail = err.error || JSON.stringify(err);
+    } catch (parseError) {
+      detail = await response.text();
+    }
+    throw new Error(detail || `HTTP ${response.status}`);
+  }
+  const data = await response.json();
+  return {
+    entries: normalizeEntriesResponse(data),
+    nextCursor: data && data.has_more ? data.next_cursor : null,
+  };
+}
+
+async function fetchEntriesAggregate(params) {
+  const response = await fetch(
+    buildUrl(`/api/entries/aggregate${buildQuery(params)}`),
+  );
+  if (!response.ok) {
+    let detail = "";
+    try {
+      const err = await response.json();
+      detail = err.error || JSON.stringify(err);
+    } catch (parseError) {
+      detail = await response.text();
+    }
+    throw new Error(detail || `HTTP ${response.status}`);
+  }
+  const data = await response.json();
+  return data && Array.isArray(data.buckets) ? data.buckets : [];
+}
+
+async function fetchDailyRollups(params) {
+  const response = await fetch(
+    buildUrl(`/api/entries/daily-rollups${buildQuery(params)}`),
+  );
+  if (!response.ok) {
+    let detail = "";
+    try {
+      const err = await response.json();
+      detail = err.error || JSON.stringify(err);
+    } catch (parseError) {
+      detail = await response.text();
+    }
+    throw new Error(detail || `HTTP ${response.status}`);
+  }
+  const data = await response.json();
+  return data && Array.isArray(data.days) ? data.days : [];
+}
+
 function sortEntriesByTimestampDesc(entries) {
   return entries.slice().sort((left, right) => {
     const leftMs = Date.parse(left.timestamp_utc || "");
@@ -5605,29 +5832,23 @@ async function yieldForUi() {
 async function fetchEntriesInWindow(params) {
   const limit = 500;
   const since = params && params.since ? params.since : undefined;
+  const until = params && params.until ? params.until : undefined;
   const type = params && params.type ? params.type : undefined;
-  let batchUntil = params && params.until ? params.until : undefined;
+  let cursor = null;
   let entries = [];
   for (let page = 0; page < 100; page += 1) {
-    const batch = await fetchEntries({
+    const batch = await fetchEntriesPage({
       limit,
       since,
-      until: batchUntil,
+      until,
       type,
+      cursor,
     });
-    entries = entries.concat(batch);
-    if (batch.length < limit) {
-      break;
-    }
-    const oldest = batch[batch.length - 1];
-    if (!oldest || !oldest.timestamp_utc) {
-      break;
-    }
-    const nextUntil = decrementIsoTimestamp(oldest.timestamp_utc);
-    if (!nextUntil || nextUntil === batchUntil) {
+    entries = entries.concat(batch.entries);
+    if (!batch.nextCursor) {
       break;
     }
-    batchUntil = nextUntil;
+    cursor = batch.nextCursor;
   }
   return entries;
 }
@@ -8264,6 +8485,11 @@ async function loadHomeEntries() {
     homeSleepTrendWindow.since.setDate(homeSleepTrendWindow.since.getDate() - 7);
     homeSleepTrendWindow.sinceIso = homeSleepTrendWindow.since.toISOString();
     homeSleepTrendWindow.untilIso = homeSleepTrendWindow.until.toISOString();
+    const homeSleepStatsWindow = {
+      since: new Date(todayWindow.since),
+      until: now,
+    };
+    homeSleepStatsWindow.since.setDate(homeSleepStatsWindow.since.getDate() - 1);
     const chartUntil = new Date(now);
     const chartWindow = createWindow(
       new Date(chartUntil.getTime() - HOME_CHART_TOTAL_HOURS * 60 * 60 * 1000),
@@ -8300,16 +8526,18 @@ async function loadHomeEntries() {
       renderLastActivity(cachedEntries);
       renderLastByType(cachedEntries);
       renderLatestEntry(cachedEntries[0] || null);
-      renderHomeSleepTrendChart(cachedSleepTrendEntries || cachedEntries);
+      renderHomeSleepTrendChart(
+        buildSleepTrendTotalsFromEntries(cachedSleepTrendEntries || cachedEntries, now),
+      );
     } else {
       renderChart([], chartWindows);
       renderLatestEntry(null);
-      renderHomeSleepTrendChart(cachedSleepTrendEntries || []);
+      renderHomeSleepTrendChart(buildSleepTrendTotalsFromEntries(cachedSleepTrendEntries || [], now));
     }
 
     void syncNow();
 
-    const [entries, chartSourceEntries, currentGoal, sleepTrendEntries] = await Promise.all([
+    const [entries, chartSourceEntries, currentGoal, sleepEntries, sleepTrendTotals] = await Promise.all([
       loadEntriesWithFallback({
         limit: 200,
         since: statsWindow.sinceIso,
@@ -8322,21 +8550,22 @@ async function loadHomeEntries() {
       }),
       loadCurrentGoal(),
       loadEntriesWithFallback({
-        limit: 500,
-        since: homeSleepTrendWindow.sinceIso,
-        until: homeSleepTrendWindow.untilIso,
+        limit: 200,
+        since: homeSleepStatsWindow.since.toISOString(),
+        until: homeSleepStatsWindow.until.toISOString(),
       }),
+      loadSleepTrendTotals(homeSleepTrendWindow, now),
     ]);
     state.activeFeedingGoal = currentGoal;
     const chartEntries = chartSourceEntries.filter((entry) => entryOverlapsChartWindow(entry, chartWindow));
     renderChart(chartEntries, chartWindows);
-    renderStats(entries, { sleepEntries: sleepTrendEntries });
+    renderStats(entries, { sleepEntries });
     renderGoalComparison();
     renderStatsWindow(todayWindow);
     renderLastActivity(entries);
     renderLastByType(entries);
     renderLatestEntry(entries[0] || null);
-    renderHomeSleepTrendChart(sleepTrendEntries);
+    renderHomeSleepTrendChart(sleepTrendTotals);
   } catch (err) {
     setStatus(`Failed to load entries: ${err.message || "unknown error"}`);
   } finally {
@@ -8390,12 +8619,14 @@ async function loadSummaryEntries() {
       renderSleepGanttTypeOptions(cachedEntries);
       renderSleepGantt(summaryGanttEntries.length ? summaryGanttEntries : cachedEntries);
       renderMilkExpressSummary(cachedEntries);
-      renderSleepTrendChart(cachedTrendEntries || cachedEntries);
+      renderSleepTrendChart(
+        buildSleepTrendTotalsFromEntries(cachedTrendEntries || cachedEntries, summaryDate),
+      );
     }
 
     void syncNow();
 
-    const [entries, ganttEntries, trendEntries] = await Promise.all([
+    const [entries, ganttEntries, trendTotals] = await Promise.all([
       loadEntriesWithFallback({
         limit: 200,
         since: dayWindow.sinceIso,
@@ -8406,11 +8637,7 @@ async function loadSummaryEntries() {
         since: ganttWindow.lookbackSinceIso,
         until: ganttWindow.untilIso,
       }),
-      loadEntriesWithFallback({
-        limit: 500,
-        since: trendWindow.sinceIso,
-        until: trendWindow.untilIso,
-      }),
+      loadSleepTrendTotals(trendWindow, summaryDate),
       ensureMilkExpressAllEntries(),
     ]);
     summaryEntries = entries;
@@ -8419,7 +8646,7 @@ async function loadSummaryEntries() {
     renderSleepGanttTypeOptions(entries);
     renderSleepGantt(ganttEntries.length ? ganttEntries : entries);
     renderMilkExpressSummary(entries);
-    renderSleepTrendChart(trendEntries);
+    renderSleepTrendChart(trendTotals);
     await loadSummaryInsights();
   } catch (err) {
     setStatus(`Failed to load entries: ${err.message || "unknown error"}`);
@@ -8431,6 +8658,92 @@ async function loadSummaryEntries() {
   }
 }
 
+function getInsightRawSinceMs(anchorEnd) {
+  const sinceMs = anchorEnd.getTime() - SUMMARY_INSIGHTS_RAW_DAYS * 86400000;
+  return sinceMs - (sinceMs % 86400000);
+}
+
+async function fetchInsightDayEntries(dayUtc, type) {
+  const sinceMs = Date.parse(`${dayUtc}T00:00:00Z`);
+  return fetchEntriesInWindow({
+    since: new Date(sinceMs).toISOString(),
+    until: new Date(sinceMs + 86400000 - 1).toISOString(),
+    type,
+  });
+}
+
+async function loadSummaryInsightHistory(rawSinceMs, rawEntries) {
+  const days = await fetchDailyRollups({
+    until: new Date(rawSinceMs - 86400000).toISOString().slice(0, 10),
+  });
+  if (!days.length) {
+    return null;
+  }
+  const history = {
+    sinceMs: rawSinceMs,
+    feedCount: 0,
+    feedDurationTotal: 0,
+    expressedTotal: 0,
+    formulaTotal: 0,
+    expressCount: 0,
+    expressMl: 0,
+    sleepMinutes: 0,
+    firstEntryMs: null,
+    firstFeedMs: null,
+    lastFeedMs: null,
+    edgeEntries: [],
+  };
+  const feedDays = [];
+  const expressDays = [];
+  days.forEach((day) => {
+    if (day.type === "feed") {
+      history.feedCount += day.entry_count;
+      history.feedDurationTotal += day.duration_min;
+      history.expressedTotal += day.expressed_ml;
+      history.formulaTotal += day.formula_ml;
+      feedDays.push(day);
+    } else if (isMilkExpressType(day.type)) {
+      history.expressCount += day.entry_count;
+      history.expressMl += day.expressed_ml;
+      expressDays.push(day);
+    } else if (isSleepType(day.type)) {
+      history.sleepMinutes += day.duration_min;
+    }
+  });
+
+  const edgeFetches = [fetchInsightDayEntries(days[0].day_utc)];
+  if (feedDays.length && feedDays[0].day_utc !== days[0].day_utc) {
+    edgeFetches.push(fetchInsightDayEntries(feedDays[0].day_utc, "feed"));
+  }
+  if (feedDays.length && !rawEntries.some((entry) => entry.type === "feed")) {
+    edgeFetches.push(fetchInsightDayEntries(feedDays[feedDays.length - 1].day_utc, "feed"));
+  }
+  if (expressDays.length && !rawEntries.some((entry) => isMilkExpressType(entry.type))) {
+    const lastExpressDay = expressDays[expressDays.length - 1];
+    edgeFetches.push(fetchInsightDayEntries(lastExpressDay.day_utc, lastExpressDay.type));
+  }
+  history.edgeEntries = mergeEntriesUnique([], (await Promise.all(edgeFetches)).flat());
+  history.edgeEntries.forEach((entry) => {
+    const ms = Date.parse(entry.timestamp_utc || "");
+    if (Number.isNaN(ms)) {
+      return;
+    }
+    if (history.firstEntryMs === null || ms < history.firstEntryMs) {
+      history.firstEntryMs = ms;
+    }
+    if (entry.type !== "feed") {
+      return;
+    }
+    if (history.firstFeedMs === null || ms < history.firstFeedMs) {
+      history.firstFeedMs = ms;
+    }
+    if (history.lastFeedMs === null || ms > history.lastFeedMs) {
+      history.lastFeedMs = ms;
+    }
+  });
+  return history;
+}
+
 async function loadSummaryInsights() {
   if (pageType !== "summary") {
     return;
@@ -8438,7 +8751,7 @@ async function loadSummaryInsights() {
   const { anchorEnd, anchorIso } = getInsightAnchor(summaryDate || new Date());
   const sameAnchor = summaryInsightsAnchor === anchorIso;
   if (sameAnchor && summaryInsightsEntries.length && summaryInsightsComplete) {
-    renderSummaryInsights(summaryInsightsEntries, anchorEnd);
+    renderSummaryInsights(summaryInsightsEntries, anchorEnd, summaryInsightsHistory);
     setSummaryInsightProgressText("All-time metrics fully loaded.");
     return;
   }
@@ -8450,9 +8763,8 @@ async function loadSummaryInsights() {
   summaryInsightsLoadToken = loadToken;
   summaryInsightsAnchor = anchorIso;
   summaryInsightsComplete = false;
+  summaryInsightsHistory = null;
 
-  const initialSince = new Date(anchorEnd);
-  initialSince.setDate(initialSince.getDate() - SUMMARY_INSIGHTS_INITIAL_WINDOW_DAYS);
   let mergedEntries = mergeEntriesUnique([], summaryEntries || []);
   if (mergedEntries.length) {
     summaryInsightsEntries = mergedEntries;
@@ -8463,63 +8775,50 @@ async function loadSummaryInsights() {
   }
 
   summaryInsightsLoading = (async () => {
-    const initialBatch = await fetchEntries({
-      limit: SUMMARY_INSIGHTS_PAGE_LIMIT,
-      since: initialSince.toISOString(),
-      until: anchorIso,
-    });
-    if (loadToken !== summaryInsightsLoadToken) {
-      return [];
-    }
-    mergedEntries = mergeEntriesUnique(mergedEntries, initialBatch);
-    summaryInsightsEntries = mergedEntries;
-    renderSummaryInsights(summaryInsightsEntries, anchorEnd);
-    setSummaryInsightProgressText(buildSummaryInsightProgressText(summaryInsightsEntries, anchorEnd, false));
-
-    let batchUntil = null;
-    if (mergedEntries.length) {
-      const oldest = mergedEntries[mergedEntries.length - 1];
-      batchUntil = decrementIsoTimestamp(oldest.timestamp_utc);
-    } else {
-      batchUntil = anchorIso;
-    }
+    const rawSinceMs = getInsightRawSinceMs(anchorEnd);
+    let cursor = null;
+    let rawComplete = false;
 
     for (let page = 0; page < SUMMARY_INSIGHTS_MAX_PAGES; page += 1) {
-      if (loadToken !== summaryInsightsLoadToken || !batchUntil) {
+      if (loadToken !== summaryInsightsLoadToken) {
         return mergedEntries;
       }
-      const batch = await fetchEntries({
+      const batch = await fetchEntriesPage({
         limit: SUMMARY_INSIGHTS_PAGE_LIMIT,
-        until: batchUntil,
+        since: new Date(rawSinceMs).toISOString(),
+        until: anchorIso,
+        cursor,
       });
       if (loadToken !== summaryInsightsLoadToken) {
         return mergedEntries;
       }
-      if (!batch.length) {
-        summaryInsightsComplete = true;
-        break;
+      if (batch.entries.length) {
+        mergedEntries = mergeEntriesUnique(mergedEntries, batch.entries);
+        summaryInsightsEntries = mergedEntries;
+        renderSummaryInsights(summaryInsightsEntries, anchorEnd);
+        setSummaryInsightProgressText(buildSummaryInsightProgressText(summaryInsightsEntries, anchorEnd, false));
       }
-      mergedEntries = mergeEntriesUnique(mergedEntries, batch);
-      summaryInsightsEntries = mergedEntries;
-      renderSummaryInsights(summaryInsightsEntries, anchorEnd);
-      setSummaryInsightProgressText(buildSummaryInsightProgressText(summaryInsightsEntries, anchorEnd, false));
 
-      if (batch.length < SUMMARY_INSIGHTS_PAGE_LIMIT) {
-        summaryInsightsComplete = true;
+      if (!batch.nextCursor) {
+        rawComplete = true;
         break;
       }
-      const oldest = batch[batch.length - 1];
-      if (!oldest || !oldest.timestamp_utc) {
-        summaryInsightsComplete = true;
-        break;
+      cursor = batch.nextCursor;
+      await yieldForUi();
+    }
+
+    if (rawComplete) {
+      const history = await loadSummaryInsightHistory(rawSinceMs, mergedEntries);
+      if (loadToken !== summaryInsightsLoadToken) {
+        return mergedEntries;
       }
-      const nextBatchUntil = decrementIsoTimestamp(oldest.timestamp_utc);
-      if (!nextBatchUntil || nextBatchUntil === batchUntil) {
-        summaryInsightsComplete = true;
-        break;
+      if (history) {
+        mergedEntries = mergeEntriesUnique(mergedEntries, history.edgeEntries);
+        summaryInsightsEntries = mergedEntries;
       }
-      batchUntil = nextBatchUntil;
-      await yieldForUi();
+      summaryInsightsHistory = history;
+      summaryInsightsComplete = true;
+      renderSummaryInsights(summaryInsightsEntries, anchorEnd, summaryInsightsHistory);
     }
 
     if (loadToken !== summaryInsightsLoadToken) {
@@ -8724,6 +9023,12 @@ async function loadBabySettings() {
     if (openaiTimeoutInputEl) {
       openaiTimeoutInputEl.value = String(data.openai_timeout_seconds || 45);
     }
+    if (llmProviderSelectEl) {
+      llmProviderSelectEl.value = data.llm_provider || "openai";
+    }
+    if (llmFallbackProviderSelectEl) {
+      llmFallbackProviderSelectEl.value = data.llm_fallback_provider || "";
+    }
     if (feedSizeSmallInputEl) {
       feedSizeSmallInputEl.value = String(state.feedSizeSmallMl);
     }
@@ -8781,6 +9086,12 @@ async function saveBabySettings(patch) {
     if (openaiTimeoutInputEl) {
       openaiTimeoutInputEl.value = String(data.openai_timeout_seconds || 45);
     }
+    if (llmProviderSelectEl) {
+      llmProviderSelectEl.value = data.llm_provider || "openai";
+    }
+    if (llmFallbackProviderSelectEl) {
+      llmFallbackProviderSelectEl.value = data.llm_fallback_provider || "";
+    }
     if (feedSizeSmallInputEl) {
       feedSizeSmallInputEl.value = String(state.feedSizeSmallMl);
     }
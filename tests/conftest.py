@@ -1,5 +1,11 @@
+import base64
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import os
 import sys
+import tempfile
 import threading
+import time
 from pathlib import Path
 
 import pytest
@@ -9,7 +15,12 @@ ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
+_IMPORT_DB_DIR = tempfile.TemporaryDirectory(prefix="baby-tracker-tests-")
+os.environ["BABY_TRACKER_DB_PATH"] = str(Path(_IMPORT_DB_DIR.name) / "import.sqlite")
+
 from src.app.main import create_app
+from src.app.services.push_subscriptions import VapidConfig, build_vapid_config
+from src.app.storage.db import close_connection_pools
 
 
 @pytest.fixture()
@@ -45,3 +56,215 @@ def live_server(app):
     finally:
         server.shutdown()
         thread.join(timeout=5)
+
+
+def _b64url(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _p256_key_pair() -> tuple[str, str]:
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import ec
+
+    key = ec.generate_private_key(ec.SECP256R1())
+    private = key.private_numbers().private_value.to_bytes(32, "big")
+    public = key.public_key().public_bytes(
+        serialization.Encoding.X962,
+        serialization.PublicFormat.UncompressedPoint,
+    )
+    return _b64url(private), _b64url(public)
+
+
+class FakePushService:
+    def __init__(self) -> None:
+        self.requests: list[dict] = []
+        self.statuses: dict[str, int] = {}
+        self.delay_seconds = 0.0
+        self._lock = threading.Lock()
+        service = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length)
+                headers = {key.lower(): value for key, value in self.headers.items()}
+                with service._lock:
+                    service.requests.append(
+                        {
+                            "path": self.path,
+                            "headers": headers,
+                            "body": body,
+                            "client_port": self.client_address[1],
+                        }
+                    )
+                if service.delay_seconds:
+                    time.sleep(service.delay_seconds)
+                status = service.statuses.get(self.path, 201)
+                self.send_response(status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                return
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        host, port = self._server.server_address[:2]
+        self.url = f"http://{host}:{port}"
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, daemon=True
+        )
+        self._thread.start()
+
+    def subscription(self, user_slug: str) -> dict:
+        _private, p256dh = _p256_key_pair()
+        return {
+            "user_slug": user_slug,
+            "endpoint": f"{self.url}/push/{user_slug}",
+            "p256dh": p256dh,
+            "auth": _b64url(os.urandom(16)),
+        }
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join(timeout=5)
+
+
+@pytest.fixture()
+def fake_push_service():
+    service = FakePushService()
+    try:
+        yield service
+    finally:
+        service.close()
+
+
+class FakeLlmService:
+    def __init__(self, api: str) -> None:
+        self.api = api
+        self.requests: list[dict] = []
+        self.content = json.dumps(
+            {
+                "headline": "Steady day",
+                "selected_day": ["One 90 ml feed.", "Settled afterwards."],
+                "comparison_to_previous_7_days": ["Fewer feeds than last week."],
+                "follow_up": ["Check the overnight feeds."],
+            }
+        )
+        self.chunk_size = 16
+        self.delay_seconds = 0.0
+        self.status = 200
+        self.truncate = False
+        service = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length))
+                service.requests.append(body)
+                if service.status != 200:
+                    self.send_response(service.status)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                if not body.get("stream"):
+                    raw = json.dumps(service._reply(service.content)).encode("utf-8")
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(raw)))
+                    self.end_headers()
+                    self.wfile.write(raw[: len(raw) // 2] if service.truncate else raw)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", service._stream_content_type())
+                self.end_headers()
+                content = service.content
+                for start in range(0, len(content), service.chunk_size):
+                    chunk = content[start : start + service.chunk_size]
+                    self.wfile.write(service._stream_line(chunk))
+                    self.wfile.flush()
+                    time.sleep(service.delay_seconds)
+                self.wfile.write(service._stream_line(None))
+
+            def log_message(self, format, *args):
+                return
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        host, port = self._server.server_address[:2]
+        self.base_url = f"http://{host}:{port}"
+        self.url = (
+            f"{self.base_url}/v1/chat/completions"
+            if api == "openai"
+            else f"{self.base_url}/api/chat"
+        )
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, daemon=True
+        )
+        self._thread.start()
+
+    def _reply(self, content: str) -> dict:
+        if self.api == "openai":
+            return {"choices": [{"message": {"content": content}}]}
+        return {"message": {"role": "assistant", "content": content}, "done": True}
+
+    def _stream_content_type(self) -> str:
+        if self.api == "openai":
+            return "text/event-stream"
+        return "application/x-ndjson"
+
+    def _stream_line(self, chunk: str | None) -> bytes:
+        if self.api == "openai":
+            if chunk is None:
+                return b"data: [DONE]\n\n"
+            data = {"choices": [{"delta": {"content": chunk}}]}
+            return f"data: {json.dumps(data)}\n\n".encode()
+        data = {
+            "message": {"role": "assistant", "content": chunk or ""},
+            "done": chunk is None,
+        }
+        return f"{json.dumps(data)}\n".encode()
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join(timeout=5)
+
+
+@pytest.fixture()
+def fake_openai_service(monkeypatch):
+    from src.app.services import llm_summary
+
+    service = FakeLlmService("openai")
+    monkeypatch.setattr(llm_summary, "OPENAI_API_URL", service.url)
+    monkeypatch.setenv("BABY_TRACKER_OPENAI_API_KEY", "test-openai-key")
+    try:
+        yield service
+    finally:
+        service.close()
+
+
+@pytest.fixture()
+def fake_ollama_service():
+    service = FakeLlmService("ollama")
+    try:
+        yield service
+    finally:
+        service.close()
+
+
+@pytest.fixture()
+def vapid_config() -> VapidConfig:
+    private_key, public_key = _p256_key_pair()
+    config = build_vapid_config(public_key, private_key, "mailto:test@example.com")
+    assert config is not None
+    return config
+
+
+@pytest.fixture(autouse=True)
+def _close_connection_pools():
+    yield
+    close_connection_pools()
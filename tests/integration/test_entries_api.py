@@ -1,6 +1,8 @@
 import csv
+import gzip
 import io
 import json
+import time
 
 
 def test_create_user_entry_allows_wee(client):
@@ -98,6 +100,9 @@ def test_create_entry_sends_webhook_payload(client, monkeypatch):
         json={"type": "feed", "client_event_id": "evt-hook-1"},
     )
     assert response.status_code == 201
+    from src.app.services.outbox import dispatch_outbox
+
+    dispatch_outbox(client.application)
     entry = response.get_json()
     assert captured["url"] == "https://example.com/entry-hook"
     assert json.loads(captured["data"].decode("utf-8")) == entry
@@ -119,6 +124,9 @@ def test_create_entry_skips_webhook_without_url(client, monkeypatch):
         json={"type": "feed", "client_event_id": "evt-hook-2"},
     )
     assert response.status_code == 201
+    from src.app.services.outbox import dispatch_outbox
+
+    dispatch_outbox(client.application)
     assert called["count"] == 0
 
 
@@ -156,6 +164,9 @@ def test_create_user_entry_sends_native_push_confirmation(client, monkeypatch):
         json={"type": "feed", "client_event_id": "evt-push-confirm-1"},
     )
     assert response.status_code == 201
+    from src.app.services.outbox import dispatch_outbox
+
+    dispatch_outbox(client.application)
     assert captured["subscription"]["endpoint"] == "https://push.example.com/device-1"
     assert captured["payload"] == {
         "title": "Entry saved",
@@ -184,6 +195,9 @@ def test_create_entry_skips_native_push_confirmation_without_subscription(
         json={"type": "wee", "client_event_id": "evt-push-confirm-2"},
     )
     assert response.status_code == 201
+    from src.app.services.outbox import dispatch_outbox
+
+    dispatch_outbox(client.application)
     assert called["count"] == 0
 
 
@@ -212,6 +226,9 @@ def test_create_entry_removes_invalid_push_subscription(client, monkeypatch):
         json={"type": "poo", "client_event_id": "evt-push-confirm-3"},
     )
     assert response.status_code == 201
+    from src.app.services.outbox import dispatch_outbox
+
+    dispatch_outbox(client.application)
 
     follow_up = client.get("/api/push/subscription?user_slug=suz")
     assert follow_up.status_code == 200
@@ -253,6 +270,9 @@ def test_create_entry_route_sends_confirmation_for_payload_user_slug(
         },
     )
     assert response.status_code == 201
+    from src.app.services.outbox import dispatch_outbox
+
+    dispatch_outbox(client.application)
     assert captured["subscription"]["endpoint"] == "https://push.example.com/device-2"
     assert captured["payload"]["body"] == "Sleep logged for rob"
 
@@ -616,6 +636,7 @@ def test_entries_llm_summary_uses_prompt_file_override(client, monkeypatch, tmp_
     monkeypatch.setattr(llm_summary_module.urllib_request, "urlopen", fake_urlopen)
     monkeypatch.setenv("BABY_TRACKER_OPENAI_API_KEY", "test-openai-key")
     monkeypatch.setenv("BABY_TRACKER_LLM_SUMMARY_PROMPT_PATH", str(prompt_path))
+    monkeypatch.setenv("BABY_TRACKER_LLM_SUMMARY_PROMPT_ENCODING", "json")
 
     client.post(
         "/api/users/suz/entries",
@@ -743,12 +764,14 @@ def test_entries_llm_summary_without_user_slug_includes_all_visible_day_events(
 
     assert response.status_code == 200
     prompt = captured["payload"]["messages"][1]["content"]
-    assert '"event_count": 2' in prompt
-    assert '"total_feed_ml": 150.0' in prompt
-    assert '"amount_total_ml": 90.0' in prompt
-    assert '"formula_total_ml": 60.0' in prompt
-    assert '"user_slug": "suz"' in prompt
-    assert '"user_slug": "rob"' in prompt
+    assert '"event_count":2' in prompt
+    assert '"total_feed_ml":150.0' in prompt
+    assert '"amount_total_ml":90.0' in prompt
+    assert '"formula_total_ml":60.0' in prompt
+    assert "users: u1=suz u2=rob" in prompt
+    assert "time|user|type|amount_ml|formula_ml" in prompt
+    assert "+8:00|u1|feed|90|" in prompt
+    assert "+9:00|u2|feed||60" in prompt
 
 
 def test_entries_llm_summary_skips_openai_without_selected_day_events(client, monkeypatch):
@@ -778,6 +801,77 @@ def test_entries_llm_summary_skips_openai_without_selected_day_events(client, mo
     assert called["count"] == 0
 
 
+def test_entries_llm_summary_caches_results_until_entries_change(client, monkeypatch):
+    calls: list[str] = []
+
+    class DummyResponse:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, exc_type, exc_value, traceback):
+            return False
+
+        def read(self):
+            content = {
+                "headline": f"Handover {len(calls)}",
+                "selected_day": ["One feed."],
+                "comparison_to_previous_7_days": ["Similar to last week."],
+                "follow_up": ["None."],
+            }
+            return json.dumps(
+                {"choices": [{"message": {"content": json.dumps(content)}}]}
+            ).encode("utf-8")
+
+    def fake_urlopen(req, timeout=0):
+        calls.append(json.loads(req.data.decode("utf-8"))["messages"][1]["content"])
+        return DummyResponse()
+
+    from src.app.services import llm_summary as llm_summary_module
+
+    monkeypatch.setattr(llm_summary_module.urllib_request, "urlopen", fake_urlopen)
+    monkeypatch.setenv("BABY_TRACKER_OPENAI_API_KEY", "test-openai-key")
+
+    created = client.post(
+        "/api/users/suz/entries",
+        json={
+            "type": "feed",
+            "client_event_id": "evt-llm-cache",
+            "timestamp_utc": "2024-01-01T08:00:00+00:00",
+            "amount_ml": 90,
+        },
+    ).get_json()
+    window = {
+        "user_slug": "suz",
+        "since_utc": "2024-01-01T00:00:00+00:00",
+        "until_utc": "2024-01-01T23:59:59+00:00",
+    }
+
+    first = client.post("/api/entries/llm-summary", json=window).get_json()
+    second = client.post("/api/entries/llm-summary", json=window).get_json()
+
+    assert first["cache"] == "miss"
+    assert second["cache"] == "hit"
+    assert second["summary"] == first["summary"]
+    assert second["generated_at_utc"] == first["generated_at_utc"]
+    assert len(calls) == 1
+
+    other_user = client.post(
+        "/api/entries/llm-summary", json={**window, "user_slug": "rob"}
+    ).get_json()
+    assert other_user["skipped"] is True
+
+    updated = client.patch(
+        f"/api/entries/{created['id']}",
+        json={"amount_ml": 120},
+    )
+    assert updated.status_code == 200
+
+    third = client.post("/api/entries/llm-summary", json=window).get_json()
+    assert third["cache"] == "miss"
+    assert third["summary"].startswith("## Handover 2")
+    assert len(calls) == 2
+
+
 def test_entries_llm_summary_requires_openai_api_key(client, monkeypatch):
     from src.app.services import llm_summary as llm_summary_module
 
@@ -1076,6 +1170,7 @@ def test_import_csv_entries(client):
     assert response.status_code == 201
     payload = response.get_json()
     assert payload["created"] == 2
+    assert payload["duplicates"] == 0
 
     feed_response = client.get("/api/entries?type=feed")
     assert feed_response.status_code == 200
@@ -1163,3 +1258,458 @@ def test_export_entries_csv_includes_feed_amounts(client):
     assert rows_by_id["evt-export-1"]["formula_ml"] == "20.0"
     assert rows_by_id["evt-export-1"]["deleted_at_utc"] == ""
     assert rows_by_id["evt-export-2"]["user_slug"] == "rob"
+
+
+def test_export_entries_streams_in_batches(client, monkeypatch):
+    from src.app.storage import entries as entries_storage
+
+    original = entries_storage.iter_entries_for_export
+
+    def small_batches(conn, **kwargs):
+        return original(conn, batch_size=2, **kwargs)
+
+    monkeypatch.setattr(
+        "src.app.services.entries.repo_iter_entries_for_export", small_batches
+    )
+    for index in range(5):
+        client.post(
+            "/api/users/suz/entries",
+            json={
+                "type": "wee",
+                "client_event_id": f"evt-stream-{index}",
+                "timestamp_utc": f"2024-02-01T0{index}:00:00+00:00",
+            },
+        )
+
+    response = client.get("/api/entries/export")
+
+    assert response.status_code == 200
+    assert response.is_streamed
+    chunks = list(response.response)
+    assert len(chunks) == 4
+    rows = list(csv.reader(io.StringIO(b"".join(chunks).decode("utf-8"))))
+    assert [row[4] for row in rows[1:]] == [
+        f"evt-stream-{index}" for index in range(5)
+    ]
+
+
+def test_export_entries_supports_gzip(client):
+    client.post(
+        "/api/users/suz/entries",
+        json={"type": "feed", "client_event_id": "evt-export-gzip", "amount_ml": 50},
+    )
+
+    plain = client.get("/api/entries/export")
+    compressed = client.get(
+        "/api/entries/export", headers={"Accept-Encoding": "gzip"}
+    )
+
+    assert compressed.status_code == 200
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert compressed.headers["Vary"] == "Accept-Encoding"
+    assert "Content-Encoding" not in plain.headers
+    assert gzip.decompress(compressed.get_data()) == plain.get_data()
+
+
+def test_list_entries_keyset_pages_cover_identical_timestamps(client):
+    for index in range(7):
+        client.post(
+            "/api/users/suz/entries",
+            json={
+                "type": "feed",
+                "client_event_id": f"evt-page-{index}",
+                "timestamp_utc": "2024-03-01T08:00:00+00:00",
+            },
+        )
+    client.post(
+        "/api/users/suz/entries",
+        json={
+            "type": "wee",
+            "client_event_id": "evt-page-latest",
+            "timestamp_utc": "2024-03-01T09:00:00+00:00",
+        },
+    )
+
+    seen: list[str] = []
+    cursor = None
+    pages = 0
+    while True:
+        params = {"limit": 3, "cursor": cursor} if cursor else {"limit": 3}
+        params.setdefault("paginate", 1)
+        response = client.get("/api/entries", query_string=params)
+        assert response.status_code == 200
+        page = response.get_json()
+        seen.extend(entry["client_event_id"] for entry in page["entries"])
+        pages += 1
+        if not page["has_more"]:
+            assert page["next_cursor"] is None
+            break
+        cursor = page["next_cursor"]
+
+    assert pages == 3
+    assert seen[0] == "evt-page-latest"
+    assert sorted(seen[1:]) == [f"evt-page-{index}" for index in range(7)]
+    assert len(seen) == len(set(seen))
+
+
+def test_list_entries_rejects_invalid_cursor(client):
+    response = client.get("/api/entries?cursor=not-a-cursor")
+    assert response.status_code == 400
+    assert response.get_json()["error"] == "Invalid cursor"
+
+
+def test_daily_rollups_summarise_entries_by_day(client):
+    for index, (timestamp, amount) in enumerate(
+        [
+            ("2024-04-01T08:00:00+00:00", 100),
+            ("2024-04-01T12:00:00+00:00", 80),
+            ("2024-04-02T08:00:00+00:00", 60),
+        ]
+    ):
+        client.post(
+            "/api/users/suz/entries",
+            json={
+                "type": "feed",
+                "client_event_id": f"evt-rollup-{index}",
+                "timestamp_utc": timestamp,
+                "amount_ml": amount,
+            },
+        )
+
+    response = client.get("/api/entries/daily-rollups?type=feed&since=2024-04-01")
+    assert response.status_code == 200
+    payload = response.get_json()
+    assert payload["count"] == 2
+    assert [
+        (day["day_utc"], day["entry_count"], day["amount_ml"])
+        for day in payload["days"]
+    ] == [("2024-04-01", 2, 180), ("2024-04-02", 1, 60)]
+
+    entry_id = client.get("/api/entries?type=feed&limit=1").get_json()[0]["id"]
+    assert client.delete(f"/api/entries/{entry_id}").status_code == 204
+    days = client.get("/api/entries/daily-rollups?type=feed").get_json()["days"]
+    assert [day["entry_count"] for day in days] == [2]
+
+
+def test_daily_rollups_reject_invalid_day(client):
+    response = client.get("/api/entries/daily-rollups?since=yesterday")
+    assert response.status_code == 400
+    assert response.get_json()["error"] == "Invalid day"
+
+
+def test_aggregate_entries_groups_by_bucket(client):
+    for index, (timestamp, amount) in enumerate(
+        [
+            ("2024-05-01T08:10:00+00:00", 100),
+            ("2024-05-01T08:50:00+00:00", 80),
+            ("2024-05-01T11:00:00+00:00", 60),
+        ]
+    ):
+        client.post(
+            "/api/users/suz/entries",
+            json={
+                "type": "feed",
+                "client_event_id": f"evt-aggregate-{index}",
+                "timestamp_utc": timestamp,
+                "amount_ml": amount,
+            },
+        )
+
+    response = client.get(
+        "/api/entries/aggregate?bucket=hour&type=feed&user_slug=suz"
+        "&since=2024-05-01T00:00:00%2B00:00"
+    )
+    assert response.status_code == 200
+    payload = response.get_json()
+    assert payload["bucket"] == "hour"
+    assert [
+        (row["bucket_start_utc"], row["entry_count"], row["total_ml"])
+        for row in payload["buckets"]
+    ] == [
+        ("2024-05-01T08:00:00+00:00", 2, 180),
+        ("2024-05-01T11:00:00+00:00", 1, 60),
+    ]
+
+    response = client.get(
+        "/api/entries/aggregate?bucket=day&type=feed&tz_offset_min=-600"
+    )
+    assert response.status_code == 200
+    assert [
+        (row["bucket_start_utc"], row["entry_count"])
+        for row in response.get_json()["buckets"]
+    ] == [
+        ("2024-04-30T10:00:00+00:00", 2),
+        ("2024-05-01T10:00:00+00:00", 1),
+    ]
+
+    response = client.get("/api/entries/aggregate?bucket=fortnight")
+    assert response.status_code == 400
+    assert response.get_json()["error"] == "Invalid bucket"
+
+
+def _read_sse(response) -> list[tuple[float, str, dict]]:
+    started = time.perf_counter()
+    events = []
+    buffer = ""
+    for chunk in response.response:
+        buffer += chunk.decode("utf-8") if isinstance(chunk, bytes) else chunk
+        while "\n\n" in buffer:
+            block, buffer = buffer.split("\n\n", 1)
+            fields = dict(line.split(": ", 1) for line in block.splitlines())
+            elapsed = time.perf_counter() - started
+            events.append((elapsed, fields["event"], json.loads(fields["data"])))
+    return events
+
+
+def test_entries_llm_summary_stream_forwards_sections_before_completion(
+    client, fake_openai_service
+):
+    fake_openai_service.delay_seconds = 0.1
+    client.post(
+        "/api/users/suz/entries",
+        json={
+            "type": "feed",
+            "client_event_id": "evt-llm-stream",
+            "timestamp_utc": "2024-01-01T08:00:00+00:00",
+            "amount_ml": 90,
+        },
+    )
+    window = {
+        "user_slug": "suz",
+        "since_utc": "2024-01-01T00:00:00+00:00",
+        "until_utc": "2024-01-01T23:59:59+00:00",
+    }
+
+    response = client.post(
+        "/api/entries/llm-summary/stream", json=window, buffered=False
+    )
+    assert response.status_code == 200
+    assert response.mimetype == "text/event-stream"
+    events = _read_sse(response)
+
+    sections = [data for _, name, data in events if name == "section"]
+    assert sections[0] == {"section": "headline", "text": "Steady day"}
+    assert [section["section"] for section in sections] == [
+        "headline",
+        "selected_day",
+        "selected_day",
+        "comparison_to_previous_7_days",
+        "follow_up",
+    ]
+    first_at = events[0][0]
+    finished_at, name, summary = events[-1]
+    assert name == "summary"
+    assert first_at < 0.5
+    assert finished_at - first_at > 0.5
+    assert summary["cache"] == "miss"
+    assert summary["event_count"] == 1
+    assert summary["summary"].startswith("## Steady day\n\n### Selected day")
+    assert fake_openai_service.requests[0]["stream"] is True
+
+    cached = _read_sse(
+        client.post("/api/entries/llm-summary/stream", json=window, buffered=False)
+    )
+    assert [data for _, name, data in cached if name == "section"] == sections
+    assert cached[-1][2]["cache"] == "hit"
+    assert cached[-1][2]["summary"] == summary["summary"]
+    assert len(fake_openai_service.requests) == 1
+
+
+def test_entries_llm_summary_stream_reports_provider_errors(
+    client, fake_openai_service
+):
+    fake_openai_service.status = 500
+    client.post(
+        "/api/users/suz/entries",
+        json={
+            "type": "wee",
+            "client_event_id": "evt-llm-stream-error",
+            "timestamp_utc": "2024-01-01T08:00:00+00:00",
+        },
+    )
+
+    invalid = client.post(
+        "/api/entries/llm-summary/stream",
+        json={"since_utc": "2024-01-02T00:00:00+00:00", "until_utc": "bad"},
+    )
+    assert invalid.status_code == 400
+
+    response = client.post(
+        "/api/entries/llm-summary/stream",
+        json={
+            "since_utc": "2024-01-01T00:00:00+00:00",
+            "until_utc": "2024-01-01T23:59:59+00:00",
+        },
+        buffered=False,
+    )
+    events = _read_sse(response)
+    assert [(name, data) for _, name, data in events] == [
+        ("error", {"error": "OpenAI returned HTTP 500", "status": 502})
+    ]
+
+
+def _post_llm_summary_entry(client, client_event_id: str) -> dict:
+    client.post(
+        "/api/users/suz/entries",
+        json={
+            "type": "feed",
+            "client_event_id": client_event_id,
+            "timestamp_utc": "2024-01-01T08:00:00+00:00",
+            "amount_ml": 90,
+        },
+    )
+    return {
+        "user_slug": "suz",
+        "since_utc": "2024-01-01T00:00:00+00:00",
+        "until_utc": "2024-01-01T23:59:59+00:00",
+    }
+
+
+def test_entries_llm_summary_uses_ollama_provider(client, fake_ollama_service):
+    settings = client.patch(
+        "/api/settings",
+        json={
+            "llm_provider": "ollama",
+            "ollama_base_url": fake_ollama_service.base_url,
+            "ollama_model": "gemma4:latest",
+            "ollama_thinking_enabled": True,
+        },
+    )
+    assert settings.status_code == 200
+    window = _post_llm_summary_entry(client, "evt-llm-ollama")
+
+    payload = client.post("/api/entries/llm-summary", json=window).get_json()
+    assert payload["provider"] == "ollama"
+    assert payload["model"] == "gemma4:latest"
+    assert payload["fallback"] is False
+    assert payload["summary"].startswith("## Steady day")
+    request_body = fake_ollama_service.requests[0]
+    assert request_body["model"] == "gemma4:latest"
+    assert request_body["stream"] is False
+    assert request_body["format"] == "json"
+    assert request_body["think"] is True
+    assert "comparison_to_previous_7_days" in request_body["messages"][1]["content"]
+
+    events = _read_sse(
+        client.post(
+            "/api/entries/llm-summary/stream",
+            json={**window, "until_utc": "2024-01-01T23:00:00+00:00"},
+            buffered=False,
+        )
+    )
+    assert events[0][1:] == ("section", {"section": "headline", "text": "Steady day"})
+    assert events[-1][2]["provider"] == "ollama"
+    assert fake_ollama_service.requests[1]["stream"] is True
+
+    metrics = client.get("/api/entries/llm-summary/providers").get_json()
+    assert metrics["provider"] == "ollama"
+    assert metrics["fallback_provider"] is None
+    [ollama] = metrics["providers"]
+    assert ollama["provider"] == "ollama"
+    assert ollama["model"] == "gemma4:latest"
+    assert ollama["success_count"] == 2
+    assert ollama["failure_count"] == 0
+    assert isinstance(ollama["avg_latency_ms"], int)
+    assert isinstance(ollama["last_first_chunk_ms"], int)
+
+
+def test_entries_llm_summary_falls_back_when_primary_provider_fails(
+    client, fake_ollama_service, fake_openai_service
+):
+    fake_ollama_service.status = 500
+    client.patch(
+        "/api/settings",
+        json={
+            "llm_provider": "ollama",
+            "llm_fallback_provider": "openai",
+            "ollama_base_url": fake_ollama_service.base_url,
+        },
+    )
+    window = _post_llm_summary_entry(client, "evt-llm-fallback")
+
+    first = client.post("/api/entries/llm-summary", json=window).get_json()
+    assert first["provider"] == "openai"
+    assert first["fallback"] is True
+    assert first["cache"] == "miss"
+
+    second = client.post("/api/entries/llm-summary", json=window).get_json()
+    assert second["cache"] == "hit"
+    assert second["provider"] == "openai"
+    assert len(fake_ollama_service.requests) == 1
+    assert len(fake_openai_service.requests) == 1
+
+    fake_ollama_service.close()
+    events = _read_sse(
+        client.post(
+            "/api/entries/llm-summary/stream",
+            json={**window, "until_utc": "2024-01-01T23:00:00+00:00"},
+            buffered=False,
+        )
+    )
+    assert [name for _, name, _ in events][-1] == "summary"
+    assert events[-1][2]["provider"] == "openai"
+    assert events[-1][2]["fallback"] is True
+
+    metrics = {
+        row["provider"]: row
+        for row in client.get("/api/entries/llm-summary/providers").get_json()[
+            "providers"
+        ]
+    }
+    assert metrics["ollama"]["failure_count"] == 2
+    assert metrics["ollama"]["success_count"] == 0
+    assert metrics["ollama"]["avg_latency_ms"] is None
+    assert metrics["ollama"]["last_error"] == "Ollama is unavailable"
+    assert metrics["openai"]["success_count"] == 2
+    assert metrics["openai"]["fallback_count"] == 2
+    assert metrics["openai"]["last_error"] is None
+
+
+def test_entries_llm_summary_falls_back_when_primary_response_is_truncated(
+    client, fake_ollama_service, fake_openai_service
+):
+    fake_ollama_service.truncate = True
+    client.patch(
+        "/api/settings",
+        json={
+            "llm_provider": "ollama",
+            "llm_fallback_provider": "openai",
+            "ollama_base_url": fake_ollama_service.base_url,
+        },
+    )
+    window = _post_llm_summary_entry(client, "evt-llm-truncated")
+
+    response = client.post("/api/entries/llm-summary", json=window)
+    assert response.status_code == 200
+    payload = response.get_json()
+    assert payload["provider"] == "openai"
+    assert payload["fallback"] is True
+
+    metrics = {
+        row["provider"]: row
+        for row in client.get("/api/entries/llm-summary/providers").get_json()[
+            "providers"
+        ]
+    }
+    assert metrics["ollama"]["last_error"] == "Ollama returned an incomplete response"
+
+
+def test_entries_llm_summary_reports_primary_error_when_all_providers_fail(
+    client, fake_ollama_service, monkeypatch
+):
+    monkeypatch.delenv("BABY_TRACKER_OPENAI_API_KEY", raising=False)
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    fake_ollama_service.status = 404
+    client.patch(
+        "/api/settings",
+        json={
+            "llm_provider": "ollama",
+            "llm_fallback_provider": "openai",
+            "ollama_base_url": fake_ollama_service.base_url,
+        },
+    )
+    window = _post_llm_summary_entry(client, "evt-llm-all-fail")
+
+    response = client.post("/api/entries/llm-summary", json=window)
+    assert response.status_code == 502
+    assert response.get_json() == {"error": "Ollama returned HTTP 404"}
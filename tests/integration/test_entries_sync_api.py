@@ -83,3 +83,122 @@ def test_sync_rejects_invalid_entry_timestamp(client):
     assert response.status_code == 400
     payload = response.get_json()
     assert payload["error"] == "timestamp_utc must be ISO-8601"
+
+
+def _upsert(client_event_id: str, **fields) -> dict:
+    return {
+        "action": "upsert",
+        "entry": {
+            "user_slug": "suz",
+            "type": "feed",
+            "client_event_id": client_event_id,
+            "timestamp_utc": "2024-01-01T00:00:00+00:00",
+            **fields,
+        },
+    }
+
+
+def test_sync_reports_per_change_results(client):
+    client.post(
+        "/api/sync/entries",
+        json={"device_id": "dev-3", "changes": [_upsert("evt-sync-existing")]},
+    )
+
+    response = client.post(
+        "/api/sync/entries",
+        json={
+            "device_id": "dev-3",
+            "changes": [
+                _upsert("evt-sync-existing", amount_ml=60),
+                _upsert("evt-sync-new"),
+                {"action": "delete", "client_event_id": "evt-sync-new"},
+                {"action": "delete", "client_event_id": "evt-sync-missing"},
+            ],
+        },
+    )
+
+    assert response.status_code == 200
+    results = response.get_json()["results"]
+    assert [(r["index"], r["client_event_id"], r["status"]) for r in results] == [
+        (0, "evt-sync-existing", "updated"),
+        (1, "evt-sync-new", "created"),
+        (2, "evt-sync-new", "deleted"),
+        (3, "evt-sync-missing", "unchanged"),
+    ]
+    entries = client.get("/api/entries").get_json()
+    assert [entry["client_event_id"] for entry in entries] == ["evt-sync-existing"]
+    assert entries[0]["amount_ml"] == 60
+
+
+def test_sync_reports_created_once_for_repeated_new_upserts(client):
+    response = client.post(
+        "/api/sync/entries",
+        json={
+            "device_id": "dev-5",
+            "changes": [
+                _upsert("evt-sync-twice"),
+                _upsert("evt-sync-twice", amount_ml=45),
+                _upsert("evt-sync-other"),
+            ],
+        },
+    )
+
+    assert response.status_code == 200
+    results = response.get_json()["results"]
+    assert [(r["client_event_id"], r["status"]) for r in results] == [
+        ("evt-sync-twice", "created"),
+        ("evt-sync-twice", "updated"),
+        ("evt-sync-other", "created"),
+    ]
+    assert results[0]["id"] == results[1]["id"]
+    entries = {
+        entry["client_event_id"]: entry for entry in client.get("/api/entries").get_json()
+    }
+    assert entries["evt-sync-twice"]["amount_ml"] == 45
+
+
+def test_sync_rejects_whole_batch_on_invalid_change(client):
+    response = client.post(
+        "/api/sync/entries",
+        json={
+            "device_id": "dev-4",
+            "changes": [
+                _upsert("evt-sync-atomic-1"),
+                _upsert("evt-sync-atomic-2", amount_ml=-5),
+            ],
+        },
+    )
+
+    assert response.status_code == 400
+    payload = response.get_json()
+    assert payload["error"] == "amount_ml must be a non-negative number"
+    assert payload["results"] == [
+        {"index": 0, "status": "skipped"},
+        {
+            "index": 1,
+            "status": "rejected",
+            "error": "amount_ml must be a non-negative number",
+        },
+    ]
+    assert client.get("/api/entries").get_json() == []
+
+
+def test_sync_upserts_large_outbox_in_batches(client):
+    changes = [
+        _upsert(
+            f"evt-sync-bulk-{index}",
+            timestamp_utc=f"2024-01-01T{index % 24:02d}:00:00+00:00",
+        )
+        for index in range(120)
+    ]
+
+    response = client.post(
+        "/api/sync/entries", json={"device_id": "dev-5", "changes": changes}
+    )
+
+    assert response.status_code == 200
+    results = response.get_json()["results"]
+    assert len(results) == 120
+    assert {result["status"] for result in results} == {"created"}
+    entries = client.get("/api/entries?limit=500").get_json()
+    assert len(entries) == 120
@@ -166,6 +166,9 @@ def test_feed_log_sends_native_push_confirmation(client, monkeypatch):
 
     response = client.post("/api/feed/log", json={"amount": 110, "user_slug": "suz"})
     assert response.status_code == 201
+    from src.app.services.outbox import dispatch_outbox
+
+    dispatch_outbox(client.application)
     assert (
         captured["subscription"]["endpoint"] == "https://push.example.com/device-feed"
     )
@@ -203,4 +206,7 @@ def test_sleep_start_sends_native_push_confirmation(client, monkeypatch):
 
     response = client.post("/api/sleep/start", json={"user_slug": "rob"})
     assert response.status_code == 201
+    from src.app.services.outbox import dispatch_outbox
+
+    dispatch_outbox(client.application)
     assert captured["payload"]["body"] == "Sleep logged for rob"
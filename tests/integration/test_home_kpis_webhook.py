@@ -48,6 +48,19 @@ def test_entry_creation_sends_home_kpis_webhook(client, monkeypatch):
         },
     )
     assert response.status_code == 201
+    from src.app.services import outbox as outbox_module
+    from src.app.services.outbox import dispatch_outbox
+
+    assert dispatch_outbox(client.application)["claimed"] == 2
+    assert "url" not in captured
+
+    coalesce_seconds = client.application.config["HOME_KPIS_COALESCE_SECONDS"]
+    monkeypatch.setattr(
+        outbox_module,
+        "_now_utc",
+        lambda: datetime.now(timezone.utc) + timedelta(seconds=coalesce_seconds),
+    )
+    dispatch_outbox(client.application)
 
     assert captured["url"] == "https://example.com/home-kpis"
     assert captured["content_type"] == "application/json"
@@ -62,3 +75,63 @@ def test_entry_creation_sends_home_kpis_webhook(client, monkeypatch):
             "input3": "Goal % (24h): --",
         },
     }
+
+
+def test_entry_bursts_coalesce_into_one_home_kpis_webhook(client, monkeypatch):
+    from src.app.services import home_kpis as home_kpis_module
+    from src.app.services import outbox as outbox_module
+    from src.app.services.outbox import dispatch_outbox
+
+    sent = []
+    monkeypatch.setattr(
+        home_kpis_module,
+        "_send_home_kpis",
+        lambda url, payload: sent.append(payload) or True,
+    )
+    clock = {"now": datetime.now(timezone.utc)}
+    monkeypatch.setattr(outbox_module, "_now_utc", lambda: clock["now"])
+
+    settings_response = client.patch(
+        "/api/settings",
+        json={"home_kpis_webhook_url": "https://example.com/home-kpis"},
+    )
+    assert settings_response.status_code == 200
+
+    for index, entry_type in enumerate(["wee", "poo", "feed"]):
+        response = client.post(
+            "/api/users/suz/entries",
+            json={
+                "type": entry_type,
+                "client_event_id": f"evt-home-kpis-burst-{index}",
+                "timestamp_utc": clock["now"].isoformat(),
+            },
+        )
+        assert response.status_code == 201
+        clock["now"] += timedelta(seconds=5)
+
+    clock["now"] += timedelta(
+        seconds=client.application.config["HOME_KPIS_COALESCE_SECONDS"]
+    )
+    dispatch_outbox(client.application)
+    assert len(sent) == 1
+
+    response = client.post(
+        "/api/users/suz/entries",
+        json={
+            "type": "wee",
+            "client_event_id": "evt-home-kpis-burst-3",
+            "timestamp_utc": clock["now"].isoformat(),
+        },
+    )
+    assert response.status_code == 201
+    clock["now"] += timedelta(
+        seconds=client.application.config["HOME_KPIS_COALESCE_SECONDS"]
+    )
+    dispatch_outbox(client.application)
+    assert len(sent) == 1
+
+    stats = client.get("/api/home-kpis/deliveries").get_json()
+    assert stats["webhook_url"] == "https://example.com/home-kpis"
+    assert stats["sent_count"] == 1
+    assert stats["skipped_count"] == 1
+    assert stats["failed_count"] == 0
@@ -0,0 +1,114 @@
+import time
+
+import pytest
+
+from src.app.services.push_delivery import (
+    PUSH_MAX_WORKERS,
+    deliver_web_pushes,
+    summarize_push_results,
+)
+from src.app.services.push_subscriptions import (
+    build_push_payload,
+    get_push_session_pool,
+    send_web_push,
+)
+
+
+@pytest.fixture(autouse=True)
+def _close_push_sessions():
+    yield
+    get_push_session_pool().close()
+
+
+def _messages(fake_push_service, user_slugs: list[str]) -> list[tuple[dict, dict]]:
+    return [
+        (
+            fake_push_service.subscription(user_slug),
+            build_push_payload(
+                title="Feed due",
+                body="Time for a feed.",
+                url=f"/{user_slug}",
+                tag=f"feed-due-{user_slug}",
+            ),
+        )
+        for user_slug in user_slugs
+    ]
+
+
+def test_fan_out_reuses_keep_alive_connections(fake_push_service, vapid_config):
+    user_slugs = [f"user{index}" for index in range(12)]
+
+    first = deliver_web_pushes(_messages(fake_push_service, user_slugs), vapid_config)
+    second = deliver_web_pushes(_messages(fake_push_service, user_slugs), vapid_config)
+
+    assert summarize_push_results(first + second) == {
+        "sent": 24,
+        "invalid_subscription": 0,
+        "push_failed": 0,
+    }
+    assert len(fake_push_service.requests) == 24
+    request = fake_push_service.requests[0]
+    assert request["headers"]["authorization"].startswith("vapid t=")
+    assert request["headers"]["content-encoding"] == "aes128gcm"
+    ports = {request["client_port"] for request in fake_push_service.requests}
+    assert len(ports) <= PUSH_MAX_WORKERS
+
+
+def test_fan_out_sends_in_parallel_and_keeps_result_order(
+    fake_push_service, vapid_config
+):
+    fake_push_service.delay_seconds = 0.5
+    fake_push_service.statuses["/push/gone"] = 410
+    fake_push_service.statuses["/push/broken"] = 500
+
+    started = time.monotonic()
+    results = deliver_web_pushes(
+        _messages(fake_push_service, ["ok", "gone", "broken", "also-ok"]),
+        vapid_config,
+    )
+    elapsed = time.monotonic() - started
+
+    assert results == [
+        {"sent": True},
+        {"sent": False, "reason": "invalid_subscription"},
+        {"sent": False, "reason": "push_failed"},
+        {"sent": True},
+    ]
+    assert elapsed < 1.5
+
+
+def test_send_times_out_as_push_failed(fake_push_service, vapid_config):
+    fake_push_service.delay_seconds = 1.0
+    ((subscription, payload),) = _messages(fake_push_service, ["slow"])
+
+    started = time.monotonic()
+    result = send_web_push(subscription, payload, vapid_config, timeout=0.2)
+
+    assert result == {"sent": False, "reason": "push_failed"}
+    assert time.monotonic() - started < 1.0
+
+
+def test_vapid_headers_are_signed_once_per_audience(
+    fake_push_service, vapid_config, monkeypatch
+):
+    assert vapid_config.signer is not None
+    signed: list[str] = []
+    original_sign = vapid_config.signer.sign
+
+    def counting_sign(claims):
+        signed.append(claims["aud"])
+        return original_sign(claims)
+
+    monkeypatch.setattr(vapid_config.signer, "sign", counting_sign)
+
+    results = deliver_web_pushes(
+        _messages(fake_push_service, [f"user{index}" for index in range(8)]),
+        vapid_config,
+    )
+
+    assert all(result["sent"] for result in results)
+    assert signed == [fake_push_service.url]
+    tokens = {
+        request["headers"]["authorization"] for request in fake_push_service.requests
+    }
+    assert len(tokens) == 1
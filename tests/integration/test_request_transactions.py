@@ -0,0 +1,56 @@
+from flask import abort, jsonify
+
+from src.app.services.entries import create_entry, list_entries
+from src.app.services.settings import get_settings, update_settings
+
+
+def _create_feed(db_path: str, client_event_id: str) -> dict:
+    return create_entry(
+        db_path,
+        {
+            "type": "feed",
+            "user_slug": "suz",
+            "client_event_id": client_event_id,
+            "timestamp_utc": "2026-01-01T00:00:00+00:00",
+        },
+    )
+
+
+def test_request_discards_writes_when_view_aborts(app):
+    db_path = app.config["DB_PATH"]
+
+    @app.post("/test/write-then-abort")
+    def write_then_abort():
+        _create_feed(db_path, "evt-tx-abort")
+        update_settings(db_path, {"feed_interval_min": 33})
+        abort(409)
+
+    response = app.test_client().post("/test/write-then-abort")
+
+    assert response.status_code == 409
+    assert list_entries(db_path) == []
+    assert get_settings(db_path)["feed_interval_min"] != 33
+
+
+def test_request_discards_writes_when_view_returns_error(app):
+    db_path = app.config["DB_PATH"]
+
+    @app.post("/test/write-then-400")
+    def write_then_400():
+        _create_feed(db_path, "evt-tx-400")
+        return jsonify({"error": "rejected"}), 400
+
+    response = app.test_client().post("/test/write-then-400")
+
+    assert response.status_code == 400
+    assert list_entries(db_path) == []
+
+
+def test_request_keeps_writes_on_success(app, client):
+    response = client.post(
+        "/api/users/suz/entries",
+        json={"type": "feed", "client_event_id": "evt-tx-ok", "amount_ml": 90},
+    )
+
+    assert response.status_code == 201
+    assert len(list_entries(app.config["DB_PATH"])) == 1
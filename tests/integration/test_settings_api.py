@@ -22,6 +22,8 @@ def test_get_settings_defaults(client):
     assert payload["ollama_thinking_enabled"] is False
     assert payload["openai_model"] == "gpt-4.1-mini"
     assert payload["openai_timeout_seconds"] == 45
+    assert payload["llm_provider"] == "openai"
+    assert payload["llm_fallback_provider"] is None
 
 
 def test_patch_settings_updates_values(client):
@@ -190,3 +192,22 @@ def test_patch_settings_rejects_invalid_schedule_helper_fields(client):
         json={"behind_target_mode": "nope"},
     )
     assert response.status_code == 400
+
+
+def test_patch_settings_selects_llm_provider_and_fallback(client):
+    response = client.patch(
+        "/api/settings",
+        json={"llm_provider": "Ollama", "llm_fallback_provider": "openai"},
+    )
+    assert response.status_code == 200
+    payload = response.get_json()
+    assert payload["llm_provider"] == "ollama"
+    assert payload["llm_fallback_provider"] == "openai"
+    assert client.get("/api/settings").get_json()["llm_provider"] == "ollama"
+
+    cleared = client.patch("/api/settings", json={"llm_fallback_provider": None})
+    assert cleared.get_json()["llm_fallback_provider"] is None
+
+    invalid = client.patch("/api/settings", json={"llm_provider": "bard"})
+    assert invalid.status_code == 400
+    assert "llm_provider" in invalid.get_json()["error"]
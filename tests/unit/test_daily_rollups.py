@@ -0,0 +1,186 @@
+import sqlite3
+
+from src.app.storage import migrations as migrations_module
+from src.app.storage.daily_rollups import list_daily_rollups, rebuild_daily_rollups
+from src.app.storage.db import get_connection, init_db
+from src.app.storage.entries import (
+    create_entries,
+    create_entry,
+    delete_entries_by_client_event_id,
+    delete_entry,
+    update_entry,
+    upsert_entries_by_client_event_id,
+)
+
+NOW = "2026-01-03T00:00:00+00:00"
+
+
+def _payload(client_event_id: str, timestamp_utc: str, **fields) -> dict:
+    return {
+        "user_slug": "suz",
+        "type": "feed",
+        "timestamp_utc": timestamp_utc,
+        "client_event_id": client_event_id,
+        "created_at_utc": NOW,
+        "updated_at_utc": NOW,
+        **fields,
+    }
+
+
+def _rollup_rows(conn) -> list[dict]:
+    return [
+        dict(row)
+        for row in conn.execute(
+            "SELECT * FROM daily_rollups ORDER BY user_slug, type, day_utc"
+        ).fetchall()
+    ]
+
+
+def _assert_matches_rebuild(conn) -> list[dict]:
+    incremental = _rollup_rows(conn)
+    rebuild_daily_rollups(conn)
+    assert _rollup_rows(conn) == incremental
+    return incremental
+
+
+def test_rollups_follow_create_update_and_delete(tmp_path):
+    db_path = str(tmp_path / "rollups.sqlite")
+    init_db(db_path)
+
+    with get_connection(db_path) as conn:
+        first, _ = create_entry(
+            conn,
+            _payload(
+                "evt-roll-1",
+                "2026-01-01T08:00:00+00:00",
+                amount_ml=90,
+                feed_duration_min=15,
+            ),
+        )
+        create_entry(
+            conn,
+            _payload(
+                "evt-roll-2",
+                "2026-01-01T23:30:00-01:00",
+                expressed_ml=40,
+                formula_ml=20,
+            ),
+        )
+        create_entry(
+            conn,
+            _payload(
+                "evt-roll-3",
+                "2026-01-01T12:00:00+00:00",
+                type="sleep",
+                feed_duration_min=45,
+            ),
+        )
+        rows = _assert_matches_rebuild(conn)
+
+        assert [(row["type"], row["day_utc"], row["entry_count"]) for row in rows] == [
+            ("feed", "2026-01-01", 1),
+            ("feed", "2026-01-02", 1),
+            ("sleep", "2026-01-01", 1),
+        ]
+        assert rows[0]["amount_ml"] == 90
+        assert rows[0]["duration_min"] == 15
+        assert rows[0]["duration_count"] == 1
+        assert rows[1]["expressed_ml"] == 40
+        assert rows[1]["formula_ml"] == 20
+        assert rows[2]["duration_min"] == 45
+
+        update_entry(
+            conn,
+            first["id"],
+            {"timestamp_utc": "2026-01-02T06:00:00+00:00", "updated_at_utc": NOW},
+        )
+        rows = _assert_matches_rebuild(conn)
+        assert [(row["day_utc"], row["entry_count"]) for row in rows[:1]] == [
+            ("2026-01-02", 2)
+        ]
+
+        delete_entry(conn, first["id"], NOW, NOW)
+        rows = _assert_matches_rebuild(conn)
+        assert rows[0]["entry_count"] == 1
+        assert rows[0]["amount_ml"] == 0
+
+
+def test_rollups_follow_bulk_and_sync_writes(tmp_path):
+    db_path = str(tmp_path / "rollups.sqlite")
+    init_db(db_path)
+
+    with get_connection(db_path) as conn:
+        create_entries(
+            conn,
+            [
+                _payload(
+                    f"evt-bulk-{index}",
+                    f"2026-01-01T0{index}:00:00+00:00",
+                    amount_ml=10,
+                )
+                for index in range(5)
+            ],
+        )
+        upsert_entries_by_client_event_id(
+            conn,
+            [
+                _payload("evt-bulk-0", "2026-01-02T00:00:00+00:00", amount_ml=30),
+                _payload("evt-sync-1", "2026-01-02T01:00:00+00:00", type="wee"),
+            ],
+        )
+        delete_entries_by_client_event_id(conn, ["evt-bulk-1"], NOW, NOW)
+        rows = _assert_matches_rebuild(conn)
+        days = list_daily_rollups(conn, since_day="2026-01-02")
+
+    assert [(row["type"], row["day_utc"], row["entry_count"]) for row in rows] == [
+        ("feed", "2026-01-01", 3),
+        ("feed", "2026-01-02", 1),
+        ("wee", "2026-01-02", 1),
+    ]
+    assert rows[0]["amount_ml"] == 30
+    assert [(row["day_utc"], row["type"]) for row in days] == [
+        ("2026-01-02", "feed"),
+        ("2026-01-02", "wee"),
+    ]
+
+
+def test_daily_rollups_migration_backfills_existing_entries(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "legacy.sqlite")
+    monkeypatch.setattr(
+        migrations_module,
+        "MIGRATIONS",
+        [m for m in migrations_module.MIGRATIONS if m.version < 4],
+    )
+    monkeypatch.setattr(migrations_module, "LATEST_SCHEMA_VERSION", 3)
+    init_db(db_path)
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        """
+        INSERT INTO entries (
+            user_slug, type, timestamp_utc, client_event_id, created_at_utc,
+            updated_at_utc, amount_ml, timestamp_ms, updated_ms
+        ) VALUES ('suz', 'feed', '2026-01-01T10:00:00+00:00', 'evt-legacy',
+                  '2026-01-01T10:00:00+00:00', '2026-01-01T10:00:00+00:00', 120,
+                  1767261600000, 1767261600000)
+        """
+    )
+    conn.commit()
+    conn.close()
+    monkeypatch.undo()
+
+    init_db(db_path)
+    with get_connection(db_path) as conn:
+        rows = list_daily_rollups(conn)
+
+    assert rows == [
+        {
+            "day_utc": "2026-01-01",
+            "type": "feed",
+            "entry_count": 1,
+            "amount_ml": 120.0,
+            "expressed_ml": 0.0,
+            "formula_ml": 0.0,
+            "duration_min": 0.0,
+            "duration_count": 0,
+        }
+    ]
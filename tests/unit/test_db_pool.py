@@ -0,0 +1,162 @@
+import sqlite3
+import threading
+
+import pytest
+
+from src.app.storage import db as db_module
+from src.app.storage.db import (
+    ConnectionPool,
+    ConnectionPoolTimeout,
+    configure_connection_pool,
+    get_connection,
+    get_connection_pool,
+    init_db,
+)
+
+
+def _count_connects(monkeypatch) -> list[str]:
+    calls: list[str] = []
+    original = db_module._connect
+
+    def counting_connect(db_path: str) -> sqlite3.Connection:
+        calls.append(db_path)
+        return original(db_path)
+
+    monkeypatch.setattr(db_module, "_connect", counting_connect)
+    return calls
+
+
+def test_get_connection_reuses_pooled_connection(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "pool.sqlite")
+    init_db(db_path)
+    calls = _count_connects(monkeypatch)
+
+    with get_connection(db_path) as first:
+        first_id = id(first)
+    with get_connection(db_path) as second:
+        assert id(second) == first_id
+        assert second.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert second.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+
+    assert calls == [db_path]
+
+
+def test_pool_rolls_back_uncommitted_work_on_release(tmp_path):
+    db_path = str(tmp_path / "pool.sqlite")
+    init_db(db_path)
+
+    with get_connection_pool(db_path).connection() as conn:
+        conn.execute("DELETE FROM reminders")
+        assert conn.in_transaction
+
+    with get_connection(db_path) as conn:
+        assert not conn.in_transaction
+        count = conn.execute("SELECT COUNT(*) FROM reminders").fetchone()[0]
+    assert count == 2
+
+
+def test_pool_limits_concurrent_checkouts(tmp_path):
+    pool = ConnectionPool(str(tmp_path / "pool.sqlite"), size=1, timeout_seconds=0.05)
+    held = pool.acquire()
+
+    with pytest.raises(ConnectionPoolTimeout):
+        pool.acquire()
+
+    pool.release(held)
+    again = pool.acquire()
+    assert again is held
+    pool.release(again)
+    pool.close()
+
+
+def test_pool_hands_connection_to_waiting_thread(tmp_path):
+    pool = ConnectionPool(str(tmp_path / "pool.sqlite"), size=1, timeout_seconds=2)
+    held = pool.acquire()
+    acquired: list[sqlite3.Connection] = []
+
+    def worker():
+        conn = pool.acquire()
+        acquired.append(conn)
+        pool.release(conn)
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    pool.release(held)
+    thread.join(timeout=2)
+
+    assert acquired == [held]
+    pool.close()
+
+
+def test_pool_recycles_connection_after_database_error(tmp_path):
+    pool = ConnectionPool(str(tmp_path / "pool.sqlite"), size=2)
+
+    with pytest.raises(sqlite3.OperationalError):
+        with pool.connection() as conn:
+            broken = conn
+            conn.execute("SELECT * FROM missing_table")
+
+    with pool.connection() as conn:
+        assert conn is not broken
+    status = pool.health_check()
+    assert status["recycled"] == 1
+    assert status["created"] == 2
+    pool.close()
+
+
+def test_pool_keeps_connection_after_integrity_error(tmp_path):
+    pool = ConnectionPool(str(tmp_path / "pool.sqlite"), size=1)
+    with pool.connection() as conn:
+        conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY)")
+        conn.execute("INSERT INTO items (id) VALUES (1)")
+        conn.commit()
+        first = conn
+
+    with pytest.raises(sqlite3.IntegrityError):
+        with pool.connection() as conn:
+            conn.execute("INSERT INTO items (id) VALUES (1)")
+
+    with pool.connection() as conn:
+        assert conn is first
+    pool.close()
+
+
+def test_health_check_discards_broken_idle_connections(tmp_path):
+    pool = ConnectionPool(str(tmp_path / "pool.sqlite"), size=2)
+    with pool.connection() as conn:
+        broken = conn
+    broken.close()
+
+    status = pool.health_check()
+
+    assert status["ok"] is True
+    assert status["recycled"] == 1
+    assert status["idle"] == 1
+    pool.close()
+
+
+def test_configure_connection_pool_updates_size(tmp_path):
+    db_path = str(tmp_path / "pool.sqlite")
+    pool = configure_connection_pool(db_path, size=2)
+
+    assert get_connection_pool(db_path) is pool
+    assert pool.size == 2
+    with pytest.raises(ValueError):
+        configure_connection_pool(db_path, size=0)
+
+
+def test_connection_pool_is_replaced_after_fork(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "pool.sqlite")
+    parent_pool = get_connection_pool(db_path)
+    monkeypatch.setattr(db_module.os, "getpid", lambda: parent_pool.pid + 1)
+
+    assert get_connection_pool(db_path) is not parent_pool
+
+
+def test_health_endpoint_reports_pool_status(client):
+    response = client.get("/api/health")
+
+    assert response.status_code == 200
+    payload = response.get_json()
+    assert payload["ok"] is True
+    assert payload["database"]["size"] == 4
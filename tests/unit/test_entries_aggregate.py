@@ -0,0 +1,153 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.app.services.entries import aggregate_entries, list_entries
+from src.app.services.home_kpis import _compute_feed_total
+from src.app.services.llm_summary import _build_day_stats
+from src.app.storage.db import get_connection, init_db
+from src.app.storage.entries import create_entry
+
+START = datetime(2026, 1, 5, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "aggregate.sqlite")
+    init_db(path)
+    with get_connection(path) as conn:
+        for index in range(72):
+            timestamp = START + timedelta(hours=5 * index, minutes=7)
+            entry_type = ("feed", "feed", "wee", "sleep", "poo", "feed")[index % 6]
+            payload = {
+                "user_slug": "suz" if index % 4 else "rob",
+                "type": entry_type,
+                "timestamp_utc": timestamp.isoformat(),
+                "client_event_id": f"evt-agg-{index}",
+                "created_at_utc": timestamp.isoformat(),
+                "updated_at_utc": timestamp.isoformat(),
+            }
+            if entry_type == "feed":
+                payload["amount_ml"] = 10 + index if index % 3 == 0 else None
+                payload["expressed_ml"] = 25.5 if index % 2 else None
+                payload["formula_ml"] = 40 if index % 5 else None
+                payload["feed_duration_min"] = 12 if index % 3 == 1 else None
+            if entry_type == "sleep":
+                payload["feed_duration_min"] = 30 + index
+            create_entry(conn, payload)
+    return path
+
+
+def _window_entries(db_path: str, since: datetime, until: datetime, **filters):
+    return list_entries(
+        db_path,
+        limit=1000,
+        since_utc=since.isoformat(),
+        until_utc=(until - timedelta(milliseconds=1)).isoformat(),
+        **filters,
+    )
+
+
+def test_daily_buckets_match_day_stats(db_path):
+    result = aggregate_entries(db_path, "day")
+    by_day: dict[str, dict[str, dict]] = {}
+    for row in result["buckets"]:
+        by_day.setdefault(row["bucket_start_utc"], {})[row["type"]] = row
+
+    assert result["bucket"] == "day"
+    assert len(by_day) == 15
+    for bucket_start, rows in by_day.items():
+        day_start = datetime.fromisoformat(bucket_start)
+        stats = _build_day_stats(
+            _window_entries(db_path, day_start, day_start + timedelta(days=1))
+        )
+        feed = rows.get("feed", {})
+        sleep = rows.get("sleep", {})
+        assert sum(row["entry_count"] for row in rows.values()) == stats["event_count"]
+        assert feed.get("entry_count", 0) == stats["feed_count"]
+        assert feed.get("total_ml", 0) == stats["total_feed_ml"]
+        assert feed.get("amount_ml", 0) == stats["amount_total_ml"]
+        assert feed.get("expressed_ml", 0) == stats["expressed_total_ml"]
+        assert feed.get("formula_ml", 0) == stats["formula_total_ml"]
+        assert rows.get("wee", {}).get("entry_count", 0) == stats["wee_count"]
+        assert rows.get("poo", {}).get("entry_count", 0) == stats["poo_count"]
+        assert sleep.get("entry_count", 0) == stats["sleep_count"]
+        assert sleep.get("duration_min", 0) == stats["sleep_total_min"]
+
+
+@pytest.mark.parametrize(
+    ("bucket", "span"),
+    [("hour", timedelta(hours=1)), ("week", timedelta(days=7))],
+)
+def test_feed_buckets_match_feed_total(db_path, bucket, span):
+    result = aggregate_entries(db_path, bucket, entry_type="feed", user_slug="suz")
+
+    assert result["count"] == len(result["buckets"])
+    assert all(row["type"] == "feed" for row in result["buckets"])
+    for row in result["buckets"]:
+        bucket_start = datetime.fromisoformat(row["bucket_start_utc"])
+        feeds = _window_entries(
+            db_path,
+            bucket_start,
+            bucket_start + span,
+            entry_type="feed",
+            user_slug="suz",
+        )
+        assert row["entry_count"] == len(feeds)
+        assert row["total_ml"] == round(_compute_feed_total(feeds), 1)
+
+
+def test_week_buckets_start_on_monday_and_respect_window(db_path):
+    since = START + timedelta(days=8)
+    until = START + timedelta(days=13)
+    result = aggregate_entries(
+        db_path, "week", since_utc=since.isoformat(), until_utc=until.isoformat()
+    )
+
+    assert {row["bucket_start_utc"] for row in result["buckets"]} == {
+        "2026-01-12T00:00:00+00:00"
+    }
+    entries = list_entries(
+        db_path, limit=1000, since_utc=since.isoformat(), until_utc=until.isoformat()
+    )
+    assert sum(row["entry_count"] for row in result["buckets"]) == len(entries)
+
+
+def test_aggregate_rejects_unknown_bucket(db_path):
+    with pytest.raises(ValueError, match="Invalid bucket"):
+        aggregate_entries(db_path, "month")
+
+
+@pytest.mark.parametrize("tz_offset_min", [600, -300, 330])
+def test_local_day_buckets_follow_tz_offset(db_path, tz_offset_min):
+    offset = timedelta(minutes=tz_offset_min)
+    result = aggregate_entries(db_path, "day", tz_offset_min=tz_offset_min)
+
+    assert result["tz_offset_min"] == tz_offset_min
+    counts: dict[str, int] = {}
+    for row in result["buckets"]:
+        counts[row["bucket_start_utc"]] = (
+            counts.get(row["bucket_start_utc"], 0) + row["entry_count"]
+        )
+    for bucket_start, count in counts.items():
+        day_start = datetime.fromisoformat(bucket_start)
+        local_start = day_start + offset
+        assert (local_start.hour, local_start.minute) == (0, 0)
+        entries = _window_entries(db_path, day_start, day_start + timedelta(days=1))
+        assert count == len(entries)
+    assert sum(row["entry_count"] for row in result["buckets"]) == 72
+
+
+def test_local_week_buckets_start_on_local_monday(db_path):
+    result = aggregate_entries(db_path, "week", tz_offset_min=600)
+
+    for row in result["buckets"]:
+        local_start = datetime.fromisoformat(row["bucket_start_utc"]) + timedelta(
+            hours=10
+        )
+        assert (local_start.weekday(), local_start.hour) == (0, 0)
+
+
+def test_aggregate_rejects_out_of_range_tz_offset(db_path):
+    with pytest.raises(ValueError, match="Invalid tz_offset_min"):
+        aggregate_entries(db_path, "day", tz_offset_min=15 * 60)
@@ -0,0 +1,61 @@
+from src.app.storage.db import get_connection, init_db
+from src.app.storage.entries import create_entries, create_entry, list_entries
+
+
+def _payload(client_event_id: str, timestamp_utc: str) -> dict:
+    return {
+        "user_slug": "suz",
+        "type": "feed",
+        "timestamp_utc": timestamp_utc,
+        "client_event_id": client_event_id,
+        "created_at_utc": "2026-01-02T00:00:00+00:00",
+        "updated_at_utc": "2026-01-02T00:00:00+00:00",
+    }
+
+
+def test_create_entries_counts_inserted_rows_and_skips_duplicates(tmp_path):
+    db_path = str(tmp_path / "bulk.sqlite")
+    init_db(db_path)
+
+    with get_connection(db_path) as conn:
+        create_entry(conn, _payload("evt-bulk-1", "2026-01-01T00:00:00+00:00"))
+        created = create_entries(
+            conn,
+            [
+                _payload("evt-bulk-1", "2026-01-01T05:00:00+00:00"),
+                _payload("evt-bulk-2", "2026-01-01T01:00:00+00:00"),
+                _payload("evt-bulk-3", "2026-01-01T02:00:00+00:00"),
+                _payload("evt-bulk-3", "2026-01-01T03:00:00+00:00"),
+            ],
+        )
+        rows = list_entries(conn, 10)
+
+    assert created == 2
+    assert [row["client_event_id"] for row in rows] == [
+        "evt-bulk-3",
+        "evt-bulk-2",
+        "evt-bulk-1",
+    ]
+    assert rows[-1]["timestamp_utc"] == "2026-01-01T00:00:00+00:00"
+    assert rows[0]["timestamp_ms"] is not None
+
+
+def test_create_entries_runs_as_one_statement_batch(tmp_path):
+    db_path = str(tmp_path / "bulk.sqlite")
+    init_db(db_path)
+    statements: list[str] = []
+
+    with get_connection(db_path) as conn:
+        conn.set_trace_callback(statements.append)
+        created = create_entries(
+            conn,
+            [
+                _payload(f"evt-batch-{index}", "2026-01-01T00:00:00+00:00")
+                for index in range(50)
+            ],
+        )
+        conn.set_trace_callback(None)
+
+    assert created == 50
+    assert not any(statement.lstrip().startswith("SELECT") for statement in statements)
+    assert not any(statement.strip() == "COMMIT" for statement in statements)
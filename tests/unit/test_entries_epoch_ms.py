@@ -0,0 +1,136 @@
+import sqlite3
+
+from src.app.storage import migrations as migrations_module
+from src.app.storage.db import get_connection, init_db
+from src.app.storage.entries import (
+    create_entry,
+    list_entries,
+    list_entries_updated_since,
+    timestamp_to_ms,
+    update_entry,
+)
+
+
+def _create(conn, client_event_id: str, timestamp_utc: str, updated_at_utc: str):
+    entry, _ = create_entry(
+        conn,
+        {
+            "user_slug": "suz",
+            "type": "feed",
+            "timestamp_utc": timestamp_utc,
+            "client_event_id": client_event_id,
+            "created_at_utc": updated_at_utc,
+            "updated_at_utc": updated_at_utc,
+        },
+    )
+    return entry
+
+
+def test_timestamp_to_ms_handles_offsets_and_naive_values():
+    assert timestamp_to_ms("1970-01-01T00:00:01+00:00") == 1000
+    assert timestamp_to_ms("1970-01-01T01:00:01+01:00") == 1000
+    assert timestamp_to_ms("1970-01-01T00:00:01Z") == 1000
+    assert timestamp_to_ms("1970-01-01T00:00:01.999999") == 1999
+
+
+def test_entries_store_and_filter_on_epoch_ms(tmp_path):
+    db_path = str(tmp_path / "epoch.sqlite")
+    init_db(db_path)
+
+    with get_connection(db_path) as conn:
+        entry = _create(
+            conn, "evt-ms-1", "2026-01-01T10:00:00+00:00", "2026-01-01T10:00:00+00:00"
+        )
+        _create(
+            conn, "evt-ms-2", "2026-01-01T12:00:00+00:00", "2026-01-01T12:00:00+00:00"
+        )
+        results = list_entries(
+            conn,
+            10,
+            since_utc="2026-01-01T10:30:00+01:00",
+            until_utc="2026-01-01T11:00:00+00:00",
+        )
+
+    assert entry["timestamp_ms"] == timestamp_to_ms("2026-01-01T10:00:00+00:00")
+    assert entry["updated_ms"] == entry["timestamp_ms"]
+    assert [row["client_event_id"] for row in results] == ["evt-ms-1"]
+
+
+def test_update_entry_keeps_epoch_ms_in_step(tmp_path):
+    db_path = str(tmp_path / "epoch.sqlite")
+    init_db(db_path)
+
+    with get_connection(db_path) as conn:
+        entry = _create(
+            conn, "evt-ms-3", "2026-01-01T10:00:00+00:00", "2026-01-01T10:00:00+00:00"
+        )
+        updated = update_entry(
+            conn,
+            entry["id"],
+            {
+                "timestamp_utc": "2026-01-01T09:00:00+00:00",
+                "updated_at_utc": "2026-01-02T00:00:00+00:00",
+            },
+        )
+
+    assert updated["timestamp_ms"] == timestamp_to_ms("2026-01-01T09:00:00+00:00")
+    assert updated["updated_ms"] == timestamp_to_ms("2026-01-02T00:00:00+00:00")
+
+
+def test_sync_cursor_keeps_sub_millisecond_ordering(tmp_path):
+    db_path = str(tmp_path / "epoch.sqlite")
+    init_db(db_path)
+
+    with get_connection(db_path) as conn:
+        _create(
+            conn,
+            "evt-ms-4",
+            "2026-01-01T10:00:00+00:00",
+            "2026-01-01T10:00:00.000100+00:00",
+        )
+        _create(
+            conn,
+            "evt-ms-5",
+            "2026-01-01T10:00:00+00:00",
+            "2026-01-01T10:00:00.000900+00:00",
+        )
+        results = list_entries_updated_since(conn, "2026-01-01T10:00:00.000100+00:00")
+
+    assert [row["client_event_id"] for row in results] == ["evt-ms-5"]
+
+
+def test_epoch_ms_migration_backfills_existing_rows(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "legacy.sqlite")
+    monkeypatch.setattr(
+        migrations_module,
+        "MIGRATIONS",
+        [m for m in migrations_module.MIGRATIONS if m.version < 3],
+    )
+    monkeypatch.setattr(migrations_module, "LATEST_SCHEMA_VERSION", 2)
+    init_db(db_path)
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        """
+        INSERT INTO entries (
+            user_slug, type, timestamp_utc, client_event_id, created_at_utc,
+            updated_at_utc
+        ) VALUES ('suz', 'feed', '2026-01-01T11:00:00+01:00', 'evt-legacy',
+                  '2026-01-01T10:00:00Z', '2026-01-01T10:00:00Z')
+        """
+    )
+    conn.commit()
+    conn.close()
+    monkeypatch.undo()
+
+    assert init_db(db_path) == [
+        m.version for m in migrations_module.MIGRATIONS if m.version > 2
+    ]
+    with get_connection(db_path) as conn:
+        row = conn.execute(
+            "SELECT timestamp_ms, updated_ms FROM entries WHERE client_event_id = ?",
+            ("evt-legacy",),
+        ).fetchone()
+
+    expected = timestamp_to_ms("2026-01-01T10:00:00+00:00")
+    assert row["timestamp_ms"] == expected
+    assert row["updated_ms"] == expected
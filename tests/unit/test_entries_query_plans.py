@@ -0,0 +1,147 @@
+import sqlite3
+
+import pytest
+
+from src.app.storage import entries as entries_storage
+from src.app.storage.db import get_connection, init_db
+
+
+def _plan(conn: sqlite3.Connection, call) -> list[str]:
+    statements: list[str] = []
+    conn.set_trace_callback(statements.append)
+    try:
+        call(conn)
+    finally:
+        conn.set_trace_callback(None)
+    assert len(statements) == 1
+    rows = conn.execute(f"EXPLAIN QUERY PLAN {statements[0]}").fetchall()
+    return [row["detail"] for row in rows]
+
+
+def _assert_index_search(plan: list[str], index_name: str) -> None:
+    assert any(index_name in detail for detail in plan), plan
+    assert not any(detail.startswith("SCAN entries") for detail in plan), plan
+    assert not any("TEMP B-TREE" in detail for detail in plan), plan
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "plans.sqlite")
+    init_db(path)
+    return path
+
+
+@pytest.mark.parametrize(
+    ("call", "index_name"),
+    [
+        (
+            lambda conn: entries_storage.list_entries(
+                conn, 1, user_slug="suz", entry_type="feed"
+            ),
+            "idx_entries_live_user_type_ms",
+        ),
+        (
+            lambda conn: entries_storage.list_entries(
+                conn,
+                200,
+                entry_type="feed",
+                since_utc="2026-01-01T00:00:00+00:00",
+                until_utc="2026-01-02T00:00:00+00:00",
+            ),
+            "idx_entries_live_type_ms",
+        ),
+        (
+            lambda conn: entries_storage.list_entries(conn, 200, user_slug="suz"),
+            "idx_entries_live_user_ms",
+        ),
+        (
+            lambda conn: entries_storage.list_entries(
+                conn, 500, since_utc="2026-01-01T00:00:00+00:00"
+            ),
+            "idx_entries_live_ms",
+        ),
+        (
+            lambda conn: entries_storage.list_entries(
+                conn, 250, until_utc="2026-01-02T00:00:00+00:00", before=(1, 1)
+            ),
+            "idx_entries_live_ms",
+        ),
+        (
+            lambda conn: entries_storage.get_latest_active_timed_entry(
+                conn, "sleep", "suz"
+            ),
+            "idx_entries_active_timed_ms",
+        ),
+    ],
+    ids=[
+        "latest-by-user-and-type",
+        "type-window",
+        "user-history",
+        "since-window",
+        "keyset-page",
+        "active-timed-event",
+    ],
+)
+def test_entries_queries_use_index_without_sort(db_path, call, index_name):
+    with get_connection(db_path) as conn:
+        plan = _plan(conn, call)
+
+    _assert_index_search(plan, index_name)
+
+
+def test_sync_changes_read_only_the_covering_index(db_path):
+    with get_connection(db_path) as conn:
+        plan = _plan(
+            conn,
+            lambda c: entries_storage.list_entries_updated_since(
+                c, "2026-01-01T00:00:00+00:00"
+            ),
+        )
+
+    assert any(
+        "USING COVERING INDEX idx_entries_sync_covering" in detail for detail in plan
+    ), plan
+    assert not any("TEMP B-TREE" in detail for detail in plan), plan
+
+
+def test_active_timed_lookup_without_user_avoids_table_scan(db_path):
+    with get_connection(db_path) as conn:
+        plan = _plan(
+            conn,
+            lambda c: entries_storage.get_latest_active_timed_entry(c, "sleep"),
+        )
+
+    assert not any(detail.startswith("SCAN entries") for detail in plan), plan
+
+
+def test_export_still_sees_deleted_entries_through_index(db_path):
+    with get_connection(db_path) as conn:
+        plan = _plan(
+            conn,
+            lambda c: list(
+                entries_storage.iter_entries_for_export(
+                    c, since_utc="2026-01-01T00:00:00+00:00"
+                )
+            ),
+        )
+
+    _assert_index_search(plan, "idx_entries_timestamp_ms")
+
+
+def test_replaced_single_column_index_is_dropped(db_path):
+    with get_connection(db_path) as conn:
+        indexes = {
+            row["name"]
+            for row in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'entries'"
+            )
+        }
+
+    assert "idx_entries_user_slug" not in indexes
+    assert {
+        "idx_entries_live_user_type_ms",
+        "idx_entries_live_type_ms",
+        "idx_entries_live_user_ms",
+        "idx_entries_live_ms",
+        "idx_entries_active_timed_ms",
+    } <= indexes
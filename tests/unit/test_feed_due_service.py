@@ -1,14 +1,16 @@
 from datetime import datetime, timezone
 
+from flask import Flask
+
 from src.app.services.entries import create_entry
-from src.app.services.feed_due import dispatch_feed_due
+from src.app.services.feed_due import FeedDueScheduler, dispatch_feed_due
 from src.app.services.push_subscriptions import (
     VapidConfig,
     get_push_subscription,
     save_push_subscription,
 )
 from src.app.services.settings import update_settings
-from src.app.storage.db import init_db
+from src.app.storage.db import get_connection, init_db, unit_of_work
 
 
 VAPID_CONFIG = VapidConfig(
@@ -191,4 +193,194 @@ def test_dispatch_feed_due_checks_each_subscribed_user(tmp_path):
         send_fn=sender,
     )
     assert result["sent"] is True
-    assert calls == ["ivy", "suz"]
+    assert sorted(calls) == ["ivy", "suz"]
+
+
+def _scheduler_app(db_path: str) -> Flask:
+    app = Flask(__name__)
+    app.config.update(DB_PATH=db_path, VAPID_CONFIG=VAPID_CONFIG)
+    return app
+
+
+def test_scheduler_sleeps_until_the_earliest_due_time(tmp_path):
+    db_path = str(tmp_path / "test.sqlite")
+    _setup_feed(db_path, user_slug="suz")
+    calls = []
+    scheduler = FeedDueScheduler(
+        _scheduler_app(db_path),
+        poll_seconds=3600,
+        send_fn=lambda subscription, payload, vapid_config: calls.append(
+            subscription["user_slug"]
+        )
+        or {"sent": True},
+    )
+
+    wait_ms = scheduler.run_once(datetime(2026, 1, 1, 0, 45, tzinfo=timezone.utc))
+    assert wait_ms == 15 * 60000
+    assert calls == []
+
+    wait_ms = scheduler.run_once(datetime(2026, 1, 1, 1, 0, tzinfo=timezone.utc))
+    assert calls == ["suz"]
+    assert scheduler.next_due_ms() is None
+    assert wait_ms == 3600 * 1000
+
+
+def test_scheduler_replans_when_entries_or_settings_change(tmp_path):
+    db_path = str(tmp_path / "test.sqlite")
+    _setup_feed(db_path, user_slug="suz")
+    scheduler = FeedDueScheduler(_scheduler_app(db_path), poll_seconds=3600)
+    now = datetime(2026, 1, 1, 0, 30, tzinfo=timezone.utc)
+    assert scheduler.run_once(now) == 30 * 60000
+
+    create_entry(
+        db_path,
+        {
+            "type": "feed",
+            "user_slug": "suz",
+            "formula_ml": 60,
+            "client_event_id": "feed-suz-2",
+            "timestamp_utc": "2026-01-01T00:20:00+00:00",
+        },
+    )
+    assert scheduler.run_once(now) == 50 * 60000
+
+    update_settings(db_path, {"feed_interval_min": 45})
+    assert scheduler.run_once(now) == 35 * 60000
+
+
+def test_scheduler_catches_up_missed_deadlines_on_start(tmp_path):
+    db_path = str(tmp_path / "test.sqlite")
+    _setup_feed(db_path, user_slug="suz")
+    _setup_feed(db_path, user_slug="ivy")
+    calls = []
+
+    def sender(subscription, payload, vapid_config):
+        calls.append(subscription["user_slug"])
+        return {"sent": subscription["user_slug"] == "ivy"}
+
+    scheduler = FeedDueScheduler(
+        _scheduler_app(db_path), poll_seconds=60, send_fn=sender
+    )
+    restarted = datetime(2026, 1, 1, 3, 0, tzinfo=timezone.utc)
+    assert scheduler.run_once(restarted) == 60000
+    assert sorted(calls) == ["ivy", "suz"]
+
+    assert scheduler.run_once(restarted) == 60000
+    assert sorted(calls) == ["ivy", "suz"]
+
+
+def test_scheduler_keeps_real_due_times_after_a_dispatch(tmp_path):
+    db_path = str(tmp_path / "test.sqlite")
+    _setup_feed(db_path, user_slug="suz")
+    _setup_feed(db_path, user_slug="ivy")
+    create_entry(
+        db_path,
+        {
+            "type": "feed",
+            "user_slug": "ivy",
+            "formula_ml": 60,
+            "client_event_id": "feed-ivy-2",
+            "timestamp_utc": "2026-01-01T00:00:10+00:00",
+        },
+    )
+    calls = []
+
+    def sender(subscription, payload, vapid_config):
+        calls.append(subscription["user_slug"])
+        return {"sent": True}
+
+    scheduler = FeedDueScheduler(
+        _scheduler_app(db_path), poll_seconds=60, send_fn=sender
+    )
+    assert scheduler.run_once(datetime(2026, 1, 1, 1, 0, tzinfo=timezone.utc)) == 10000
+    assert calls == ["suz"]
+
+    scheduler.run_once(datetime(2026, 1, 1, 1, 0, 10, tzinfo=timezone.utc))
+    assert calls == ["suz", "ivy"]
+
+
+def test_scheduler_does_not_retry_backed_off_users_early(tmp_path):
+    db_path = str(tmp_path / "test.sqlite")
+    _setup_feed(db_path, user_slug="suz")
+    _setup_feed(db_path, user_slug="ivy")
+    create_entry(
+        db_path,
+        {
+            "type": "feed",
+            "user_slug": "ivy",
+            "formula_ml": 60,
+            "client_event_id": "feed-ivy-2",
+            "timestamp_utc": "2026-01-01T00:00:10+00:00",
+        },
+    )
+    calls = []
+
+    def sender(subscription, payload, vapid_config):
+        calls.append(subscription["user_slug"])
+        return {"sent": subscription["user_slug"] == "ivy"}
+
+    scheduler = FeedDueScheduler(
+        _scheduler_app(db_path), poll_seconds=60, send_fn=sender
+    )
+    scheduler.run_once(datetime(2026, 1, 1, 1, 0, tzinfo=timezone.utc))
+    assert calls == ["suz"]
+
+    scheduler.run_once(datetime(2026, 1, 1, 1, 0, 10, tzinfo=timezone.utc))
+    assert calls == ["suz", "ivy"]
+
+    scheduler.run_once(datetime(2026, 1, 1, 1, 1, tzinfo=timezone.utc))
+    assert calls == ["suz", "ivy", "suz"]
+
+
+def test_dispatch_feed_due_evaluates_subscribers_in_one_statement(tmp_path):
+    db_path = str(tmp_path / "test.sqlite")
+    for user_slug in ("ann", "bea", "cal", "dee"):
+        _setup_feed(db_path, user_slug=user_slug)
+    create_entry(
+        db_path,
+        {
+            "type": "feed",
+            "user_slug": "bea",
+            "formula_ml": 60,
+            "client_event_id": "feed-bea-2",
+            "timestamp_utc": "2026-01-01T00:45:00+00:00",
+        },
+    )
+    calls: list[str] = []
+
+    def sender(subscription, payload, vapid_config):
+        calls.append(subscription["user_slug"])
+        return {"sent": subscription["user_slug"] == "cal" or len(calls) > 3}
+
+    first = dispatch_feed_due(
+        db_path,
+        vapid_config=VAPID_CONFIG,
+        now_utc=datetime(2026, 1, 1, 1, 1, tzinfo=timezone.utc),
+        send_fn=sender,
+    )
+    assert first == {"sent": True, "users": ["cal"]}
+    assert sorted(calls) == ["ann", "cal", "dee"]
+
+    statements: list[str] = []
+    with unit_of_work(db_path):
+        with get_connection(db_path) as conn:
+            conn.set_trace_callback(statements.append)
+        try:
+            second = dispatch_feed_due(
+                db_path,
+                vapid_config=VAPID_CONFIG,
+                now_utc=datetime(2026, 1, 1, 1, 5, tzinfo=timezone.utc),
+                send_fn=sender,
+            )
+        finally:
+            conn.set_trace_callback(None)
+
+    assert second == {"sent": True, "users": ["ann", "dee"]}
+    assert sorted(calls[3:]) == ["ann", "dee"]
+    selects = [sql for sql in statements if sql.lstrip().startswith("WITH")]
+    updates = [sql for sql in statements if "UPDATE push_subscriptions" in sql]
+    assert len(selects) == 1
+    assert len(updates) == 2
+    assert get_push_subscription(db_path, "dee")["last_notified_due_at_utc"] == (
+        "2026-01-01T01:00:00+00:00"
+    )
@@ -0,0 +1,158 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.app.services import home_kpis as home_kpis_module
+from src.app.services.entries import create_entry, list_entries
+from src.app.services.feeding_goals import create_goal
+from src.app.services.home_kpis import (
+    _compute_feed_total,
+    build_home_kpis,
+    dispatch_home_kpis,
+    get_home_kpis_delivery_stats,
+)
+from src.app.services.settings import update_settings
+from src.app.storage.db import init_db
+
+NOW = datetime(2026, 1, 2, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "home-kpis.sqlite")
+    init_db(path)
+    return path
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = {"now": NOW}
+    monkeypatch.setattr(home_kpis_module, "_now_utc", lambda: clock["now"])
+    return clock
+
+
+@pytest.fixture
+def queries(monkeypatch) -> list[int]:
+    calls: list[int] = []
+    original = home_kpis_module.repo_get_home_kpi_inputs
+
+    def counting_inputs(*args, **kwargs):
+        calls.append(1)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(home_kpis_module, "repo_get_home_kpi_inputs", counting_inputs)
+    return calls
+
+
+def _feed(db_path: str, client_event_id: str, timestamp: datetime, **fields):
+    return create_entry(
+        db_path,
+        {
+            "type": "feed",
+            "user_slug": "suz",
+            "client_event_id": client_event_id,
+            "timestamp_utc": timestamp.isoformat(),
+            **fields,
+        },
+    )
+
+
+def test_feed_total_counts_every_feed_in_the_window(db_path, clock):
+    for index in range(250):
+        _feed(
+            db_path,
+            f"evt-kpi-{index}",
+            NOW - timedelta(minutes=5 * index),
+            formula_ml=10,
+        )
+    _feed(
+        db_path,
+        "evt-kpi-breast",
+        NOW - timedelta(minutes=1),
+        notes="Breastfeeding (started)",
+        amount_ml=500,
+    )
+
+    payload = build_home_kpis(db_path)
+    feeds = list_entries(
+        db_path,
+        limit=1000,
+        since_utc=(NOW - timedelta(hours=24)).isoformat(),
+        until_utc=NOW.isoformat(),
+        entry_type="feed",
+    )
+
+    assert _compute_feed_total(feeds) == 2500
+    assert payload["inputs"]["input1"] == "Feed total (24h): 2500 ml"
+
+
+def test_kpi_inputs_are_cached_until_a_write_or_window_change(
+    db_path, clock, queries
+):
+    _feed(db_path, "evt-kpi-cache-1", NOW - timedelta(hours=23), formula_ml=100)
+
+    first = build_home_kpis(db_path)
+    clock["now"] = NOW + timedelta(minutes=30)
+    second = build_home_kpis(db_path)
+    assert len(queries) == 1
+    assert first["inputs"]["input1"] == second["inputs"]["input1"]
+
+    create_goal(db_path, {"goal_ml": 400})
+    assert build_home_kpis(db_path)["inputs"]["input2"] == (
+        "Goal (24h): 100 ml / 400 ml"
+    )
+    assert len(queries) == 2
+
+    _feed(db_path, "evt-kpi-cache-2", NOW, formula_ml=50)
+    assert build_home_kpis(db_path)["inputs"]["input1"] == "Feed total (24h): 150 ml"
+    assert len(queries) == 3
+
+    clock["now"] = NOW + timedelta(hours=2)
+    assert build_home_kpis(db_path)["inputs"]["input1"] == "Feed total (24h): 50 ml"
+    assert len(queries) == 4
+
+
+def test_dispatch_skips_unchanged_payloads_until_a_send_succeeds(db_path, clock):
+    update_settings(db_path, {"home_kpis_webhook_url": "https://example.com/kpis"})
+    outcomes = [False, True, True]
+    sent = []
+
+    def sender(url, payload):
+        sent.append(payload)
+        return outcomes.pop(0)
+
+    assert dispatch_home_kpis(db_path, send_fn=sender)["reason"] == "push_failed"
+    assert dispatch_home_kpis(db_path, send_fn=sender)["sent"] is True
+    assert dispatch_home_kpis(db_path, send_fn=sender)["reason"] == "unchanged"
+    assert len(sent) == 2
+
+    _feed(db_path, "evt-kpi-dispatch", NOW - timedelta(minutes=10), formula_ml=40)
+    assert dispatch_home_kpis(db_path, send_fn=sender)["sent"] is True
+
+    stats = get_home_kpis_delivery_stats(db_path)
+    assert stats["sent_count"] == 2
+    assert stats["skipped_count"] == 1
+    assert stats["failed_count"] == 1
+    assert stats["last_error"] is None
+
+
+def test_dispatch_skips_countdown_only_changes(db_path, clock):
+    update_settings(
+        db_path,
+        {
+            "home_kpis_webhook_url": "https://example.com/kpis",
+            "feed_interval_min": 180,
+        },
+    )
+    _feed(db_path, "evt-kpi-countdown", NOW - timedelta(minutes=30), formula_ml=90)
+    sent = []
+
+    def sender(url, payload):
+        sent.append(payload)
+        return True
+
+    assert dispatch_home_kpis(db_path, send_fn=sender)["sent"] is True
+    clock["now"] = NOW + timedelta(minutes=1)
+    assert build_home_kpis(db_path)["inputs"]["input0"] != sent[0]["inputs"]["input0"]
+    assert dispatch_home_kpis(db_path, send_fn=sender)["reason"] == "unchanged"
+    assert len(sent) == 1
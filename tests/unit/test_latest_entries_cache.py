@@ -0,0 +1,122 @@
+import sqlite3
+
+import pytest
+
+from src.app.services import latest_entries as latest_entries_module
+from src.app.services.entries import (
+    create_entry,
+    delete_entry,
+    get_entry_summary,
+    get_latest_entry_by_type,
+    get_next_feed_time,
+    update_entry,
+)
+from src.app.storage.db import init_db, unit_of_work
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "latest.sqlite")
+    init_db(path)
+    return path
+
+
+@pytest.fixture
+def lookups(monkeypatch) -> list[tuple]:
+    calls: list[tuple] = []
+    original = latest_entries_module.repo_list_entries
+
+    def counting_list_entries(conn, limit, **filters):
+        calls.append((filters.get("user_slug"), filters.get("entry_type")))
+        return original(conn, limit, **filters)
+
+    monkeypatch.setattr(
+        latest_entries_module, "repo_list_entries", counting_list_entries
+    )
+    return calls
+
+
+def _create(db_path: str, client_event_id: str, timestamp_utc: str, **fields):
+    return create_entry(
+        db_path,
+        {
+            "type": "feed",
+            "user_slug": "suz",
+            "client_event_id": client_event_id,
+            "timestamp_utc": timestamp_utc,
+            **fields,
+        },
+    )
+
+
+def test_repeated_summary_reads_hit_the_cache(db_path, lookups):
+    _create(db_path, "evt-latest-1", "2026-01-01T08:00:00+00:00")
+
+    first = get_entry_summary(db_path, user_slug="suz")
+    lookups_after_first = len(lookups)
+    second = get_entry_summary(db_path, user_slug="suz")
+    get_next_feed_time(db_path, user_slug="suz")
+
+    assert first == second
+    assert lookups_after_first == 3
+    assert len(lookups) == lookups_after_first
+
+
+def test_entry_writes_update_the_cache_in_place(db_path, lookups):
+    first = _create(db_path, "evt-latest-2", "2026-01-01T08:00:00+00:00")
+    assert get_latest_entry_by_type(db_path, "feed", "suz")["id"] == first["id"]
+    assert get_latest_entry_by_type(db_path, "feed")["id"] == first["id"]
+    assert len(lookups) == 2
+
+    second = _create(db_path, "evt-latest-3", "2026-01-01T09:00:00+00:00")
+    _create(db_path, "evt-latest-4", "2026-01-01T07:00:00+00:00")
+    assert get_latest_entry_by_type(db_path, "feed", "suz")["id"] == second["id"]
+    assert get_latest_entry_by_type(db_path, "feed")["id"] == second["id"]
+    assert len(lookups) == 2
+
+    update_entry(db_path, first["id"], {"timestamp_utc": "2026-01-01T10:00:00+00:00"})
+    assert get_latest_entry_by_type(db_path, "feed", "suz")["id"] == first["id"]
+
+    delete_entry(db_path, first["id"])
+    assert get_latest_entry_by_type(db_path, "feed", "suz")["id"] == second["id"]
+
+
+def test_writes_from_other_connections_invalidate_the_cache(db_path):
+    _create(db_path, "evt-latest-5", "2026-01-01T08:00:00+00:00")
+    assert get_latest_entry_by_type(db_path, "feed")["client_event_id"] == (
+        "evt-latest-5"
+    )
+
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        """
+        INSERT INTO entries (
+            user_slug, type, timestamp_utc, client_event_id, created_at_utc,
+            updated_at_utc, timestamp_ms, updated_ms
+        ) VALUES ('rob', 'feed', '2026-01-01T09:00:00+00:00', 'evt-external',
+                  '2026-01-01T09:00:00+00:00', '2026-01-01T09:00:00+00:00',
+                  1767258000000, 1767258000000)
+        """
+    )
+    conn.commit()
+    conn.close()
+
+    assert get_latest_entry_by_type(db_path, "feed")["client_event_id"] == (
+        "evt-external"
+    )
+
+
+def test_rolled_back_writes_do_not_leave_stale_entries(db_path):
+    _create(db_path, "evt-latest-6", "2026-01-01T08:00:00+00:00")
+    assert get_latest_entry_by_type(db_path, "feed")["client_event_id"] == (
+        "evt-latest-6"
+    )
+
+    with pytest.raises(RuntimeError):
+        with unit_of_work(db_path, immediate=True):
+            _create(db_path, "evt-latest-rolled-back", "2026-01-01T09:00:00+00:00")
+            raise RuntimeError("abort")
+
+    assert get_latest_entry_by_type(db_path, "feed")["client_event_id"] == (
+        "evt-latest-6"
+    )
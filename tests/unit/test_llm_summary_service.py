@@ -1,14 +1,32 @@
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+import json
+import random
 
 import pytest
 
 from src.app.services.llm_summary import (
+    COMPARE_DAY_COUNT,
+    DAY_MS,
     LlmSummaryError,
+    _build_comparison_days,
+    _build_day_stats,
     _build_prompt,
+    _estimate_tokens,
+    _fit_prompt,
+    _get_prompt_encoding,
     _get_prompt_path,
+    _get_token_budget,
     _load_prompt_template,
+    _parse_structured_summary,
+    _render_prompt,
     _render_prompt_template,
+    _summary_sections,
+    _SummarySectionParser,
+    generate_llm_summary,
 )
+from src.app.services import llm_summary as llm_summary_module
+from src.app.storage.db import get_connection, init_db
+from src.app.storage.entries import create_entries
 
 
 def test_load_prompt_template_uses_default_file():
@@ -76,6 +94,7 @@ def test_build_prompt_renders_from_override_file(tmp_path, monkeypatch):
             {
                 "type": "feed",
                 "timestamp_utc": "2024-01-01T08:00:00+00:00",
+                "timestamp_ms": 1704096000000,
                 "user_slug": "suz",
                 "amount_ml": 90,
                 "notes": "settled afterwards",
@@ -85,6 +104,7 @@ def test_build_prompt_renders_from_override_file(tmp_path, monkeypatch):
             {
                 "type": "feed",
                 "timestamp_utc": "2024-01-01T08:00:00+00:00",
+                "timestamp_ms": 1704096000000,
                 "user_slug": "suz",
                 "amount_ml": 90,
                 "notes": "settled afterwards",
@@ -98,3 +118,301 @@ def test_build_prompt_renders_from_override_file(tmp_path, monkeypatch):
     assert '"total_feed_ml": 90.0' in prompt
     assert '"amount_ml": 90' in prompt
     assert "Compare [" in prompt
+
+
+def test_compact_prompt_uses_tables_and_relative_times():
+    since_utc = datetime(2024, 1, 8, 6, tzinfo=timezone.utc)
+    until_utc = since_utc + timedelta(days=1)
+    since_ms = int(since_utc.timestamp() * 1000)
+    selected_entries = [
+        {
+            "type": "feed",
+            "timestamp_ms": since_ms + 90 * 60 * 1000,
+            "user_slug": "suz",
+            "amount_ml": 90.0,
+            "notes": "settled | then\nslept",
+        },
+        {
+            "type": "wee",
+            "timestamp_ms": since_ms + 125 * 60 * 1000,
+            "user_slug": "rob",
+        },
+    ]
+    comparison_days = _build_comparison_days(
+        [
+            {
+                "type": "feed",
+                "timestamp_ms": since_ms - 24 * 60 * 60 * 1000,
+                "user_slug": "suz",
+                "amount_ml": 60,
+                "notes": "sleepy",
+            }
+        ],
+        since_utc,
+        until_utc,
+    )
+
+    compact = _render_prompt(
+        comparison_days, selected_entries, since_utc, until_utc, encoding="compact"
+    )
+    verbose = _render_prompt(
+        comparison_days, selected_entries, since_utc, until_utc, encoding="json"
+    )
+
+    assert "users: u1=suz u2=rob" in compact
+    assert "time|user|type|amount_ml|notes" in compact
+    assert "+1:30|u1|feed|90|settled / then slept" in compact
+    assert "+2:05|u2|wee||" in compact
+    assert "day|event_count|feed_count|total_feed_ml|amount_total_ml|notes" in compact
+    assert "-1d|1|1|60|60|sleepy" in compact
+    assert '"user_slug"' not in compact
+    assert '"user_slug": "suz"' in verbose
+    assert len(compact) < len(verbose)
+
+
+def test_token_budget_downsamples_comparison_notes_evenly():
+    since_utc = datetime(2024, 1, 8, tzinfo=timezone.utc)
+    until_utc = since_utc + timedelta(days=1)
+    comparison_days = [
+        {
+            "window": {},
+            "stats": _build_day_stats([]),
+            "sample_notes": [f"day {day} note {index} " + "x" * 80 for index in range(3)],
+        }
+        for day in range(COMPARE_DAY_COUNT)
+    ]
+    comparison_days[-1]["sample_notes"][0] = "repeated note"
+    comparison_days[0]["sample_notes"][0] = "repeated note"
+    template = "$comparison_days_json"
+
+    unbounded = _render_prompt(
+        comparison_days, [], since_utc, until_utc, template, encoding="compact"
+    )
+    assert unbounded.count("repeated note") == 1
+    assert "\n-1d|repeated note;" in unbounded
+
+    budget = _estimate_tokens(unbounded) // 2
+    bounded = _render_prompt(
+        comparison_days,
+        [],
+        since_utc,
+        until_utc,
+        template,
+        encoding="compact",
+        token_budget=budget,
+    )
+
+    assert _estimate_tokens(bounded) <= budget
+    assert "day 0 note 2" not in bounded
+    rows = [line for line in bounded.splitlines() if line.startswith("-")]
+    counts = [len([note for note in row.split("|")[1].split("; ") if note]) for row in rows]
+    assert max(counts) - min(counts) <= 1
+
+    starved = _render_prompt(
+        comparison_days,
+        [],
+        since_utc,
+        until_utc,
+        template,
+        encoding="json",
+        token_budget=1,
+    )
+    assert starved == "[]"
+
+
+def test_token_budget_clips_notes_then_comparison_rows(caplog):
+    since_utc = datetime(2024, 1, 8, tzinfo=timezone.utc)
+    until_utc = since_utc + timedelta(days=1)
+    since_ms = int(since_utc.timestamp() * 1000)
+    selected_entries = [
+        {
+            "type": "feed",
+            "timestamp_ms": since_ms + index * 60 * 60 * 1000,
+            "user_slug": "suz",
+            "amount_ml": 90,
+            "notes": f"feed {index} " + "long note " * 20,
+        }
+        for index in range(6)
+    ]
+    comparison_days = _build_comparison_days(
+        [
+            {**entry, "timestamp_ms": entry["timestamp_ms"] - day * DAY_MS}
+            for entry in selected_entries
+            for day in range(1, COMPARE_DAY_COUNT + 1)
+        ],
+        since_utc,
+        until_utc,
+    )
+    template = "$selected_day_events_json\n$comparison_days_json"
+
+    full = _render_prompt(
+        comparison_days, selected_entries, since_utc, until_utc, template, "compact"
+    )
+    clipped, over_budget = _fit_prompt(
+        comparison_days,
+        selected_entries,
+        since_utc,
+        until_utc,
+        template,
+        encoding="compact",
+        token_budget=_estimate_tokens(full) // 2,
+    )
+    assert over_budget is False
+    assert "long note long note" in full
+    assert "|feed 0 long note long n…\n" in clipped
+    assert "\n-7d|" in clipped
+
+    with caplog.at_level("WARNING", logger="src.app.services.llm_summary"):
+        starved, over_budget = _fit_prompt(
+            comparison_days,
+            selected_entries,
+            since_utc,
+            until_utc,
+            template,
+            encoding="compact",
+            token_budget=20,
+        )
+    assert over_budget is True
+    assert "long note" not in starved
+    assert "-1d|" not in starved
+    assert "over the 20 token budget" in caplog.text
+
+
+def test_prompt_encoding_settings_validate_env(monkeypatch):
+    assert _get_prompt_encoding() == "compact"
+    assert _get_token_budget() == 6000
+    monkeypatch.setenv("BABY_TRACKER_LLM_SUMMARY_PROMPT_ENCODING", " JSON ")
+    monkeypatch.setenv("BABY_TRACKER_LLM_SUMMARY_TOKEN_BUDGET", "0")
+    assert _get_prompt_encoding() == "json"
+    assert _get_token_budget() == 0
+
+    monkeypatch.setenv("BABY_TRACKER_LLM_SUMMARY_PROMPT_ENCODING", "yaml")
+    with pytest.raises(LlmSummaryError) as exc_info:
+        _get_prompt_encoding()
+    assert exc_info.value.status_code == 500
+    monkeypatch.setenv("BABY_TRACKER_LLM_SUMMARY_TOKEN_BUDGET", "lots")
+    with pytest.raises(LlmSummaryError):
+        _get_token_budget()
+
+
+def _dense_entries(since_utc: datetime, count: int) -> list[dict]:
+    rng = random.Random(7)
+    start_ms = int((since_utc - timedelta(days=COMPARE_DAY_COUNT)).timestamp() * 1000)
+    span_ms = (COMPARE_DAY_COUNT + 1) * 24 * 60 * 60 * 1000
+    entries = []
+    for index in range(count):
+        entry_type = rng.choice(["feed", "wee", "poo", "sleep", "cry", "bath"])
+        entries.append(
+            {
+                "id": index,
+                "type": entry_type,
+                "user_slug": rng.choice(["suz", "rob", "ivy"]),
+                "timestamp_ms": start_ms + rng.randrange(span_ms),
+                "amount_ml": rng.choice([None, 60, 90.5]),
+                "formula_ml": rng.choice([None, 30]),
+                "feed_duration_min": rng.choice([None, 0, 12.5]),
+                "notes": rng.choice([None, "", f"note {index}"]),
+            }
+        )
+    return entries
+
+
+@pytest.mark.parametrize("window_hours", [24, 25, 6])
+def test_comparison_days_match_per_window_filtering(window_hours):
+    since_utc = datetime(2024, 1, 8, 6, 30, tzinfo=timezone.utc)
+    until_utc = since_utc + timedelta(hours=window_hours)
+    entries = _dense_entries(since_utc, 4000)
+
+    comparison_days = _build_comparison_days(entries, since_utc, until_utc)
+
+    ordered = sorted(entries, key=lambda entry: entry["timestamp_ms"])
+    assert len(comparison_days) == COMPARE_DAY_COUNT
+    for offset, day in zip(range(COMPARE_DAY_COUNT, 0, -1), comparison_days):
+        window_since = since_utc - timedelta(days=offset)
+        window_until = until_utc - timedelta(days=offset)
+        expected = [
+            entry
+            for entry in ordered
+            if window_since.timestamp() * 1000
+            <= entry["timestamp_ms"]
+            < window_until.timestamp() * 1000
+        ]
+        assert day["window"] == {
+            "since_utc": window_since.isoformat(),
+            "until_utc": window_until.isoformat(),
+        }
+        assert day["stats"] == _build_day_stats(expected)
+        assert day["sample_notes"] == [
+            entry["notes"] for entry in expected if entry["notes"]
+        ][:3]
+
+
+def test_summary_context_is_not_capped_on_busy_weeks(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "busy.sqlite")
+    init_db(db_path)
+    since_utc = datetime(2024, 1, 8, tzinfo=timezone.utc)
+    start = since_utc - timedelta(days=COMPARE_DAY_COUNT)
+    payloads = [
+        {
+            "user_slug": "suz",
+            "type": "wee" if index % 2 else "feed",
+            "timestamp_utc": (start + timedelta(minutes=10 * index)).isoformat(),
+            "client_event_id": f"evt-busy-{index}",
+            "amount_ml": None if index % 2 else 30,
+            "created_at_utc": "2024-01-09T00:00:00+00:00",
+            "updated_at_utc": "2024-01-09T00:00:00+00:00",
+        }
+        for index in range(8 * 144)
+    ]
+    with get_connection(db_path) as conn:
+        create_entries(conn, payloads)
+    prompts: list[str] = []
+
+    def fake_call_openai(model, prompt, timeout_seconds):
+        prompts.append(prompt)
+        return (
+            '{"headline": "Busy", "selected_day": ["a"], '
+            '"comparison_to_previous_7_days": ["b"], "follow_up": ["c"]}'
+        )
+
+    monkeypatch.setattr(llm_summary_module, "_call_openai", fake_call_openai)
+
+    result = generate_llm_summary(
+        db_path,
+        {
+            "user_slug": "suz",
+            "since_utc": since_utc.isoformat(),
+            "until_utc": (since_utc + timedelta(days=1)).isoformat(),
+        },
+    )
+
+    assert result["event_count"] == 144
+    assert result["context_event_count"] == 8 * 144
+    assert len(prompts) == 1
+    assert "\n-7d|144|72|2160|2160|72|\n" in prompts[0]
+
+
+def test_section_parser_emits_sections_as_soon_as_they_complete():
+    structured = {
+        "headline": 'Busy "cluster" day',
+        "selected_day": ["Seven feeds, café noted.", "Two naps."],
+        "comparison_to_previous_7_days": ["More feeds than usual."],
+        "follow_up": ["Watch for [wind] after feeds."],
+    }
+    content = "```json\n" + json.dumps(structured, indent=2) + "\n```"
+    parser = _SummarySectionParser()
+    sections = []
+    for char in content:
+        sections.extend(parser.feed(char))
+
+    assert sections == _summary_sections(_parse_structured_summary(content))
+    assert parser.text == content
+
+    partial = _SummarySectionParser()
+    assert partial.feed('{"headline": "Stea') == []
+    assert partial.feed('dy", "selected_day": ["One') == [
+        {"section": "headline", "text": "Steady"}
+    ]
+    assert partial.feed(' feed."') == [
+        {"section": "selected_day", "text": "One feed."}
+    ]
@@ -0,0 +1,126 @@
+import sqlite3
+import threading
+
+from src.app import migrate as migrate_cli
+from src.app.storage import migrations as migrations_module
+from src.app.storage.db import get_connection, init_db
+from src.app.storage.migrations import LATEST_SCHEMA_VERSION, Migration
+
+
+def _schema_version(db_path: str) -> int:
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute("PRAGMA user_version").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_init_db_records_latest_schema_version(tmp_path):
+    db_path = str(tmp_path / "fresh.sqlite")
+
+    applied = init_db(db_path)
+
+    assert applied == [migration.version for migration in migrations_module.MIGRATIONS]
+    assert _schema_version(db_path) == LATEST_SCHEMA_VERSION
+
+
+def test_init_db_skips_work_when_schema_is_current(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "current.sqlite")
+    init_db(db_path)
+
+    def fail(_conn):
+        raise AssertionError("migration should not run")
+
+    monkeypatch.setattr(
+        migrations_module,
+        "MIGRATIONS",
+        [Migration(m.version, m.name, fail) for m in migrations_module.MIGRATIONS],
+    )
+
+    assert init_db(db_path) == []
+
+
+def test_init_db_applies_only_pending_migrations(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "pending.sqlite")
+    init_db(db_path)
+    calls: list[int] = []
+    next_version = LATEST_SCHEMA_VERSION + 1
+
+    def add_table(conn):
+        calls.append(next_version)
+        conn.execute("CREATE TABLE extra (id INTEGER PRIMARY KEY)")
+
+    monkeypatch.setattr(
+        migrations_module,
+        "MIGRATIONS",
+        [*migrations_module.MIGRATIONS, Migration(next_version, "extra", add_table)],
+    )
+    monkeypatch.setattr(migrations_module, "LATEST_SCHEMA_VERSION", next_version)
+
+    assert init_db(db_path) == [next_version]
+    assert init_db(db_path) == []
+    assert calls == [next_version]
+    assert _schema_version(db_path) == next_version
+
+
+def test_failed_migration_leaves_schema_version_unchanged(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "failed.sqlite")
+    init_db(db_path)
+    next_version = LATEST_SCHEMA_VERSION + 1
+
+    def broken(conn):
+        conn.execute("CREATE TABLE half_done (id INTEGER PRIMARY KEY)")
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(
+        migrations_module,
+        "MIGRATIONS",
+        [*migrations_module.MIGRATIONS, Migration(next_version, "broken", broken)],
+    )
+    monkeypatch.setattr(migrations_module, "LATEST_SCHEMA_VERSION", next_version)
+
+    try:
+        init_db(db_path)
+    except RuntimeError:
+        pass
+
+    assert _schema_version(db_path) == LATEST_SCHEMA_VERSION
+    with get_connection(db_path) as conn:
+        tables = {
+            row["name"]
+            for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")
+        }
+    assert "half_done" not in tables
+
+
+def test_concurrent_init_db_runs_baseline_once(tmp_path):
+    db_path = str(tmp_path / "race.sqlite")
+    results: list[list[int]] = []
+    errors: list[Exception] = []
+
+    def boot():
+        try:
+            results.append(init_db(db_path))
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=boot) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert sum(1 for applied in results if applied) == 1
+    with get_connection(db_path) as conn:
+        reminders = conn.execute("SELECT COUNT(*) FROM reminders").fetchone()[0]
+    assert reminders == 2
+
+
+def test_migrate_cli_check_reports_pending(tmp_path):
+    db_path = str(tmp_path / "cli.sqlite")
+
+    assert migrate_cli.main(["--db-path", db_path, "--check"]) == 1
+    assert migrate_cli.main(["--db-path", db_path]) == 0
+    assert migrate_cli.main(["--db-path", db_path, "--check"]) == 0
+    assert _schema_version(db_path) == LATEST_SCHEMA_VERSION
@@ -0,0 +1,143 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from flask import Flask
+
+from src.app.services import outbox as outbox_module
+from src.app.services.outbox import (
+    ENTRY_WEBHOOK,
+    OUTBOX_MAX_ATTEMPTS,
+    dispatch_outbox,
+    enqueue_outbox,
+    get_outbox_status,
+    outbox_backoff_ms,
+)
+from src.app.storage.db import get_connection, init_db, unit_of_work
+
+NOW = datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def outbox_app(tmp_path):
+    db_path = str(tmp_path / "outbox.sqlite")
+    init_db(db_path)
+    app = Flask(__name__)
+    app.config.update(DB_PATH=db_path)
+    return app
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = {"now": NOW}
+    monkeypatch.setattr(outbox_module, "_now_utc", lambda: clock["now"])
+    return clock
+
+
+@pytest.fixture
+def deliveries(monkeypatch) -> list[object]:
+    outcomes: list[object] = []
+
+    def fake_send(db_path, entry):
+        outcome = outcomes.pop(0) if outcomes else True
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    monkeypatch.setattr(outbox_module, "send_entry_webhook", fake_send)
+    return outcomes
+
+
+def _attempt_state(app: Flask) -> dict:
+    with get_connection(app.config["DB_PATH"]) as conn:
+        row = conn.execute(
+            "SELECT attempts, next_attempt_ms, last_error, failed_at_utc FROM outbox"
+        ).fetchone()
+    return dict(row) if row else {}
+
+
+def test_outbox_rows_roll_back_with_their_transaction(outbox_app, clock):
+    db_path = outbox_app.config["DB_PATH"]
+    with pytest.raises(RuntimeError):
+        with unit_of_work(db_path, immediate=True):
+            enqueue_outbox(db_path, ENTRY_WEBHOOK, {"entry": {"id": 1}})
+            raise RuntimeError("abort")
+
+    assert get_outbox_status(db_path) == {"pending": 0, "failed": 0}
+
+
+def test_failed_deliveries_back_off_then_succeed(outbox_app, clock, deliveries):
+    db_path = outbox_app.config["DB_PATH"]
+    enqueue_outbox(db_path, ENTRY_WEBHOOK, {"entry": {"id": 1}})
+    deliveries.extend([False, RuntimeError("boom"), True])
+
+    assert dispatch_outbox(outbox_app)["retried"] == 1
+    state = _attempt_state(outbox_app)
+    assert state["attempts"] == 1
+    assert state["last_error"] == "webhook_failed"
+    assert dispatch_outbox(outbox_app)["claimed"] == 0
+
+    clock["now"] = NOW + timedelta(milliseconds=outbox_backoff_ms(1))
+    assert dispatch_outbox(outbox_app)["retried"] == 1
+    assert _attempt_state(outbox_app)["last_error"] == "boom"
+
+    clock["now"] += timedelta(milliseconds=outbox_backoff_ms(2) - 1)
+    assert dispatch_outbox(outbox_app)["claimed"] == 0
+    clock["now"] += timedelta(milliseconds=1)
+    assert dispatch_outbox(outbox_app)["delivered"] == 1
+    assert get_outbox_status(db_path) == {"pending": 0, "failed": 0}
+
+
+def test_deliveries_stop_after_max_attempts(outbox_app, clock, deliveries):
+    db_path = outbox_app.config["DB_PATH"]
+    enqueue_outbox(db_path, ENTRY_WEBHOOK, {"entry": {"id": 1}})
+    deliveries.extend([False] * OUTBOX_MAX_ATTEMPTS)
+
+    for _ in range(OUTBOX_MAX_ATTEMPTS):
+        dispatch_outbox(outbox_app)
+        clock["now"] += timedelta(days=1)
+
+    assert get_outbox_status(db_path) == {"pending": 0, "failed": 1}
+    assert _attempt_state(outbox_app)["attempts"] == OUTBOX_MAX_ATTEMPTS
+    assert dispatch_outbox(outbox_app)["claimed"] == 0
+
+
+def test_claimed_rows_are_leased_to_one_dispatcher(outbox_app, clock, monkeypatch):
+    db_path = outbox_app.config["DB_PATH"]
+    enqueue_outbox(db_path, ENTRY_WEBHOOK, {"entry": {"id": 1}})
+    nested: list[dict] = []
+
+    def slow_send(db_path, entry):
+        nested.append(dispatch_outbox(outbox_app))
+        return True
+
+    monkeypatch.setattr(outbox_module, "send_entry_webhook", slow_send)
+
+    assert dispatch_outbox(outbox_app)["delivered"] == 1
+    assert nested == [{"claimed": 0, "delivered": 0, "retried": 0, "failed": 0}]
+
+
+def test_entry_route_returns_before_side_effects_run(client, monkeypatch):
+    def fail_urlopen(*args, **kwargs):
+        raise AssertionError("network call made inside the request")
+
+    from src.app.services import home_kpis as home_kpis_module
+    from src.app.services import webhooks as webhooks_module
+
+    monkeypatch.setattr(webhooks_module.request, "urlopen", fail_urlopen)
+    monkeypatch.setattr(home_kpis_module.urllib_request, "urlopen", fail_urlopen)
+    client.patch(
+        "/api/settings",
+        json={
+            "entry_webhook_url": "https://example.com/entry-hook",
+            "home_kpis_webhook_url": "https://example.com/home-kpis",
+        },
+    )
+
+    response = client.post(
+        "/api/users/suz/entries",
+        json={"type": "feed", "client_event_id": "evt-outbox-1"},
+    )
+
+    assert response.status_code == 201
+    health = client.get("/api/health").get_json()
+    assert health["outbox"] == {"pending": 3, "failed": 0}
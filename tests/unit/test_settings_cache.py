@@ -0,0 +1,69 @@
+import sqlite3
+
+import pytest
+
+from src.app.services import settings as settings_module
+from src.app.services.settings import get_settings, update_settings
+from src.app.storage.db import get_connection, init_db
+from src.app.storage.settings import update_feed_due_state
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "settings-cache.sqlite")
+    init_db(path)
+    return path
+
+
+@pytest.fixture
+def loads(monkeypatch) -> list[int]:
+    calls: list[int] = []
+    original = settings_module.repo_get_settings
+
+    def counting_get_settings(conn):
+        calls.append(1)
+        return original(conn)
+
+    monkeypatch.setattr(settings_module, "repo_get_settings", counting_get_settings)
+    return calls
+
+
+def test_settings_are_read_once_per_change(db_path, loads):
+    get_settings(db_path)
+    first_loads = len(loads)
+    for _ in range(5):
+        settings = get_settings(db_path)
+
+    assert len(loads) == first_loads
+    settings["custom_event_types"].append("mutated")
+    assert "mutated" not in get_settings(db_path)["custom_event_types"]
+
+
+def test_update_settings_invalidates_the_cache(db_path, loads):
+    assert get_settings(db_path)["feed_interval_min"] is None
+
+    update_settings(db_path, {"feed_interval_min": 180})
+
+    assert get_settings(db_path)["feed_interval_min"] == 180
+
+
+def test_other_processes_invalidate_the_cache(db_path):
+    get_settings(db_path)
+
+    conn = sqlite3.connect(db_path)
+    conn.execute("UPDATE baby_settings SET feed_interval_min = 150 WHERE id = 1")
+    conn.commit()
+    conn.close()
+
+    assert get_settings(db_path)["feed_interval_min"] == 150
+
+
+def test_feed_due_state_writes_keep_the_cache(db_path, loads):
+    get_settings(db_path)
+    first_loads = len(loads)
+
+    with get_connection(db_path) as conn:
+        update_feed_due_state(conn, 7, "2026-01-01T00:00:00+00:00")
+    get_settings(db_path)
+
+    assert len(loads) == first_loads
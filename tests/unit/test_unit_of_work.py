@@ -0,0 +1,172 @@
+import sqlite3
+import threading
+
+import pytest
+
+from src.app.services.entries import create_entry, list_entries
+from src.app.services.settings import get_settings, update_settings
+from src.app.storage.db import (
+    commit_unit_of_work,
+    get_connection,
+    get_connection_pool,
+    init_db,
+    unit_of_work,
+    UnitOfWork,
+)
+
+
+def _count_checkouts(monkeypatch, db_path: str) -> list[int]:
+    pool = get_connection_pool(db_path)
+    calls: list[int] = []
+    original = pool.acquire
+
+    def counting_acquire():
+        calls.append(1)
+        return original()
+
+    monkeypatch.setattr(pool, "acquire", counting_acquire)
+    return calls
+
+
+def _create_feed(db_path: str, client_event_id: str) -> dict:
+    return create_entry(
+        db_path,
+        {
+            "type": "feed",
+            "user_slug": "suz",
+            "client_event_id": client_event_id,
+            "timestamp_utc": "2026-01-01T00:00:00+00:00",
+        },
+    )
+
+
+def test_request_uses_one_connection_for_all_services(app, client, monkeypatch):
+    calls = _count_checkouts(monkeypatch, app.config["DB_PATH"])
+
+    response = client.post(
+        "/api/users/suz/entries",
+        json={"type": "feed", "client_event_id": "evt-uow-1", "amount_ml": 90},
+    )
+
+    assert response.status_code == 201
+    assert len(calls) == 1
+
+
+def test_request_reads_share_a_snapshot(app):
+    db_path = app.config["DB_PATH"]
+    with app.test_request_context("/api/entries", method="GET"):
+        app.preprocess_request()
+        assert list_entries(db_path) == []
+
+        writer = threading.Thread(target=_create_feed, args=(db_path, "evt-uow-2"))
+        writer.start()
+        writer.join()
+
+        assert list_entries(db_path) == []
+        app.do_teardown_request()
+
+    assert len(list_entries(db_path)) == 1
+
+
+def test_request_commits_once_before_the_response(app):
+    db_path = app.config["DB_PATH"]
+    with app.test_request_context("/api/settings", method="PATCH"):
+        app.preprocess_request()
+        update_settings(db_path, {"feed_interval_min": 90})
+        _create_feed(db_path, "evt-uow-3")
+
+        with get_connection_pool(db_path).connection() as other:
+            other.execute("PRAGMA busy_timeout = 0")
+            rows = other.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        assert rows == 0
+        app.process_response(app.response_class())
+        app.do_teardown_request()
+
+    assert get_settings(db_path)["feed_interval_min"] == 90
+    assert len(list_entries(db_path)) == 1
+
+
+def test_request_rolls_back_on_unhandled_error(app):
+    db_path = app.config["DB_PATH"]
+    with app.test_request_context("/api/entries", method="POST"):
+        app.preprocess_request()
+        _create_feed(db_path, "evt-uow-4")
+        app.do_teardown_request(RuntimeError("boom"))
+
+    assert list_entries(db_path) == []
+
+
+def test_request_reports_failed_commit_as_server_error(app, client, monkeypatch):
+    def failing_commit(self):
+        self._broken = True
+        raise sqlite3.OperationalError("disk I/O error")
+
+    monkeypatch.setattr(UnitOfWork, "commit", failing_commit)
+
+    response = client.patch("/api/settings", json={"feed_interval_min": 75})
+
+    assert response.status_code == 500
+    assert response.get_json() == {"error": "Unable to save changes"}
+    monkeypatch.undo()
+    assert get_settings(app.config["DB_PATH"])["feed_interval_min"] != 75
+
+
+def test_request_does_not_commit_after_unhandled_error(app):
+    db_path = app.config["DB_PATH"]
+    app.config.update(TESTING=False, PROPAGATE_EXCEPTIONS=False)
+
+    @app.post("/boom")
+    def boom():
+        _create_feed(db_path, "evt-uow-6")
+        raise RuntimeError("boom")
+
+    response = app.test_client().post("/boom")
+
+    assert response.status_code == 500
+    assert list_entries(db_path) == []
+
+
+def test_commit_unit_of_work_makes_writes_visible_early(tmp_path):
+    db_path = str(tmp_path / "uow.sqlite")
+    init_db(db_path)
+
+    with unit_of_work(db_path, immediate=True):
+        _create_feed(db_path, "evt-uow-5")
+        commit_unit_of_work(db_path)
+        with get_connection_pool(db_path).connection() as other:
+            rows = other.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        assert rows == 1
+        update_settings(db_path, {"feed_interval_min": 45})
+
+    assert get_settings(db_path)["feed_interval_min"] == 45
+
+
+def test_failed_scope_rolls_back_only_its_own_writes(tmp_path):
+    db_path = str(tmp_path / "uow.sqlite")
+    init_db(db_path)
+
+    with unit_of_work(db_path, immediate=True):
+        _create_feed(db_path, "evt-uow-6")
+        with pytest.raises(ValueError):
+            with get_connection(db_path) as conn:
+                conn.execute("DELETE FROM entries")
+                raise ValueError("abort")
+
+    assert len(list_entries(db_path)) == 1
+
+
+def test_services_outside_request_commit_per_call(tmp_path):
+    db_path = str(tmp_path / "uow.sqlite")
+    init_db(db_path)
+    results: list[int] = []
+
+    def scheduler_tick():
+        _create_feed(db_path, "evt-uow-7")
+        with get_connection_pool(db_path).connection() as other:
+            results.append(other.execute("SELECT COUNT(*) FROM entries").fetchone()[0])
+
+    thread = threading.Thread(target=scheduler_tick)
+    thread.start()
+    thread.join()
+
+    assert results == [1]
@@ -0,0 +1,60 @@
+from src.app.services.push_subscriptions import (
+    VAPID_TOKEN_REFRESH_SECONDS,
+    VAPID_TOKEN_TTL_SECONDS,
+    VapidHeaderCache,
+    build_vapid_config,
+)
+
+
+class FakeSigner:
+    def __init__(self) -> None:
+        self.claims: list[dict] = []
+
+    def sign(self, claims: dict) -> dict:
+        self.claims.append(dict(claims))
+        return {"Authorization": f"vapid t={claims['aud']}:{claims['exp']},k=key"}
+
+
+def test_headers_are_reused_until_shortly_before_expiry():
+    cache = VapidHeaderCache()
+    signer = FakeSigner()
+    now = 1_700_000_000
+
+    first = cache.headers_for(signer, "mailto:a@example.com", "https://push.a", now)
+    again = cache.headers_for(
+        signer,
+        "mailto:a@example.com",
+        "https://push.a",
+        now + VAPID_TOKEN_TTL_SECONDS - VAPID_TOKEN_REFRESH_SECONDS - 1,
+    )
+    assert again == first
+    assert len(signer.claims) == 1
+    assert signer.claims[0]["exp"] == now + VAPID_TOKEN_TTL_SECONDS
+
+    cache.headers_for(signer, "mailto:a@example.com", "https://push.b", now)
+    assert [claims["aud"] for claims in signer.claims] == [
+        "https://push.a",
+        "https://push.b",
+    ]
+
+    later = now + VAPID_TOKEN_TTL_SECONDS - VAPID_TOKEN_REFRESH_SECONDS
+    refreshed = cache.headers_for(
+        signer, "mailto:a@example.com", "https://push.a", later
+    )
+    assert refreshed != first
+    assert len(signer.claims) == 3
+
+
+def test_build_vapid_config_parses_the_private_key_up_front(vapid_config):
+    assert vapid_config.signer is not None
+    rebuilt = build_vapid_config(
+        vapid_config.public_key, vapid_config.private_key, vapid_config.subject
+    )
+    assert rebuilt == vapid_config
+    assert rebuilt.signer is not vapid_config.signer
+
+
+def test_unparseable_private_key_falls_back_to_per_push_signing():
+    config = build_vapid_config("public", "not-a-key", "mailto:a@example.com")
+    assert config is not None
+    assert config.signer is None